@@ -0,0 +1,105 @@
+"""
+Converting and merging scalar fields a column at a time across all hotels, against
+the per-value conversion and merge_groups, with and without NumPy.
+
+Usage: python -m benchmarks.bench_columnar [--hotels 20000] [--overlap 0.5] [--repeat 5]
+"""
+import argparse
+import gc
+import json
+import time
+from dataclasses import asdict
+from config.config import SUPPLIER_CONFIG
+from src.data_integration import columnar
+from src.data_integration.base_supplier import configured_suppliers
+from src.data_integration.data_merger import DataMerger
+from src.data_integration.lazy_numpy import load_numpy
+from src.data_integration.parser import Parser
+from benchmarks.synthetic import supplier_payloads
+
+COLUMNS = ("destination_id", "location.lat", "location.lng", "name")
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def with_numpy(numpy, fn):
+    """Run fn with columnar's NumPy set to the given module (None for the pure-Python path)."""
+    saved, columnar.np = load_numpy(columnar.__name__), numpy
+    try:
+        return fn()
+    finally:
+        columnar.np = saved
+
+
+def raw_columns(payloads) -> dict:
+    """Every supplier's raw values of COLUMNS, concatenated: {field: (type, values)}."""
+    columns = {}
+    for key, records in payloads.items():
+        for field in COLUMNS:
+            rules = SUPPLIER_CONFIG[key]["fields"].get(field)
+            if rules and rules["source"]:
+                values = [Parser.get_nested_value(record, rules["source"]) for record in records]
+                columns.setdefault(field, (rules["type"], []))[1].extend(values)
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=20000)
+    parser.add_argument("--overlap", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    suppliers = configured_suppliers()
+    payloads = supplier_payloads(args.hotels, args.overlap, supplier_keys=[s.supplier_key for s in suppliers])
+    numpy = load_numpy(columnar.__name__)
+    paths = {"numpy": numpy, "python": None} if numpy is not None else {"python": None}
+
+    conversion = {}
+    for field, (value_type, values) in raw_columns(payloads).items():
+        expected = [None if v is None else Parser._transform_value(v, value_type) for v in values]
+        for name, module in paths.items():
+            if with_numpy(module, lambda: columnar.convert_column(values, value_type))[0] != expected:
+                raise SystemExit(f"convert_column ({name}) differs from Parser._transform_value on {field}")
+        conversion[field] = {"per_value_seconds": round(best_of(args.repeat, lambda: [
+            None if v is None else Parser._transform_value(v, value_type) for v in values]), 4)}
+        for name, module in paths.items():
+            conversion[field][f"column_{name}_seconds"] = round(best_of(
+                args.repeat, lambda: with_numpy(module, lambda: columnar.convert_column(values, value_type))), 4)
+
+    def parse():
+        return [hotel for s in suppliers for hotel in (s.parse(dto) for dto in payloads[s.supplier_key])]
+
+    # Merging writes into the first record of each hotel, so every run merges freshly parsed records
+    merger = DataMerger()
+    runs = {"merge_groups": (merger.merge_groups, numpy)}
+    runs.update({f"merge_columns_{name}": (merger.merge_columns, module) for name, module in paths.items()})
+    merge, expected = {}, None
+    for name, (fn, module) in runs.items():
+        timings = []
+        for _ in range(args.repeat):
+            records = parse()
+            gc.collect()
+            start = time.perf_counter()
+            output = with_numpy(module, lambda: fn(records))
+            timings.append(time.perf_counter() - start)
+        output = [asdict(hotel) for hotel in output]
+        if expected is None:
+            expected = output
+        elif output != expected:
+            raise SystemExit(f"{name} output differs from merge_groups")
+        merge[name] = {"seconds": round(min(timings), 3)}
+    print(json.dumps({"hotels": args.hotels, "overlap": args.overlap, "merged": len(expected),
+                      "conversion": conversion, "merge": merge}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
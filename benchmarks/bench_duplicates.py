@@ -0,0 +1,139 @@
+"""
+Near-duplicate matching on synthetic hotels with injected duplicates: time, precision
+and recall of DuplicateMatcher, against a brute-force comparison of every pair.
+
+Usage: python -m benchmarks.bench_duplicates [--hotels 100000] [--duplicates 0.1] [--sample 1500]
+"""
+import argparse
+import json
+import random
+import time
+from itertools import combinations
+from typing import Dict, List, Tuple
+from src.data_integration import duplicates
+from src.data_integration.duplicates import DuplicateMatcher, MatchOptions
+from src.data_integration.geo_index import haversine_km
+from src.data_integration.lazy_numpy import load_numpy
+from src.models.hotel import Hotel
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "ven", "tor", "sol", "an", "bel", "cor", "di", "el", "fa", "gra", "hu", "is",
+             "ju", "ko", "lu", "mar", "no", "or", "pe", "qui", "ros", "sa", "ti", "ur", "vi", "wen", "xa", "yo", "zen"]
+KINDS = ["Hotel", "Inn", "Resort", "Suites", "Lodge", "Residences", "Hostel", ""]
+
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+
+
+def hotel(hotel_id: str, destination_id: int, name: str, point) -> Hotel:
+    lat, lng = point if point else (None, None)
+    return Hotel.from_dict({"id": hotel_id, "destination_id": destination_id, "name": name,
+                            "location": {"lat": lat, "lng": lng}, "amenities": {}, "images": {}})
+
+
+def variant(name: str, rng: random.Random) -> str:
+    """How another supplier might spell the same hotel's name."""
+    change = rng.randrange(5)
+    if change == 0:
+        return "The " + name.upper()
+    if change == 1:
+        return name.replace(" ", ", ", 1)
+    if change == 2:
+        position = rng.randrange(len(name))  # One-letter typo
+        return name[:position] + rng.choice("aeiou") + name[position + 1:]
+    if change == 3:
+        return "Hotel " + name
+    return name.lower() + " (" + rng.choice(["City Centre", "Downtown", "Airport"]) + ")"
+
+
+def make_inventory(count: int, ratio: float, seed: int) -> Tuple[List[Hotel], Dict[str, str]]:
+    """
+    Hotels in 500 destinations plus a copy of `ratio` of them under a new id.
+
+    Copies get a respelled name, and coordinates moved by up to ~150 m or dropped.
+
+    Returns:
+    - The records in random order, and each injected id mapped to the id it duplicates.
+    """
+    rng = random.Random(seed)
+    centres = [(rng.uniform(-60, 60), rng.uniform(-180, 180)) for _ in range(500)]
+    hotels, truth = [], {}
+    for n in range(count):
+        destination = rng.randrange(len(centres))
+        lat, lng = centres[destination]
+        point = (lat + rng.uniform(-0.05, 0.05), lng + rng.uniform(-0.05, 0.05))
+        name = f"{word(rng)} {word(rng)} {rng.choice(KINDS)}".strip()
+        hotels.append(hotel(f"h{n}", destination, name, point))
+        if rng.random() < ratio:
+            moved = None if rng.random() < 0.3 else (point[0] + rng.uniform(-0.001, 0.001),
+                                                     point[1] + rng.uniform(-0.001, 0.001))
+            hotels.append(hotel(f"d{n}", destination, variant(name, rng), moved))
+            truth[f"d{n}"] = f"h{n}"
+    rng.shuffle(hotels)
+    return hotels, truth
+
+
+def pairs(canonical: Dict[str, str]) -> set:
+    """Unordered id pairs in the same group, from a duplicate -> canonical mapping."""
+    groups = {}
+    for duplicate, first in canonical.items():
+        groups.setdefault(first, {first}).add(duplicate)
+    return {frozenset(pair) for group in groups.values() for pair in combinations(sorted(group), 2)}
+
+
+def brute_force(matcher: DuplicateMatcher, hotels: List[Hotel]) -> set:
+    """Exact Jaccard similarity and distance of every pair in a destination: the O(N^2) baseline."""
+    options = matcher.options
+    shingles = [matcher.shingles(h.name) for h in hotels]
+    points = [duplicates.coordinates(h) for h in hotels]
+    found = set()
+    for i, j in combinations(range(len(hotels)), 2):
+        if hotels[i].destination_id != hotels[j].destination_id or not shingles[i] or not shingles[j]:
+            continue
+        similarity = len(shingles[i] & shingles[j]) / len(shingles[i] | shingles[j])
+        near = points[i] is None or points[j] is None or haversine_km(*points[i], *points[j]) <= options.max_distance_km
+        if similarity >= options.similarity and near:
+            found.add(frozenset((hotels[i].id, hotels[j].id)))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=100000)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Fraction of hotels given a duplicate")
+    parser.add_argument("--sample", type=int, default=1500, help="Records the brute-force baseline is timed on")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    hotels, truth = make_inventory(args.hotels, args.duplicates, args.seed)
+    expected = pairs(truth)
+    matcher = DuplicateMatcher(MatchOptions())
+    results = {}
+    numpy = load_numpy(duplicates.__name__)
+    for name, module in (("numpy", numpy), ("python", None)):
+        if name == "numpy" and numpy is None:
+            continue
+        duplicates.np = module
+        try:
+            start = time.perf_counter()
+            found = pairs(matcher.match(hotels))
+            seconds = time.perf_counter() - start
+        finally:
+            duplicates.np = numpy
+        correct = len(found & expected)
+        results[name] = {"seconds": round(seconds, 3), "linked_pairs": len(found),
+                         "precision": round(correct / len(found), 4) if found else None,
+                         "recall": round(correct / len(expected), 4) if expected else None}
+
+    # The baseline only runs on a sample, and its time is scaled up by the number of pairs
+    sample = hotels[:args.sample]
+    start = time.perf_counter()
+    brute_force(matcher, sample)
+    seconds = time.perf_counter() - start
+    results["brute_force_estimate"] = {"seconds": round(seconds * (len(hotels) / len(sample)) ** 2, 1),
+                                       "sampled_records": len(sample), "sample_seconds": round(seconds, 3)}
+    print(json.dumps({"records": len(hotels), "injected_duplicates": len(truth), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
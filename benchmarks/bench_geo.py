@@ -0,0 +1,70 @@
+"""
+Radius and nearest-K queries through GeoIndex against a linear scan of every hotel.
+
+Usage: python -m benchmarks.bench_geo [--hotels 200000] [--queries 200] [--radius-km 5] [--k 10]
+"""
+import argparse
+import json
+import random
+import time
+from src.data_integration import geo_index
+from src.data_integration.geo_index import GeoIndex, coordinates, haversine_km
+from src.data_integration.lazy_numpy import load_numpy
+from src.models.hotel import Hotel, Location
+
+
+def make_hotels(count: int, rng: random.Random):
+    """Hotels clustered around a few hundred cities, with 5% missing coordinates."""
+    cities = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(300)]
+    hotels = []
+    for n in range(count):
+        lat, lng = rng.choice(cities)
+        location = Location(lat=lat + rng.gauss(0, 0.1), lng=lng + rng.gauss(0, 0.1))
+        if rng.random() < 0.05:
+            location.lat = None
+        hotels.append(Hotel(f"h{n}", n % 500, f"Hotel {n}", "", location, None, None))
+    return hotels, cities
+
+
+def linear_within(points, lat, lng, radius_km):
+    return [(position, d) for position, point in points if (d := haversine_km(lat, lng, *point)) <= radius_km]
+
+
+def per_query_us(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return round((time.perf_counter() - start) / len(queries) * 1e6, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--radius-km", type=float, default=5)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    hotels, cities = make_hotels(args.hotels, rng)
+    centres = [(lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.05)) for lat, lng in rng.choices(cities, k=args.queries)]
+
+    start = time.perf_counter()
+    index = GeoIndex(hotels)
+    build = time.perf_counter() - start
+    points = [(position, point) for position, hotel in enumerate(hotels) if (point := coordinates(hotel)) is not None]
+    linear_queries = centres[:max(args.queries // 20, 1)]  # The scan is slow; a sample is enough
+
+    print(json.dumps({
+        "hotels": args.hotels,
+        "numpy": load_numpy(geo_index.__name__) is not None,
+        "build_seconds": round(build, 3),
+        "unlocated": len(index.unlocated),
+        "radius_query_us": per_query_us(lambda lat, lng: index.within(lat, lng, args.radius_km), centres),
+        "linear_scan_us": per_query_us(lambda lat, lng: linear_within(points, lat, lng, args.radius_km), linear_queries),
+        "nearest_k_us": per_query_us(lambda lat, lng: index.nearest(lat, lng, args.k), centres),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
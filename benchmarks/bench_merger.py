@@ -0,0 +1,112 @@
+"""
+Merge cost for hotels with many supplier records each: the interpreted
+pairwise merge, the compiled pairwise merge and the single-pass merge_group.
+
+Usage: python -m benchmarks.bench_merger [--hotels 5000] [--records-per-hotel 12]
+"""
+import argparse
+import copy
+import json
+import time
+from dataclasses import asdict
+from config.config import SUPPLIER_CONFIG
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.data_merger import DataMerger
+from src.data_integration.paperflies_supplier import PaperfliesSupplier
+from src.data_integration.patagonia_supplier import PatagoniaSupplier
+from tests.helpers import supplier_records
+
+
+def get_nested_field(obj, field):
+    """Retrieve the value of a nested field using dot notation."""
+    for key in field.split("."):
+        if isinstance(obj, dict):
+            obj = obj.get(key)
+        elif hasattr(obj, key):
+            obj = getattr(obj, key)
+        else:
+            return None
+    return obj
+
+
+def set_nested_field(obj, field, value):
+    """Set the value of a nested field using dot notation."""
+    keys = field.split(".")
+    for key in keys[:-1]:
+        if isinstance(obj, dict):
+            obj = obj.setdefault(key, {})
+        elif hasattr(obj, key):
+            obj = getattr(obj, key)
+        else:
+            return
+    if isinstance(obj, dict):
+        obj[keys[-1]] = value
+    elif hasattr(obj, keys[-1]):
+        setattr(obj, keys[-1], value)
+
+
+def interpreted_merge_two_hotels(merger, existing, new):
+    """DataMerger._merge_two_hotels as it was before the strategy was compiled."""
+    for field, strategy_config in merger.merge_strategy.items():
+        strategy = strategy_config.get("strategy", "default_merge")
+        merge_function = getattr(merger, strategy, merger._default_merge)
+        key = strategy_config.get("key", None)
+        subfield_strategies = strategy_config.get("subfield_strategies", {})
+        existing_value = get_nested_field(existing, field)
+        new_value = get_nested_field(new, field)
+        merged_value = merge_function(existing_value, new_value, key, subfield_strategies)
+        set_nested_field(existing, field, merged_value)
+    return existing
+
+
+def interpreted(merger, hotels):
+    merged = {}
+    for hotel in hotels:
+        merged[hotel.id] = interpreted_merge_two_hotels(merger, merged[hotel.id], hotel) if hotel.id in merged else hotel
+    return list(merged.values())
+
+
+def make_hotels(count: int, records_per_hotel: int):
+    """Interleave records so every hotel id gets records_per_hotel records from the three suppliers."""
+    suppliers = [AcmeSupplier(), PatagoniaSupplier(), PaperfliesSupplier()]
+    hotels = []
+    for round_number in range(records_per_hotel):
+        supplier = suppliers[round_number % len(suppliers)]
+        hotels.extend(supplier.parse(dto) for dto in supplier_records(supplier.supplier_key, count, seed=round_number))
+    return hotels
+
+
+def timed(fn, hotels):
+    # Merging writes into the first record of each hotel, so every run gets its own copy
+    hotels = copy.deepcopy(hotels)
+    start = time.perf_counter()
+    result = fn(hotels)
+    return time.perf_counter() - start, [asdict(hotel) for hotel in result]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=5000)
+    parser.add_argument("--records-per-hotel", type=int, default=12)
+    args = parser.parse_args()
+
+    merger = DataMerger()
+    hotels = make_hotels(args.hotels, args.records_per_hotel)
+    runs = {
+        "interpreted_pairwise": lambda data: interpreted(merger, data),
+        "compiled_pairwise": merger.merge_hotels,
+        "merge_groups": merger.merge_groups,
+    }
+    results, expected = {}, None
+    for name, fn in runs.items():
+        elapsed, output = timed(fn, hotels)
+        if expected is None:
+            expected = output
+        elif output != expected:
+            raise SystemExit(f"{name} output differs from interpreted_pairwise")
+        results[name] = {"seconds": round(elapsed, 3), "us_per_hotel": round(elapsed / args.hotels * 1e6, 1)}
+    print(json.dumps({"hotels": args.hotels, "records_per_hotel": args.records_per_hotel, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Bytes per hotel: the previous dict-backed model vs. the slotted, typed model and HotelColumns.
+
+HotelColumns only holds id, destination_id, lat and lng, so its figure is the
+cost of keeping just those columns for a bulk inventory.
+
+Usage: python -m benchmarks.bench_model_memory [--hotels 1000000]
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+from dataclasses import make_dataclass
+from src.models.hotel import Hotel, HotelColumns
+
+# The model as it was before: plain dataclasses with a per-instance __dict__,
+# built with Hotel(**grouped_data) so every nested field stayed a dict
+LegacyHotel = make_dataclass("LegacyHotel", ["id", "destination_id", "name", "description", "location",
+                                             "amenities", "images", "booking_conditions"])
+
+AMENITIES = ["pool", "business center", "wifi", "dry cleaning", "breakfast", "tv", "coffee machine",
+             "kettle", "hair dryer", "iron", "bathtub", "aircon"]
+
+
+def parsed_hotel(index: int, rng: random.Random) -> dict:
+    """One hotel as the parser emits it; every string is a fresh object, as when decoded from JSON."""
+    return {
+        "id": f"h{index:07d}",
+        "destination_id": 1000 + index % 500,
+        "name": f"Hotel {index}",
+        "description": f"A pleasant stay, hotel number {index}.",
+        "location": {"lat": rng.uniform(-90, 90), "lng": rng.uniform(-180, 180), "address": f"{index} Main Street",
+                     "city": "Singapore"[:], "country": "SG"[:]},
+        "amenities": {"general": [(name + " ")[:-1] for name in rng.sample(AMENITIES[:5], 3)],
+                      "room": [(name + " ")[:-1] for name in rng.sample(AMENITIES[5:], 3)]},
+        "images": {"rooms": [{"link": f"https://img.example.com/{index}/{n}.jpg", "description": f"Room {n}"}
+                             for n in range(2)]},
+        "booking_conditions": [],
+    }
+
+
+def deep_size(root) -> int:
+    """Total size of every object reachable from root, counting shared objects (e.g. interned strings) once."""
+    seen = set()
+    pending = [root]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return total
+
+
+def bytes_per_hotel(build, count: int) -> float:
+    rng = random.Random(0)
+    kept = build(parsed_hotel(index, rng) for index in range(count))
+    return deep_size(kept) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotels", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    legacy = bytes_per_hotel(lambda rows: [LegacyHotel(**row) for row in rows], args.hotels)
+    slotted = bytes_per_hotel(lambda rows: [Hotel.from_dict(row) for row in rows], args.hotels)
+    columns = bytes_per_hotel(lambda rows: HotelColumns.from_hotels(Hotel.from_dict(row) for row in rows),
+                              args.hotels)
+    print(json.dumps({
+        "hotels": args.hotels,
+        "legacy_bytes_per_hotel": round(legacy, 1),
+        "slotted_bytes_per_hotel": round(slotted, 1),
+        "columns_bytes_per_hotel": round(columns, 1),
+        "slotted_saving": f"{1 - slotted / legacy:.1%}",
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Scaling of the process-pool parse-and-merge across 1, 2, 4 and 8 workers,
+against the serial parse followed by merge_groups.
+
+Usage: python -m benchmarks.bench_parallel [--hotels 20000] [--workers 1,2,4,8]
+"""
+import argparse
+import json
+import os
+import time
+from dataclasses import asdict
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.paperflies_supplier import PaperfliesSupplier
+from src.data_integration.parallel import ParallelMerger
+from src.data_integration.patagonia_supplier import PatagoniaSupplier
+from tests.helpers import supplier_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=20000)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    args = parser.parse_args()
+
+    suppliers = [AcmeSupplier(), PatagoniaSupplier(), PaperfliesSupplier()]
+    # Each supplier covers two thirds of the hotels, offset so most hotels are merged from two or three records
+    span = args.hotels * 2 // 3
+    raw = [supplier_records(s.supplier_key, span, start=n * args.hotels // 6) for n, s in enumerate(suppliers)]
+
+    results, expected, baseline = {}, None, None
+    for workers in [int(n) for n in args.workers.split(",")]:
+        start = time.perf_counter()
+        merged = ParallelMerger(suppliers, workers=workers).merge(raw)
+        elapsed = time.perf_counter() - start
+        output = [asdict(hotel) for hotel in merged]
+        if expected is None:
+            expected, baseline = output, elapsed
+        elif output != expected:
+            raise SystemExit(f"{workers} workers produced a different result")
+        results[str(workers)] = {"seconds": round(elapsed, 3), "speedup": round(baseline / elapsed, 2)}
+    print(json.dumps({"hotels": len(expected), "records": sum(map(len, raw)), "cpus": os.cpu_count(),
+                      "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Cost of refetching a supplier whose feed barely changed: parsing every record
+against reusing the hotels parsed from unchanged records (RecordStore).
+
+Usage: python -m benchmarks.bench_record_store [--hotels 20000] [--changed 0,0.1,0.5] [--repeat 3]
+"""
+import argparse
+import gc
+import json
+import time
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.record_store import RecordStore
+from benchmarks.synthetic import supplier_payloads
+from tests.helpers import StubServer
+
+
+def changed_payload(records, ratio: float):
+    """Copy of the records with the given fraction renamed, spread evenly through the feed."""
+    step = int(1 / ratio) if ratio else 0
+    return [dict(record, Name=record["Name"] + " (renovated)") if step and n % step == 0 else record
+            for n, record in enumerate(records)]
+
+
+def timed_fetch(supplier) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    supplier.fetch()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=20000)
+    parser.add_argument("--changed", default="0,0.1,0.5", help="Comma-separated fractions of records changed")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = supplier_payloads(args.hotels, overlap=1.0, supplier_keys=("acme",))["acme"]
+    original = json.dumps(records).encode()
+    results = {}
+    served = {"body": original}  # Swapped between fetches
+    with StubServer({"/acme": lambda handler: (200, served["body"], {"Content-Type": "application/json"})}) as server:
+        plain, reusing = (server.supplier("acme", "/acme", base=AcmeSupplier) for _ in range(2))
+        reusing.record_store = store = RecordStore()
+        for ratio in [float(r) for r in args.changed.split(",")]:
+            changed = json.dumps(changed_payload(records, ratio)).encode()
+            served["body"] = changed
+            parse_all = min(timed_fetch(plain) for _ in range(args.repeat))
+            reuse = []
+            for _ in range(args.repeat):
+                # The store holds the original feed, and the timed fetch sees the changed one
+                served["body"] = original
+                reusing.fetch()
+                served["body"] = changed
+                hits, misses = store.hits["acme"], store.misses["acme"]
+                reuse.append(timed_fetch(reusing))
+            results[str(ratio)] = {"parse_all_seconds": round(parse_all, 3), "reuse_seconds": round(min(reuse), 3),
+                                   "speedup": round(parse_all / min(reuse), 2),
+                                   "hits": store.hits["acme"] - hits, "misses": store.misses["acme"] - misses}
+    print(json.dumps({"records": len(records), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Reloading a merged inventory from a binary snapshot against parsing the JSON output:
+file size, time to write, time to open, and time to fetch a few hotels by id.
+
+Usage: python -m benchmarks.bench_snapshot [--hotels 200000] [--lookups 1000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from src.models.hotel import Hotel
+from src.models.serialization import write_hotels
+from src.models.snapshot import Snapshot, write_snapshot
+
+CITIES = [("Singapore", "SG"), ("Tokyo", "JP"), ("Paris", "FR"), ("Sydney", "AU"), ("Lima", "PE")]
+AMENITIES = ["pool", "wifi", "gym", "spa", "bar", "parking", "tv", "coffee machine", "kettle", "hair dryer", "iron"]
+
+
+def make_hotels(count: int, rng: random.Random):
+    hotels = []
+    for n in range(count):
+        city, country = rng.choice(CITIES)
+        hotels.append(Hotel.from_dict({
+            "id": f"h{n:08x}", "destination_id": n % 5000, "name": f"Hotel {n}",
+            "description": "A quiet hotel close to the beach and the old town. " * 3,
+            "location": {"address": f"{n} Main Street", "city": city, "country": country,
+                         "lat": rng.uniform(-60, 70), "lng": rng.uniform(-180, 180)},
+            "amenities": {"general": rng.sample(AMENITIES[:6], 4), "room": rng.sample(AMENITIES[6:], 3)},
+            "images": {"rooms": [{"link": f"https://img.example.com/{n}/{i}.jpg", "description": "Double room"}
+                                 for i in range(2)]},
+            "booking_conditions": ["Pets are not allowed."],
+        }))
+    return hotels
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, round(time.perf_counter() - start, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    hotels = make_hotels(args.hotels, rng)
+    wanted = [hotel.id for hotel in rng.sample(hotels, min(args.lookups, len(hotels)))]
+    with tempfile.TemporaryDirectory() as directory:
+        json_path, snapshot_path = os.path.join(directory, "output.json"), os.path.join(directory, "hotels.snapshot")
+
+        def write_json():
+            with open(json_path, "w") as f:
+                write_hotels(hotels, [f])
+
+        def json_lookups():
+            with open(json_path) as f:
+                by_id = {data["id"]: data for data in json.load(f)}
+            return [by_id[hotel_id] for hotel_id in wanted]
+
+        def snapshot_lookups():
+            with Snapshot(snapshot_path) as snapshot:
+                return [snapshot.get(hotel_id) for hotel_id in wanted]
+
+        _, json_write = timed(write_json)
+        _, snapshot_write = timed(lambda: write_snapshot(hotels, snapshot_path))
+        _, json_load = timed(json_lookups)
+        snapshot_open = timed(lambda: Snapshot(snapshot_path).close())[1]
+        _, snapshot_load = timed(snapshot_lookups)
+        with Snapshot(snapshot_path) as snapshot:
+            _, snapshot_iterate = timed(lambda: sum(1 for _ in snapshot))
+        results = {
+            "json": {"bytes": os.path.getsize(json_path), "write_seconds": json_write,
+                     "load_and_lookup_seconds": json_load},
+            "snapshot": {"bytes": os.path.getsize(snapshot_path), "write_seconds": snapshot_write,
+                         "open_seconds": snapshot_open, "open_and_lookup_seconds": snapshot_load,
+                         "decode_all_seconds": snapshot_iterate},
+        }
+    print(json.dumps({"hotels": args.hotels, "lookups": len(wanted), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
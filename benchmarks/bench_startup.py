@@ -0,0 +1,59 @@
+"""
+Cold-start cost of the CLI: interpreter startup alone, importing main and
+`main.py --help`, each in a fresh process, plus the slowest imports.
+
+Usage: python -m benchmarks.bench_startup [--runs 10] [--top 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "interpreter": [sys.executable, "-c", "pass"],
+    "import_main": [sys.executable, "-c", "import main"],
+    "help": [sys.executable, "main.py", "--help"],
+}
+
+
+def median_ms(command, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 1)
+
+
+def slowest_imports(top: int):
+    """Modules imported by main, by cumulative import time in microseconds (-X importtime)."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    return [{"module": name, "us": us} for us, name in sorted(rows, reverse=True)[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    loaded = subprocess.run([sys.executable, "-c", "import main, sys; print(sorted(m for m in ('requests', "
+                             "'asyncio', 'sqlite3', 'multiprocessing', 'cProfile', 'numpy') if m in sys.modules))"],
+                            cwd=ROOT, check=True, capture_output=True, text=True).stdout.strip()
+    results = {name: median_ms(command, args.runs) for name, command in COMMANDS.items()}
+    print(json.dumps({"runs": args.runs, "median_ms": results, "heavy_modules_loaded_by_import": loaded,
+                      "slowest_imports": slowest_imports(args.top)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
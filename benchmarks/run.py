@@ -0,0 +1,112 @@
+"""
+End-to-end benchmark: synthetic acme, patagonia and paperflies payloads served
+from a local stub server, with fetch, parse, merge, filter and serialize timed separately.
+
+Usage: python -m benchmarks.run [--hotels 20000] [--overlap 0.5] [--repeat 3] [--output results.json]
+
+Results are printed as JSON (and written to --output), including the git commit,
+so runs from different commits can be compared stage by stage.
+"""
+import argparse
+import io
+import json
+import platform
+import subprocess
+import time
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.data_merger import DataMerger
+from src.data_integration.hotel_index import HotelIndex
+from src.data_integration.paperflies_supplier import PaperfliesSupplier
+from src.data_integration.patagonia_supplier import PatagoniaSupplier
+from src.models.serialization import OUTPUT_FORMATS, write_hotels
+from benchmarks.synthetic import supplier_payloads
+from tests.helpers import StubServer, json_route
+
+STAGES = ("fetch", "parse", "merge", "filter", "serialize")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_once(suppliers, merger, output_format):
+    """Run the pipeline once, returning the seconds spent in each stage and the item count it processed."""
+    timings = {}
+
+    start = time.perf_counter()
+    raw = [supplier.fetch_records() for supplier in suppliers]
+    timings["fetch"] = (time.perf_counter() - start, sum(map(len, raw)))
+
+    start = time.perf_counter()
+    hotels = [supplier.parse(dto) for supplier, records in zip(suppliers, raw) for dto in records]
+    timings["parse"] = (time.perf_counter() - start, len(hotels))
+
+    start = time.perf_counter()
+    merged = merger.merge_groups(hotels)
+    timings["merge"] = (time.perf_counter() - start, len(hotels))
+
+    # Index build plus a handful of the queries main.py runs
+    start = time.perf_counter()
+    index = HotelIndex(merged)
+    sample_ids = [hotel.id for hotel in merged[::max(len(merged) // 100, 1)]]
+    queries = [(sample_ids, [], None, None), ([], [1000, 1001, 1002], None, None),
+               ([], [1000], ["wifi"], None), ([], [], None, "hotel 1")]
+    for hotel_ids, destination_ids, amenities, name_prefix in queries:
+        index.query(hotel_ids, destination_ids, amenities, name_prefix)
+    timings["filter"] = (time.perf_counter() - start, len(queries))
+
+    start = time.perf_counter()
+    write_hotels(merged, [io.StringIO()], output_format)
+    timings["serialize"] = (time.perf_counter() - start, len(merged))
+    return timings, len(merged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=" ".join(__doc__.splitlines()[1:3]))
+    parser.add_argument("--hotels", type=int, default=20000, help="Distinct hotels across all suppliers")
+    parser.add_argument("--overlap", type=float, default=0.5, help="Fraction of hotels listed by every supplier")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the fastest is reported")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the stub server delays each response")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="pretty", help="Format timed by serialize")
+    parser.add_argument("--output", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    payloads = supplier_payloads(args.hotels, args.overlap, args.seed)
+    merger = DataMerger()
+    best = {}
+    routes = {f"/{key}": json_route(records, delay=args.latency) for key, records in payloads.items()}
+    with StubServer(routes) as server:
+        suppliers = [server.supplier(cls.supplier_key, f"/{cls.supplier_key}", base=cls)
+                     for cls in (AcmeSupplier, PatagoniaSupplier, PaperfliesSupplier)]
+        for _ in range(args.repeat):
+            timings, merged_count = run_once(suppliers, merger, args.format)
+            for stage, (seconds, items) in timings.items():
+                if stage not in best or seconds < best[stage][0]:
+                    best[stage] = (seconds, items)
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "params": {"hotels": args.hotels, "overlap": args.overlap, "seed": args.seed, "repeat": args.repeat,
+                   "latency": args.latency, "format": args.format},
+        "records": sum(map(len, payloads.values())),
+        "merged_hotels": merged_count,
+        "payload_bytes": sum(len(json.dumps(records).encode()) for records in payloads.values()),
+        "stages": {stage: {"seconds": round(best[stage][0], 4), "items": best[stage][1],
+                           "items_per_second": round(best[stage][1] / best[stage][0]) if best[stage][0] else None}
+                   for stage in STAGES},
+    }
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
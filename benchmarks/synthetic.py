@@ -0,0 +1,27 @@
+from typing import Dict, List
+from tests.helpers import supplier_records
+
+
+def supplier_payloads(hotels: int, overlap: float = 0.5, seed: int = 0,
+                      supplier_keys=("acme", "patagonia", "paperflies")) -> Dict[str, List[dict]]:
+    """
+    Generate one payload per supplier over a shared inventory of hotels.
+
+    Args:
+    - hotels: Number of distinct hotels across all suppliers.
+    - overlap: Fraction of the hotels listed by every supplier; the rest are each listed by a single supplier.
+    - seed: Random seed, so runs are reproducible.
+    - supplier_keys: Suppliers to generate payloads for, in merge order.
+
+    Returns:
+    - A dict mapping each supplier key to its raw records, ordered by hotel index.
+    """
+    if not 0 <= overlap <= 1:
+        raise ValueError(f"overlap must be between 0 and 1, got {overlap}")
+    shared = round(hotels * overlap)
+    payloads = {}
+    for position, key in enumerate(supplier_keys):
+        # Shared hotels come first, then every len(supplier_keys)-th hotel of the remainder
+        own = range(shared + position, hotels, len(supplier_keys))
+        payloads[key] = supplier_records(key, shared, seed) + supplier_records(key, len(own), seed, own.start, own.step)
+    return payloads
@@ -1,10 +1,120 @@
 import json
+import os
+import threading
+
+# Config files live next to this module, so loading does not depend on the working directory.
+# HOTEL_CONFIG_DIR points the registry at another directory (e.g. a deployment's config).
+CONFIG_DIR = os.environ.get("HOTEL_CONFIG_DIR") or os.path.dirname(os.path.abspath(__file__))
+
+FIELD_TYPES = ("integer", "float", "string", "list")
+PAYLOAD_FORMATS = ("json", "ndjson")
+
+
+class ConfigError(ValueError):
+    """Raised when a config file is missing required keys or has values of the wrong shape."""
+
 
 def load_config(path):
     with open(path, 'r') as file:
         return json.load(file)
 
-SUPPLIER_CONFIG = load_config('config/suppliers_config.json')
-AMENITIES_CONFIG = load_config('config/amenities_config.json')
-GENERAL_AMENITIES = AMENITIES_CONFIG['general']
-ROOM_AMENITIES = AMENITIES_CONFIG['room']
\ No newline at end of file
+
+def _require(condition, filename, message):
+    if not condition:
+        raise ConfigError(f"{filename}: {message}")
+
+
+def validate_suppliers(config: dict, filename: str = "suppliers_config.json"):
+    _require(isinstance(config, dict) and config, filename, "expected a non-empty object of suppliers")
+    for key, supplier in config.items():
+        _require(isinstance(supplier, dict), filename, f"supplier '{key}' must be an object")
+        _require(isinstance(supplier.get("endpoint"), str), filename, f"supplier '{key}' needs an endpoint URL")
+        _require(isinstance(supplier.get("http", {}), dict), filename, f"supplier '{key}': http must be an object")
+        _require(supplier.get("format", "json") in PAYLOAD_FORMATS, filename,
+                 f"supplier '{key}': format must be one of {PAYLOAD_FORMATS}")
+        _require(isinstance(supplier.get("class", ""), str), filename, f"supplier '{key}': class must be a string")
+        fields = supplier.get("fields")
+        _require(isinstance(fields, dict) and "id" in fields, filename, f"supplier '{key}' needs fields with an id")
+        for field, rules in fields.items():
+            _require(isinstance(rules, dict) and "source" in rules, filename,
+                     f"supplier '{key}', field '{field}' needs a source")
+            _require(rules.get("type", "string") in FIELD_TYPES, filename,
+                     f"supplier '{key}', field '{field}': type must be one of {FIELD_TYPES}")
+
+
+def validate_amenities(config: dict, filename: str = "amenities_config.json"):
+    for category in ("general", "room"):
+        _require(isinstance(config.get(category), list), filename, f"'{category}' must be a list of amenities")
+    aliases = config.get("aliases", {})
+    _require(isinstance(aliases, dict) and all(isinstance(names, list) for names in aliases.values()), filename,
+             "'aliases' must map amenities to lists of alternative names")
+
+
+def validate_merge_strategy(config: dict, filename: str = "merge_strategy.json"):
+    fields = config.get("fields") if isinstance(config, dict) else None
+    _require(isinstance(fields, dict), filename, "expected a 'fields' object")
+    for field, strategy in fields.items():
+        _require(isinstance(strategy, dict) and isinstance(strategy.get("strategy", ""), str), filename,
+                 f"field '{field}' needs a strategy name")
+    _require(isinstance(config.get("duplicates", {}), dict), filename, "'duplicates' must be an object of thresholds")
+
+
+class ConfigRegistry:
+    """Loads each config file on first use, validates it and keeps it for the life of the process."""
+
+    FILES = {
+        "suppliers": ("suppliers_config.json", validate_suppliers),
+        "amenities": ("amenities_config.json", validate_amenities),
+        "merge_strategy": ("merge_strategy.json", validate_merge_strategy),
+    }
+
+    def __init__(self, directory: str = CONFIG_DIR):
+        """
+        Args:
+        - directory: Directory holding suppliers_config.json, amenities_config.json and merge_strategy.json.
+        """
+        self.directory = directory
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> dict:
+        config = self._loaded.get(name)
+        if config is None:
+            with self._lock:
+                config = self._loaded.get(name)
+                if config is None:
+                    filename, validate = self.FILES[name]
+                    config = load_config(os.path.join(self.directory, filename))
+                    validate(config, filename)
+                    self._loaded[name] = config
+        return config
+
+    @property
+    def suppliers(self) -> dict:
+        return self.get("suppliers")
+
+    @property
+    def amenities(self) -> dict:
+        return self.get("amenities")
+
+    @property
+    def merge_strategy(self) -> dict:
+        return self.get("merge_strategy")
+
+
+registry = ConfigRegistry()
+
+# The module-level names below are resolved on first access rather than at import
+_LAZY_NAMES = {
+    "SUPPLIER_CONFIG": lambda: registry.suppliers,
+    "AMENITIES_CONFIG": lambda: registry.amenities,
+    "GENERAL_AMENITIES": lambda: registry.amenities["general"],
+    "ROOM_AMENITIES": lambda: registry.amenities["room"],
+    "MERGE_STRATEGY": lambda: registry.merge_strategy,
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        return _LAZY_NAMES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,37 +1,152 @@
 import argparse
-from src.data_integration.acme_supplier import AcmeSupplier
-from src.data_integration.patagonia_supplier import PatagoniaSupplier
-from src.data_integration.paperflies_supplier import PaperfliesSupplier
+from src.data_integration.base_supplier import configured_suppliers
+from src.data_integration.hotel_index import HotelIndex
 from src.data_integration.supplier_manager import SupplierManager
+from src.data_integration import instrumentation
+from src.models.serialization import JSON_BACKENDS, OUTPUT_FORMATS, write_hotels
+from src.models.snapshot import Snapshot, write_snapshot
 import json
-from dataclasses import asdict
+import sys
 
-def fetch_hotels(hotel_ids, destination_ids):
-    # Setup suppliers
-    suppliers = [AcmeSupplier(), PatagoniaSupplier(), PaperfliesSupplier()]
-    manager = SupplierManager(suppliers)
+def build_manager(*, fetch_mode="sequential", workers=None, timeout=None, stream=False, cache_path=None, cache_ttl=3600,
+                  parse_workers=None, reuse_records=False, columnar=False, match_duplicates=False):
+    # Setup suppliers, in the order suppliers_config.json lists them
+    suppliers = configured_suppliers()
+    cache = None
+    if cache_path:
+        from src.data_integration.cache import HotelCache
+        cache = HotelCache(cache_path, ttl=cache_ttl)
+    return SupplierManager(suppliers, mode=fetch_mode, max_workers=workers, timeout=timeout, stream=stream,
+                           cache=cache, parse_workers=parse_workers,
+                           reuse_records=reuse_records, columnar=columnar, match_duplicates=match_duplicates)
 
-    # Fetch, merge, and filter data from all suppliers
-    merged_hotels = manager.fetch_and_merge_data()
+def fetch_hotels(hotel_ids, destination_ids, *, fetch_mode="sequential", workers=None, timeout=None, stream=False,
+                 cache_path=None, cache_ttl=3600, amenities=None, name_prefix=None, output_format="pretty",
+                 output_path="output.json", json_backend="json", parse_workers=None, near=None, columnar=False,
+                 match_duplicates=False, snapshot_path=None, from_snapshot=None):
     hotel_ids = hotel_ids.split(',') if (hotel_ids and hotel_ids != "none")  else []
     destination_ids = destination_ids.split(',') if (destination_ids and destination_ids != "none") else []
-    filtered_hotels = manager.filter_hotels(merged_hotels, hotel_ids, destination_ids)
+    amenities = amenities.split(',') if amenities else []
+    if from_snapshot:
+        # Answer from a snapshot instead of the suppliers, decoding only the requested hotels
+        with Snapshot(from_snapshot) as snapshot, instrumentation.stage("load"):
+            merged_hotels = snapshot.select(hotel_ids)
+        with instrumentation.stage("filter"):
+            filtered_hotels = HotelIndex(merged_hotels).query(hotel_ids, destination_ids, amenities, name_prefix, near)
+    else:
+        manager = build_manager(fetch_mode=fetch_mode, workers=workers, timeout=timeout, stream=stream,
+                                cache_path=cache_path, cache_ttl=cache_ttl, parse_workers=parse_workers,
+                                columnar=columnar, match_duplicates=match_duplicates)
 
-    # Convert filtered hotels to JSON
-    dict_result = [asdict(hotel) for hotel in filtered_hotels]
-    json_output = json.dumps(dict_result, indent=2)
+        # Fetch, merge, and filter data from all suppliers
+        merged_hotels = manager.fetch_and_merge_data()
+        with instrumentation.stage("filter"):
+            filtered_hotels = manager.filter_hotels(merged_hotels, hotel_ids, destination_ids, amenities, name_prefix,
+                                                    near)
 
-    with open("output.json", "w") as f:
-        f.write(json_output)
-    print(json_output)
+    # Stream the filtered hotels as JSON to the output file and stdout in one pass
+    with open(output_path, "w") as f, instrumentation.stage("serialize"):
+        write_hotels(filtered_hotels, [f, sys.stdout], output_format, json_backend)
+    if output_format != "ndjson":
+        sys.stdout.write("\n")
+    if snapshot_path:
+        # The whole inventory, so later --from-snapshot runs can answer any query
+        with instrumentation.stage("snapshot"):
+            write_snapshot(merged_hotels, snapshot_path)
+
+def near_arg(value):
+    try:
+        lat, lng, radius_km = (float(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected LAT,LNG,KM")
+    if not -90 <= lat <= 90:
+        raise argparse.ArgumentTypeError("LAT must be between -90 and 90")
+    if not -180 <= lng <= 180:
+        raise argparse.ArgumentTypeError("LNG must be between -180 and 180")
+    if not radius_km >= 0:
+        raise argparse.ArgumentTypeError("KM must not be negative")
+    return lat, lng, radius_km
 
 def main():
     parser = argparse.ArgumentParser(description="Hotel Data Merger")
-    parser.add_argument("hotel_ids", type=str, help="Comma-separated hotel IDs", default="")
-    parser.add_argument("destination_ids", type=str, help="Comma-separated destination IDs", default="")
+    parser.add_argument("hotel_ids", type=str, nargs="?", help="Comma-separated hotel IDs", default="")
+    parser.add_argument("destination_ids", type=str, nargs="?", help="Comma-separated destination IDs", default="")
+    parser.add_argument("--amenities", type=str, default=None, help="Comma-separated amenities every hotel must have")
+    parser.add_argument("--name-prefix", type=str, default=None, help="Only hotels whose name starts with this")
+    parser.add_argument("--near", type=near_arg, default=None, metavar="LAT,LNG,KM",
+                        help="Only hotels within KM kilometres of LAT,LNG")
+    parser.add_argument("--fetch-mode", choices=SupplierManager.FETCH_MODES, default="sequential",
+                        help="How suppliers are fetched")
+    parser.add_argument("--workers", type=int, default=None, help="Maximum number of concurrent supplier fetches")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-supplier fetch timeout in seconds")
+    parser.add_argument("--stream", action="store_true", help="Stream supplier payloads into the merger")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Parse and merge on this many processes, sharded by hotel id")
+    parser.add_argument("--columnar", action="store_true",
+                        help="Merge scalar fields a column at a time across all hotels")
+    parser.add_argument("--match-duplicates", action="store_true",
+                        help="Merge records of the same hotel listed under different ids (see merge_strategy.json)")
+    parser.add_argument("--cache", metavar="PATH", default=None, help="SQLite file caching parsed and merged hotels")
+    parser.add_argument("--cache-ttl", type=float, default=3600, help="Seconds cached hotels stay valid")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="pretty", help="Output format")
+    parser.add_argument("--output", default="output.json", help="File the hotels are written to")
+    parser.add_argument("--json-backend", choices=JSON_BACKENDS, default="json",
+                        help="JSON encoder; orjson is faster but does not escape non-ASCII characters")
+    parser.add_argument("--snapshot", metavar="PATH", default=None,
+                        help="Also write every merged hotel, unfiltered, to a binary snapshot at PATH")
+    parser.add_argument("--from-snapshot", metavar="PATH", default=None,
+                        help="Query a binary snapshot written by --snapshot instead of fetching suppliers")
+    parser.add_argument("--metrics", metavar="PATH", default=None,
+                        help="Collect per-stage timings and counters and write them to PATH as JSON")
+    parser.add_argument("--profile", choices=instrumentation.PROFILE_MODES, default=None,
+                        help="Profile the run with cProfile or tracemalloc")
+    parser.add_argument("--profile-output", default="profile.out", help="File the profile is written to")
+    parser.add_argument("--serve", action="store_true", help="Keep running and serve queries over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Address the server listens on")
+    parser.add_argument("--port", type=int, default=8000, help="Port the server listens on")
+    parser.add_argument("--reuse-records", action="store_true",
+                        help="With --serve, only parse supplier records that changed since the last refresh")
+    parser.add_argument("--refresh-interval", type=float, default=300, help="Seconds between supplier refreshes")
     args = parser.parse_args()
+    if args.reuse_records and not args.serve:
+        # Parsed records are kept in memory between refreshes, so a single fetch has nothing to reuse
+        parser.error("--reuse-records only applies with --serve")
+    if args.serve:
+        # The server keeps its merged hotels in memory and refreshes them from the suppliers
+        for flag, value in (("--stream", args.stream), ("--parse-workers", args.parse_workers),
+                            ("--snapshot", args.snapshot), ("--from-snapshot", args.from_snapshot),
+                            ("--json-backend", args.json_backend != "json")):
+            if value:
+                parser.error(f"{flag} cannot be combined with --serve")
+    if args.stream and args.fetch_mode != "sequential":
+        parser.error("--stream only supports --fetch-mode sequential")
+    if args.parse_workers and (args.stream or args.cache):
+        parser.error("--parse-workers cannot be combined with --stream or --cache")
+    if args.match_duplicates and (args.stream or args.parse_workers):
+        # Matching needs every record at once, which streaming and sharded parsing never hold
+        parser.error("--match-duplicates cannot be combined with --stream or --parse-workers")
+    if args.snapshot and args.from_snapshot:
+        parser.error("--snapshot cannot be combined with --from-snapshot")
+
+    if args.serve:
+        from src.service.hotel_server import serve
+        manager = build_manager(fetch_mode=args.fetch_mode, workers=args.workers, timeout=args.timeout,
+                                cache_path=args.cache, cache_ttl=args.cache_ttl, reuse_records=args.reuse_records,
+                                columnar=args.columnar, match_duplicates=args.match_duplicates)
+        serve(manager, args.host, args.port, args.refresh_interval)
+        return
 
-    fetch_hotels(args.hotel_ids, args.destination_ids)
+    metrics = instrumentation.enable() if args.metrics else None
+    with instrumentation.profile(args.profile, args.profile_output):
+        fetch_hotels(args.hotel_ids, args.destination_ids, fetch_mode=args.fetch_mode, workers=args.workers,
+                     timeout=args.timeout, stream=args.stream, cache_path=args.cache, cache_ttl=args.cache_ttl,
+                     amenities=args.amenities, name_prefix=args.name_prefix, output_format=args.format,
+                     output_path=args.output, json_backend=args.json_backend, parse_workers=args.parse_workers,
+                     near=args.near, columnar=args.columnar, match_duplicates=args.match_duplicates,
+                     snapshot_path=args.snapshot, from_snapshot=args.from_snapshot)
+    if metrics is not None:
+        with open(args.metrics, "w") as f:
+            json.dump(metrics.report(), f, indent=2)
 
 if __name__ == "__main__":
     main()
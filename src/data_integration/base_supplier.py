@@ -1,58 +1,215 @@
-import requests
+import functools
+import importlib
+import time
+from concurrent.futures import Executor
 from abc import ABC, abstractmethod
-from config.config import SUPPLIER_CONFIG, AMENITIES_CONFIG
+from config.config import registry
+from . import instrumentation
+from .cache import config_fingerprint
+from .http_transport import HttpOptions, HttpTransport, Validators, default_transport
 from .parser import *
-from typing import List
+from .record_store import RecordStore
+from .streaming import STREAM_FORMATS
+from typing import Iterator, List, Optional, Type
 from ..models.hotel import Hotel
 
+
+@functools.lru_cache(maxsize=None)
+def amenity_index() -> AmenityIndex:
+    """Built on first use, then shared by every supplier."""
+    return AmenityIndex(registry.amenities)
+
+
 class BaseSupplier(ABC):
     supplier_key = None  # Subclass must define this
+    _parse_plans = {}  # supplier_key -> ParsePlan, shared by all instances
+
+    def __init__(self, transport: Optional[HttpTransport] = None, record_store: Optional[RecordStore] = None):
+        self.transport = transport or default_transport()
+        # When set, fetch() only parses records whose text changed since the previous fetch
+        self.record_store = record_store
+        # Validators and parsed hotels from the last 200 response, reused on a 304
+        self._validators: Optional[Validators] = None
+        self._cached_hotels: Optional[List[Hotel]] = None
+        if self.supplier_key in registry.suppliers:
+            self.parse_plan()  # Compile the field mapping up front rather than on the first record
 
     def endpoint(self) -> str:
         """Return the supplier's endpoint from the config."""
-        return SUPPLIER_CONFIG[self.supplier_key]["endpoint"]
+        return registry.suppliers[self.supplier_key]["endpoint"]
 
-    def fetch(self) -> List[Hotel]:
-        """Fetch data from the supplier's endpoint and parse it."""
-        response = requests.get(self.endpoint())
-        response.raise_for_status()
-        raw_data = response.json()
-        return [self.parse(dto) for dto in raw_data]
+    def fingerprint(self) -> str:
+        """Hash of everything that shapes this supplier's parsed hotels, used to invalidate cached hotels."""
+        return config_fingerprint(self.endpoint(), registry.suppliers.get(self.supplier_key), registry.amenities)
 
-    def parse(self, dto) -> Hotel:
-        """Parse a single data object using the supplier's configuration."""
-        config = SUPPLIER_CONFIG[self.supplier_key]["fields"]
+    def payload_format(self) -> str:
+        """Return the supplier's payload format from the config: "json" (default) or "ndjson"."""
+        return registry.suppliers.get(self.supplier_key, {}).get("format", "json")
 
-        # Parse fields using the Parser
-        parsed_data = Parser.parse(dto, config)
+    def http_options(self) -> HttpOptions:
+        """Return the supplier's transport settings from the config."""
+        return HttpOptions.from_config(registry.suppliers.get(self.supplier_key, {}).get("http"))
 
-        # Group nested fields dynamically
-        grouped_data = self._group_nested_fields(parsed_data)
+    def fetch(self, timeout: Optional[float] = None) -> List[Hotel]:
+        """
+        Fetch data from the supplier's endpoint and parse it.
 
-        # Parse amenities
-        grouped_data["amenities"] = Parser.parse_amenities(grouped_data["amenities"], AMENITIES_CONFIG)
+        Args:
+        - timeout: Seconds to wait for the supplier to respond (default is the configured timeout).
+
+        Returns:
+        - A list of parsed Hotel objects. If the supplier answers 304 Not Modified,
+          the hotels parsed from its previous response are returned instead.
+        """
+        options = self.http_options()
+        if timeout is not None:
+            options.timeout = timeout
+        validators = self._validators if self._cached_hotels is not None else None
+        metrics = instrumentation.active()
+
+        start = time.perf_counter()
+        response = self.transport.get(self.endpoint(), options, validators)
+        if metrics is not None:
+            metrics.record_fetch(self.supplier_key, time.perf_counter() - start, len(response.content))
+        if response.status_code == 304 and self._cached_hotels is not None:
+            # Merging writes into the records it is given, so hand out copies (see Hotel.copy)
+            return [hotel.copy() for hotel in self._cached_hotels]
+        response.raise_for_status()
+        start = time.perf_counter()
+        payload_format = self.payload_format()
+        if self.record_store is None:
+            if payload_format == "json":
+                raw_data = response.json()
+            else:
+                raw_data = STREAM_FORMATS[payload_format]([response.content])
+            hotels = [self.parse(dto) for dto in raw_data]
+        else:
+            items = STREAM_FORMATS[payload_format]([response.content], with_text=True)
+            hotels, hits, misses = self.record_store.parse_all(self.supplier_key, self.fingerprint(), items, self.parse)
+            if metrics is not None:
+                metrics.record_reuse(self.supplier_key, hits, misses)
+        if metrics is not None:
+            metrics.record_parse(self.supplier_key, len(hotels), time.perf_counter() - start)
+
+        validators = Validators.from_response(response)
+        if options.conditional and validators.headers():
+            self._validators = validators
+            self._cached_hotels = [hotel.copy() for hotel in hotels]
+        else:
+            self._validators = self._cached_hotels = None
+        return hotels
+
+    def fetch_records(self, timeout: Optional[float] = None) -> List[dict]:
+        """
+        Fetch the supplier's payload and return its raw records without parsing them.
 
-        # Create and return the Hotel object
-        return Hotel(**grouped_data)
+        Used when parsing happens elsewhere, e.g. on a process pool. Conditional
+        requests are not used here since there is no parsed copy to fall back on.
+        """
+        options = self.http_options()
+        if timeout is not None:
+            options.timeout = timeout
+        metrics = instrumentation.active()
+        start = time.perf_counter()
+        response = self.transport.get(self.endpoint(), options)
+        if metrics is not None:
+            metrics.record_fetch(self.supplier_key, time.perf_counter() - start, len(response.content))
+        response.raise_for_status()
+        payload_format = self.payload_format()
+        return response.json() if payload_format == "json" else list(STREAM_FORMATS[payload_format]([response.content]))
 
-    def _group_nested_fields(self, flat_data: dict, sep: str = ".") -> dict:
+    def iter_hotels(self, timeout: Optional[float] = None, chunk_size: int = 1 << 16) -> Iterator[Hotel]:
         """
-        Convert flattened keys into nested dictionaries.
+        Stream the supplier's payload and yield hotels one at a time.
+
+        The body is decoded incrementally as a JSON array, or as NDJSON when the
+        supplier's config sets "format": "ndjson", so memory use does not grow
+        with the size of the feed. Conditional requests are not used here since
+        there is no parsed copy to fall back on.
 
         Args:
-        - flat_data: A dictionary with flattened keys (e.g., "location.lat").
-        - sep: The separator used in flattened keys (default is ".").
+        - timeout: Seconds to wait for the supplier to respond (default is the configured timeout).
+        - chunk_size: Number of bytes read from the response at a time.
 
         Returns:
-        - A nested dictionary.
+        - An iterator over parsed Hotel objects.
         """
-        nested_data = {}
-        for key, value in flat_data.items():
-            keys = key.split(sep)
-            d = nested_data
-            for part in keys[:-1]:
-                d = d.setdefault(part, {})
-            d[keys[-1]] = value
-        return nested_data
+        options = self.http_options()
+        if timeout is not None:
+            options.timeout = timeout
+        iter_items = STREAM_FORMATS[self.payload_format()]
+        metrics = instrumentation.active()
+
+        start = time.perf_counter()
+        response = self.transport.get(self.endpoint(), options, stream=True)
+        records = 0
+        try:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=chunk_size)
+            if metrics is not None:
+                # Only the time to the response headers counts as fetch latency here
+                metrics.record_fetch(self.supplier_key, time.perf_counter() - start, 0)
+                chunks = metrics.count_bytes(self.supplier_key, chunks)
+                start = time.perf_counter()
+            for dto in iter_items(chunks):
+                records += 1
+                yield self.parse(dto)
+        finally:
+            response.close()
+            if metrics is not None:
+                # Download, parsing and the consumer are interleaved, so parse time covers the whole stream
+                metrics.record_parse(self.supplier_key, records, time.perf_counter() - start)
+
+    async def fetch_async(self, timeout: Optional[float] = None, executor: Optional[Executor] = None) -> List[Hotel]:
+        """
+        Asyncio variant of fetch().
+
+        The blocking HTTP call runs in the given executor (or the loop's default
+        executor), so several suppliers can be awaited together. The timeout
+        bounds the whole call.
+        """
+        import asyncio  # Only needed by the async fetch mode, and slow to import
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(executor, self.fetch, timeout), timeout)
+
+    def parse_plan(self) -> ParsePlan:
+        """Return the supplier's compiled field mapping, compiling it on first use."""
+        plan = BaseSupplier._parse_plans.get(self.supplier_key)
+        if plan is None:
+            plan = Parser.compile(registry.suppliers[self.supplier_key]["fields"])
+            BaseSupplier._parse_plans[self.supplier_key] = plan
+        return plan
+
+    def parse(self, dto) -> Hotel:
+        """Parse a single data object using the supplier's configuration."""
+        # Parse fields straight into their nested layout using the compiled plan
+        grouped_data = self.parse_plan()(dto)
+
+        # Parse amenities
+        grouped_data["amenities"] = Parser.parse_amenities(grouped_data["amenities"], amenity_index())
+
+        # Create and return the typed Hotel object
+        return Hotel.from_dict(grouped_data)
+
+
+def supplier_class(supplier_key: str) -> Type[BaseSupplier]:
+    """
+    Return the class handling a supplier in suppliers_config.json.
+
+    The supplier's "class" entry names it as "package.module.ClassName" and is only imported
+    here. A supplier without one is fully described by its config and gets a plain BaseSupplier subclass.
+    """
+    path = registry.suppliers[supplier_key].get("class")
+    if not path:
+        name = "".join(part.title() for part in supplier_key.split("_")) + "Supplier"
+        return type(name, (BaseSupplier,), {"supplier_key": supplier_key})
+    module_name, _, class_name = path.rpartition(".")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(cls, type) and issubclass(cls, BaseSupplier)):
+        raise TypeError(f"{path} configured for supplier '{supplier_key}' is not a BaseSupplier")
+    return cls
 
 
+def configured_suppliers(transport: Optional[HttpTransport] = None) -> List[BaseSupplier]:
+    """Instantiate every supplier in suppliers_config.json, in the order they are listed (which is the merge order)."""
+    return [supplier_class(key)(transport) for key in registry.suppliers]
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+from ..models.hotel import Hotel
+from ..models.serialization import hotel_to_dict
+
+SCHEMA_VERSION = 1
+
+
+def config_fingerprint(*parts) -> str:
+    """Return a stable hash of JSON-serializable configuration parts."""
+    canonical = json.dumps([SCHEMA_VERSION, *parts], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class HotelCache:
+    """
+    Persistent SQLite cache of each supplier's parsed hotels and of the merged result.
+
+    Every entry carries a fingerprint. A supplier entry is fingerprinted with that
+    supplier's config (plus the amenities config that shapes parsing); the merged
+    entry with the merge strategy and the fingerprint and age of each supplier
+    entry it was built from. Changing one supplier's config therefore invalidates
+    that supplier and the merged result, but not the other suppliers. Entries older
+    than the TTL are treated as missing.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 3600, clock: Callable[[], float] = time.time):
+        """
+        Args:
+        - path: SQLite database file (":memory:" for a throwaway cache).
+        - ttl: Seconds an entry stays valid (None keeps entries until their fingerprint changes).
+        - clock: Source of the current time, in seconds.
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        import sqlite3  # Here rather than at the top, since suppliers import this module for config_fingerprint
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS supplier_hotels ("
+                             "supplier_key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                             "stored_at REAL NOT NULL, payload BLOB NOT NULL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS merged_hotels ("
+                             "fingerprint TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload BLOB NOT NULL)")
+
+    # ===============================
+    # Per-supplier entries
+    # ===============================
+
+    def get_supplier(self, supplier_key: str, fingerprint: str) -> Optional[List[Hotel]]:
+        """Return the supplier's cached hotels, or None if missing, stale or built from another config."""
+        entry = self.supplier_entry(supplier_key, fingerprint)
+        if entry is None:
+            return None
+        row = self._query("SELECT payload FROM supplier_hotels WHERE supplier_key = ?", (supplier_key,))
+        return self._decode(row[0]) if row else None
+
+    def supplier_entry(self, supplier_key: str, fingerprint: str) -> Optional[Tuple[str, float]]:
+        """Return (fingerprint, stored_at) of a valid supplier entry, without decoding its hotels."""
+        row = self._query("SELECT fingerprint, stored_at FROM supplier_hotels WHERE supplier_key = ?",
+                          (supplier_key,))
+        if row is None or row[0] != fingerprint or self._expired(row[1]):
+            return None
+        return row
+
+    def put_supplier(self, supplier_key: str, fingerprint: str, hotels: List[Hotel]):
+        self._execute("INSERT OR REPLACE INTO supplier_hotels VALUES (?, ?, ?, ?)",
+                      (supplier_key, fingerprint, self.clock(), self._encode(hotels)))
+
+    # ===============================
+    # Merged entries
+    # ===============================
+
+    def get_merged(self, fingerprint: str) -> Optional[List[Hotel]]:
+        row = self._query("SELECT stored_at, payload FROM merged_hotels WHERE fingerprint = ?", (fingerprint,))
+        if row is None or self._expired(row[0]):
+            return None
+        return self._decode(row[1])
+
+    def put_merged(self, fingerprint: str, hotels: List[Hotel]):
+        # Only the latest merged result is useful; older fingerprints can never match again
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM merged_hotels")
+            self._db.execute("INSERT INTO merged_hotels VALUES (?, ?, ?)",
+                             (fingerprint, self.clock(), self._encode(hotels)))
+
+    def merged_fingerprint(self, merge_strategy: dict, supplier_entries: Sequence[Tuple[str, str, float]]) -> str:
+        """Fingerprint a merged result from the merge strategy and (supplier_key, fingerprint, stored_at) entries."""
+        return config_fingerprint(merge_strategy, [list(entry) for entry in supplier_entries])
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM supplier_hotels")
+            self._db.execute("DELETE FROM merged_hotels")
+
+    def close(self):
+        self._db.close()
+
+    # ===============================
+    # Helper Methods
+    # ===============================
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and self.clock() - stored_at > self.ttl
+
+    def _query(self, sql: str, params: tuple):
+        with self._lock:
+            return self._db.execute(sql, params).fetchone()
+
+    def _execute(self, sql: str, params: tuple):
+        with self._lock, self._db:
+            self._db.execute(sql, params)
+
+    @staticmethod
+    def _encode(hotels: List[Hotel]) -> bytes:
+        return json.dumps([hotel_to_dict(hotel) for hotel in hotels], separators=(",", ":")).encode()
+
+    @staticmethod
+    def _decode(payload: bytes) -> List[Hotel]:
+        return [Hotel.from_dict(data) for data in json.loads(payload)]
@@ -0,0 +1,202 @@
+import operator
+from itertools import repeat
+from typing import Any, Callable, List, Sequence, Tuple
+from .lazy_numpy import UNLOADED, load_numpy
+
+# numpy is optional (columns are then converted and resolved in plain Python). DataMerger
+# imports this module, so numpy is only loaded once a column is processed.
+np = UNLOADED
+
+# Conversions of Parser._transform_value for the scalar field types
+CASTS = {"integer": int, "float": float, "string": str}
+# Scalar merge strategies that resolve() can apply to a whole column
+COLUMN_STRATEGIES = ("first_non_null", "choose_best")
+
+_NONE = type(None)
+# Value kinds as choose_best tells them apart: missing, text, number, anything else
+_MISSING, _TEXT, _NUMBER, _OTHER, _UNKNOWN = range(5)
+_KINDS = {_NONE: _MISSING, str: _TEXT, int: _NUMBER, float: _NUMBER, bool: _NUMBER}
+
+
+def convert_column(values: Sequence[Any], value_type: str) -> Tuple[List[Any], List[bool]]:
+    """
+    Convert a whole column of raw values to a field type.
+
+    Gives the same values as Parser._transform_value applied one by one: None stays
+    None, and a value that cannot be converted becomes None. Instead of raising, such
+    values are flagged in the returned mask. This includes the values the per-record
+    path does not catch, e.g. int(float("inf")) raises OverflowError there.
+
+    Args:
+    - values: The raw values, one per record.
+    - value_type: "integer", "float" or "string".
+
+    Returns:
+    - The converted values, and a mask that is True where a present value could not be converted.
+      When every value already has the target type, the values list itself is returned.
+    """
+    load_numpy(__name__)  # Sets np for the float truncation below
+    cast = CASTS[value_type]
+    invalid = [False] * len(values)
+    types = set(map(type, values))
+    types.discard(_NONE)
+    if not types or types == {cast}:
+        return values, invalid  # The cast would return every value unchanged
+
+    converted = list(values)
+
+    floats = []
+    for position, value in enumerate(converted):
+        kind = type(value)
+        if kind is cast or kind is _NONE:
+            continue
+        if kind is float and cast is int and np is not None:
+            floats.append(position)
+            continue
+        try:
+            converted[position] = cast(value)
+        except (ValueError, TypeError, OverflowError):
+            converted[position] = None
+            invalid[position] = True
+    if floats:
+        _truncate_floats(converted, invalid, floats)
+    return converted, invalid
+
+
+def column(records: Sequence[Any], keys: Tuple[str, ...], get: Callable[[Any], Any]) -> List[Any]:
+    """
+    Read one field from every record.
+
+    Args:
+    - records: Hotels (or nested dicts).
+    - keys: The field's path, e.g. ("location", "lat").
+    - get: Reads the field from one record; used when a record is not made of attributes all the way down.
+    """
+    try:
+        return list(map(operator.attrgetter(".".join(keys)), records))
+    except AttributeError:
+        return [get(record) for record in records]
+
+
+def resolve(strategy: str, values: Sequence[Any], sizes: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    Apply a scalar merge strategy to many hotels at once.
+
+    values holds the field of every record, hotel after hotel, with sizes[i]
+    records for hotel i. The value chosen for each hotel is the one folding its
+    values pairwise with DataMerger.first_non_null or choose_best would return.
+
+    Returns:
+    - (hotel number, position in values) for every hotel whose chosen value is not
+      its first record's; the other hotels already hold their merged value.
+    """
+    if strategy not in COLUMN_STRATEGIES:
+        raise ValueError(f"Strategy '{strategy}' cannot be resolved by column, expected one of {COLUMN_STRATEGIES}")
+    if not sizes:
+        return []
+    if load_numpy(__name__) is None:
+        pick = _first_non_null if strategy == "first_non_null" else _choose_best
+        changes = []
+        start = 0
+        for group, size in enumerate(sizes):
+            position = pick(values, start, start + size)
+            if position != start:
+                changes.append((group, position))
+            start += size
+        return changes
+
+    sizes = np.asarray(sizes, dtype=np.int64)
+    starts = np.zeros(len(sizes), dtype=np.int64)
+    np.cumsum(sizes[:-1], out=starts[1:])
+    if strategy == "first_non_null":
+        present = _first_where(np.fromiter(map(operator.is_not, values, repeat(None)), dtype=bool,
+                                           count=len(values)), starts)
+        picks = np.where(present < len(values), present, starts)
+    else:
+        kinds = _kinds(values)
+        present = _first_where(kinds != _MISSING, starts)
+        picks = np.where(present < len(kinds), present, starts)
+        group_kinds = np.append(kinds, _MISSING)[present]
+        text = group_kinds == _TEXT
+        if text.any():
+            _longest_text(values, kinds, starts, sizes, text, picks)
+        for group in np.flatnonzero(group_kinds == _NUMBER).tolist():
+            start = int(starts[group])
+            picks[group] = _choose_best(values, start, start + int(sizes[group]))
+    changed = np.flatnonzero(picks != starts)
+    return list(zip(changed.tolist(), picks[changed].tolist()))
+
+
+# ===============================
+# Helper Methods
+# ===============================
+
+def _truncate_floats(converted: list, invalid: list, positions: List[int]):
+    """int() of many floats at once: NaN and infinities are masked, the rest truncated toward zero."""
+    floats = np.array([converted[position] for position in positions], dtype=np.float64)
+    finite = np.isfinite(floats)
+    small = finite & (np.abs(floats) < 2.0 ** 63)  # These fit an int64 exactly once truncated
+    truncated = np.trunc(floats[small]).astype(np.int64).tolist()
+    for position, value in zip(np.asarray(positions)[small].tolist(), truncated):
+        converted[position] = value
+    for index in np.flatnonzero(finite & ~small).tolist():
+        converted[positions[index]] = int(floats[index])
+    for index in np.flatnonzero(~finite).tolist():
+        converted[positions[index]] = None
+        invalid[positions[index]] = True
+
+
+def _kind(value: Any) -> int:
+    if value is None:
+        return _MISSING
+    if isinstance(value, str):
+        return _TEXT
+    return _NUMBER if isinstance(value, (int, float)) else _OTHER
+
+
+def _kinds(values: Sequence[Any]):
+    kinds = np.fromiter(map(_KINDS.get, map(type, values), repeat(_UNKNOWN)), dtype=np.int8, count=len(values))
+    for position in np.flatnonzero(kinds == _UNKNOWN).tolist():  # Subclasses and other types
+        kinds[position] = _kind(values[position])
+    return kinds
+
+
+def _first_where(mask, starts):
+    """Position of the first True in each group, or len(mask) where the group has none."""
+    positions = np.where(mask, np.arange(len(mask)), len(mask))
+    return np.minimum.reduceat(positions, starts)
+
+
+def _longest_text(values: Sequence[Any], kinds, starts, sizes, text_groups, picks):
+    """choose_best for the groups whose first present value is text: the first of their longest strings."""
+    candidates = (kinds == _TEXT) & np.repeat(text_groups, sizes)
+    lengths = np.full(len(kinds), -1, dtype=np.int64)
+    positions = np.flatnonzero(candidates)
+    lengths[positions] = np.fromiter(map(len, map(values.__getitem__, positions.tolist())),
+                                     dtype=np.int64, count=len(positions))
+    longest = np.maximum.reduceat(lengths, starts)
+    first_longest = _first_where(candidates & (lengths == np.repeat(longest, sizes)), starts)
+    picks[text_groups] = first_longest[text_groups]
+
+
+def _first_non_null(values: Sequence[Any], start: int, end: int) -> int:
+    for position in range(start, end):
+        if values[position] is not None:
+            return position
+    return start
+
+
+def _choose_best(values: Sequence[Any], start: int, end: int) -> int:
+    """Position of the value DataMerger.choose_best folds values[start:end] down to."""
+    best = start
+    for position in range(start + 1, end):
+        current, value = values[best], values[position]
+        if isinstance(current, str) and isinstance(value, str):
+            if len(value) > len(current):
+                best = position
+        elif isinstance(current, (int, float)) and isinstance(value, (int, float)):
+            if value > current:  # max() keeps the first argument unless the second is greater
+                best = position
+        elif current is None and value is not None:
+            best = position
+    return best
@@ -1,37 +1,245 @@
+import copy
 import json
-from typing import List, Dict, Any
+from config.config import registry
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from . import columnar, instrumentation
 from ..models.hotel import Hotel, Image, Amenities
 
 
+class MergeStep:
+    """One field of the merge strategy, compiled: a bound strategy plus precomputed accessors."""
+
+    __slots__ = ("field", "keys", "merge", "merge_all", "key", "subfield_strategies", "strategy")
+
+    def __init__(self, field: str, merge: Callable, key: Optional[str], subfield_strategies: Dict[str, str],
+                 merge_all: Optional[Callable] = None, strategy: Optional[str] = None):
+        self.field = field
+        self.keys = tuple(field.split("."))
+        self.merge = merge
+        self.merge_all = merge_all  # Optional n-ary form of merge, used by fold
+        self.key = key
+        self.subfield_strategies = subfield_strategies
+        self.strategy = strategy or getattr(merge, "__name__", "merge")  # Name reported by instrumentation
+
+    def get(self, obj: Any) -> Any:
+        """Retrieve the field's value from a hotel (or any nested dict / object)."""
+        for key in self.keys:
+            if isinstance(obj, dict):
+                obj = obj.get(key)
+            else:
+                obj = getattr(obj, key, None)
+            if obj is None:
+                return None
+        return obj
+
+    def set(self, obj: Any, value: Any):
+        """Set the field's value on a hotel, creating intermediate dicts as needed."""
+        for key in self.keys[:-1]:
+            if isinstance(obj, dict):
+                obj = obj.setdefault(key, {})
+            elif hasattr(obj, key):
+                obj = getattr(obj, key)
+            else:
+                return
+        if isinstance(obj, dict):
+            obj[self.keys[-1]] = value
+        elif hasattr(obj, self.keys[-1]):
+            setattr(obj, self.keys[-1], value)
+
+    def fold(self, values: List[Any]) -> Any:
+        """Merge the field's values from several records, in order."""
+        if self.merge_all is not None:
+            return self.merge_all(values, self.key, self.subfield_strategies)
+        merged = values[0]
+        for value in values[1:]:
+            merged = self.merge(merged, value, self.key, self.subfield_strategies)
+        return merged
+
+
+_MISSING = object()
+
+
+def _get_value(item: Any, name: str) -> Any:
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+def _set_value(item: Any, name: str, value: Any):
+    if isinstance(item, dict):
+        item[name] = value
+    else:
+        setattr(item, name, value)
+
+
+class ListAccumulator:
+    """
+    Order-preserving, incremental merge of lists.
+
+    Items are kept in order of first appearance, so the output is stable between
+    runs. Without a key, equal items are deduplicated. With a key (e.g. "link"),
+    items sharing that key are merged into one using the subfield strategies.
+    Items are never modified in place: the first time a keyed item has to be
+    merged it is replaced by a shallow copy, so suppliers' records are not aliased.
+    """
+
+    __slots__ = ("key", "subfield_merges", "_items", "_owned")
+
+    def __init__(self, key: Optional[str] = None, subfield_merges: tuple = ()):
+        self.key = key
+        self.subfield_merges = subfield_merges
+        self._items = {}
+        self._owned = set()
+
+    def extend(self, values: Optional[List[Any]]):
+        if not values:
+            return
+        items = self._items
+        if not self.key:
+            for value in values:
+                if value not in items:
+                    items[value] = value
+            return
+        for value in values:
+            item_key = _get_value(value, self.key)
+            existing = items.get(item_key, _MISSING)
+            if existing is _MISSING:
+                items[item_key] = value
+                continue
+            if item_key not in self._owned:
+                existing = dict(existing) if isinstance(existing, dict) else copy.copy(existing)
+                items[item_key] = existing
+                self._owned.add(item_key)
+            # Merge subfields if applicable
+            for subfield, merge in self.subfield_merges:
+                merged_value = merge(_get_value(existing, subfield) or "", _get_value(value, subfield) or "")
+                _set_value(existing, subfield, merged_value)
+
+    def result(self) -> List[Any]:
+        return list(self._items.values())
+
+
 class DataMerger:
-    def __init__(self, config_path: str = "config/merge_strategy.json"):
-        # Load merge strategies from the configuration file
-        with open(config_path, "r") as file:
-            self.merge_strategy = json.load(file)["fields"]
+    def __init__(self, config_path: Optional[str] = None):
+        # Merge strategies come from the shared config registry unless a file is given
+        if config_path is None:
+            self.merge_strategy = registry.merge_strategy["fields"]
+        else:
+            with open(config_path, "r") as file:
+                self.merge_strategy = json.load(file)["fields"]
+        self.steps = self._compile(self.merge_strategy)
 
-    def merge_hotels(self, hotel_data: List[Hotel]) -> List[Hotel]:
-        """Merge hotel data from multiple sources into comprehensive entries."""
+    def _compile(self, merge_strategy: dict) -> List[MergeStep]:
+        """Resolve every field's strategy to a bound method once, instead of once per hotel pair."""
+        # Strategies whose values can be folded in one call rather than pairwise
+        n_ary = {"merge_list": self.merge_lists}
+        steps = []
+        for field, strategy_config in merge_strategy.items():
+            strategy = strategy_config.get("strategy", "default_merge")
+            steps.append(MergeStep(
+                field,
+                getattr(self, strategy, self._default_merge),
+                strategy_config.get("key", None),
+                strategy_config.get("subfield_strategies", {}),
+                n_ary.get(strategy),
+                strategy,
+            ))
+        return steps
+
+    def merge_hotels(self, hotel_data: Iterable[Hotel]) -> List[Hotel]:
+        """
+        Merge hotel data from multiple sources into comprehensive entries.
+
+        hotel_data may be any iterable, including a generator streaming hotels
+        from the suppliers; only the merged hotels are kept in memory.
+        """
         merged_hotels = {}
+        records = 0
         for hotel in hotel_data:
+            records += 1
             if hotel.id not in merged_hotels:
                 merged_hotels[hotel.id] = hotel
             else:
                 merged_hotels[hotel.id] = self._merge_two_hotels(merged_hotels[hotel.id], hotel)
+        metrics = instrumentation.active()
+        if metrics is not None:
+            pairs = records - len(merged_hotels)
+            metrics.record_strategies(self.steps, pairs, pairs)
         return list(merged_hotels.values())
 
+    def merge_group(self, records: List[Hotel]) -> Hotel:
+        """
+        Merge all records of one hotel in a single pass.
+
+        Each field is read once from every record, folded with its strategy and
+        written back once, instead of being read and written for every pairwise
+        merge. The result is the same as merging the records pairwise in order,
+        and like a pairwise merge it is written into the first record.
+        """
+        first = records[0]
+        if len(records) == 1:
+            return first
+        for step in self.steps:
+            step.set(first, step.fold([step.get(record) for record in records]))
+        return first
+
+    def merge_groups(self, hotel_data: Iterable[Hotel]) -> List[Hotel]:
+        """Group records by hotel id, then merge each group with merge_group."""
+        groups = {}
+        for hotel in hotel_data:
+            groups.setdefault(hotel.id, []).append(hotel)
+        metrics = instrumentation.active()
+        if metrics is not None:
+            merged_groups = [len(records) for records in groups.values() if len(records) > 1]
+            metrics.record_strategies(self.steps, sum(merged_groups) - len(merged_groups), len(merged_groups))
+        return [self.merge_group(records) for records in groups.values()]
+
+    def merge_columns(self, hotel_data: Iterable[Hotel]) -> List[Hotel]:
+        """
+        Group records by hotel id and merge them a field at a time across all hotels.
+
+        A field merged with first_non_null or choose_best is read into one column from
+        every hotel with several records and resolved for all of them at once (see
+        columnar.resolve); only the hotels whose first record does not already hold
+        the merged value are written. Other fields are folded hotel by hotel. The
+        result is the same as merge_groups.
+        """
+        groups = {}
+        for hotel in hotel_data:
+            groups.setdefault(hotel.id, []).append(hotel)
+        merged_groups = [records for records in groups.values() if len(records) > 1]
+        metrics = instrumentation.active()
+        if metrics is not None:
+            sizes = [len(records) for records in merged_groups]
+            metrics.record_strategies(self.steps, sum(sizes) - len(sizes), len(sizes))
+        if not merged_groups:
+            return [records[0] for records in groups.values()]
+
+        records = [record for group in merged_groups for record in group]
+        sizes = [len(group) for group in merged_groups]
+        for step in self.steps:
+            strategy = self._column_strategy(step)
+            if strategy is None:
+                for group in merged_groups:
+                    step.set(group[0], step.fold([step.get(record) for record in group]))
+                continue
+            values = columnar.column(records, step.keys, step.get)
+            for group, position in columnar.resolve(strategy, values, sizes):
+                step.set(merged_groups[group][0], values[position])
+        return [records[0] for records in groups.values()]
+
+    def _column_strategy(self, step: MergeStep) -> Optional[str]:
+        """Name of the column strategy a step's merge is, or None if it has to be folded per hotel."""
+        merge = getattr(step.merge, "__func__", None)
+        if merge is DataMerger.first_non_null or merge is DataMerger._default_merge:
+            return "first_non_null"
+        if merge is DataMerger.choose_best:
+            return "choose_best"
+        return None
+
     def _merge_two_hotels(self, existing: Hotel, new: Hotel) -> Hotel:
         """Merge two hotel records based on defined strategies."""
-        for field, strategy_config in self.merge_strategy.items():
-            strategy = strategy_config.get("strategy", "default_merge")
-            merge_function = getattr(self, strategy, self._default_merge)
-            key = strategy_config.get("key", None)
-            subfield_strategies = strategy_config.get("subfield_strategies", {})
-            # Retrieve existing and new field values
-            existing_value = self._get_nested_field(existing, field)
-            new_value = self._get_nested_field(new, field)
-            # Merge the values
-            merged_value = merge_function(existing_value, new_value, key, subfield_strategies)
-            self._set_nested_field(existing, field, merged_value)
+        for step in self.steps:
+            merged_value = step.merge(step.get(existing), step.get(new), step.key, step.subfield_strategies)
+            step.set(existing, merged_value)
         return existing
 
     # ===============================
@@ -69,60 +277,124 @@ class DataMerger:
 
     def merge_list(self, list1: List[Any], list2: List[Any], key: str = None, subfield_strategies: Dict[str, str] = None):
         """Merge two lists, deduplicating by a key and applying subfield strategies."""
-        if not list1:
-            return list2 or []
-        if not list2:
-            return list1 or []
-
-        if key:  # Deduplicate based on a key field
-            combined = {}
-            for item in list1 + list2:
-                item_key = item.get(key) if isinstance(item, dict) else item
-                if item_key in combined:
-                    # Merge subfields if applicable
-                    for subfield, strategy in (subfield_strategies or {}).items():
-                        existing_value = combined[item_key].get(subfield, "")
-                        new_value = item.get(subfield, "")
-                        combined[item_key][subfield] = self._apply_strategy(existing_value, new_value, strategy)
-                else:
-                    combined[item_key] = item
-            return list(combined.values())
-
-        # Default behavior for non-dictionary lists
-        return list(set(list1 + list2))
+        return self.merge_lists([list1, list2], key, subfield_strategies)
 
-    # ===============================
-    # Helper Methods
-    # ===============================
+    def merge_lists(self, lists: List[List[Any]], key: str = None, subfield_strategies: Dict[str, str] = None):
+        """
+        Merge any number of lists in one pass; see ListAccumulator.
 
-    def _apply_strategy(self, val1: Any, val2: Any, strategy: str) -> Any:
-        """Apply a strategy dynamically to two values."""
-        strategy_function = getattr(self, strategy, self._default_merge)
-        return strategy_function(val1, val2)
+        Folding merge_list over the lists pairwise gives the same result, but
+        this touches every item once, so it stays linear in the total number of items.
+        """
+        accumulator = self.list_accumulator(key, subfield_strategies)
+        for items in lists:
+            accumulator.extend(items)
+        return accumulator.result()
 
-    def _get_nested_field(self, obj: Any, field: str) -> Any:
-        """Retrieve the value of a nested field using dot notation."""
-        keys = field.split(".")
-        for key in keys:
-            if isinstance(obj, dict):
-                obj = obj.get(key)
-            elif hasattr(obj, key):
-                obj = getattr(obj, key)
-            else:
-                return None
-        return obj
+    def list_accumulator(self, key: str = None, subfield_strategies: Dict[str, str] = None) -> "ListAccumulator":
+        """Create an accumulator with the subfield strategies resolved to bound methods."""
+        subfield_merges = tuple((subfield, getattr(self, strategy, self._default_merge))
+                                for subfield, strategy in (subfield_strategies or {}).items())
+        return ListAccumulator(key, subfield_merges)
 
-    def _set_nested_field(self, obj: Any, field: str, value: Any):
-        """Set the value of a nested field using dot notation."""
-        keys = field.split(".")
-        for key in keys[:-1]:
-            if isinstance(obj, dict):
-                obj = obj.setdefault(key, {})
-            elif hasattr(obj, key):
-                obj = getattr(obj, key)
-            else:
-                return
-        if isinstance(obj, dict):
-            obj[keys[-1]] = value
-        elif hasattr(obj, keys[-1]):
-            setattr(obj, keys[-1], value)
+
+class IncrementalMerger:
+    """
+    Keeps every supplier's contribution per hotel so a delta only re-merges the hotels it touches.
+
+    Contributions are merged in supplier order, so a hotel merged here equals the
+    one DataMerger.merge_groups builds from the same records, and merged_hotels()
+    lists the hotels in the order merge_groups would: by first appearance across
+    the suppliers' listings in supplier order. A delta keeps a supplier's listed
+    ids where they were and appends the ids it adds. Stored records are never
+    modified: each re-merge works on a copy of the first record.
+    """
+
+    def __init__(self, merger: DataMerger, supplier_order: List[str]):
+        """
+        Args:
+        - merger: Supplies the compiled merge strategy.
+        - supplier_order: Supplier keys in merge order.
+        """
+        self.merger = merger
+        self.supplier_order = list(supplier_order)
+        self._rank = {key: rank for rank, key in enumerate(self.supplier_order)}
+        self._contributions: Dict[str, Dict[str, List[Hotel]]] = {}
+        self._merged: Dict[str, Hotel] = {}
+        # Each supplier's hotel ids in listing order (dicts as ordered sets)
+        self._listings: Dict[str, Dict[str, None]] = {key: {} for key in self.supplier_order}
+        self._order: Optional[List[str]] = None  # Merged ids in output order, rebuilt after a listing changes
+
+    def apply_delta(self, supplier_key: str, upserts: Iterable[Hotel] = (),
+                    removed_ids: Iterable[str] = ()) -> Set[str]:
+        """
+        Apply one supplier's added, changed and removed hotels.
+
+        Args:
+        - supplier_key: The supplier the delta comes from.
+        - upserts: Added or changed hotels; they replace that supplier's records for their ids.
+        - removed_ids: Ids of hotels the supplier no longer lists.
+
+        Returns:
+        - The ids of merged hotels that were added, changed or removed.
+        """
+        if supplier_key not in self._rank:
+            raise ValueError(f"Unknown supplier '{supplier_key}'")
+        records_by_id: Dict[str, List[Hotel]] = {}
+        for hotel in upserts:
+            records_by_id.setdefault(hotel.id, []).append(hotel)
+
+        listing = self._listings[supplier_key]
+        affected = set()
+        for hotel_id, records in records_by_id.items():
+            contributions = self._contributions.setdefault(hotel_id, {})
+            if contributions.get(supplier_key) != records:
+                contributions[supplier_key] = records
+                affected.add(hotel_id)
+            if hotel_id not in listing:
+                listing[hotel_id] = None
+                self._order = None
+        for hotel_id in removed_ids:
+            if self._contributions.get(hotel_id, {}).pop(supplier_key, None) is not None:
+                affected.add(hotel_id)
+            if listing.pop(hotel_id, 0) is None:
+                self._order = None
+        return {hotel_id for hotel_id in affected if self._remerge(hotel_id)}
+
+    def replace_supplier(self, supplier_key: str, hotels: Iterable[Hotel]) -> Set[str]:
+        """Replace a supplier's full listing, re-merging only the hotels that differ from before."""
+        hotels = list(hotels)
+        listed = {hotel.id for hotel in hotels}
+        previous = [hotel_id for hotel_id in self._listings[supplier_key] if hotel_id not in listed]
+        changed = self.apply_delta(supplier_key, hotels, previous)
+        listing = dict.fromkeys(hotel.id for hotel in hotels)
+        if list(listing) != list(self._listings[supplier_key]):
+            self._listings[supplier_key] = listing
+            self._order = None
+        return changed
+
+    def merged_hotels(self) -> List[Hotel]:
+        """The merged hotels, in the order merge_groups lists them."""
+        if self._order is None:
+            order = {}
+            for key in self.supplier_order:
+                order.update(dict.fromkeys(self._listings[key]))
+            self._order = list(order)
+        return [self._merged[hotel_id] for hotel_id in self._order]
+
+    def _remerge(self, hotel_id: str) -> bool:
+        """Recompute one merged hotel; return whether it changed."""
+        contributions = self._contributions.get(hotel_id)
+        previous = self._merged.get(hotel_id)
+        if not contributions:
+            self._contributions.pop(hotel_id, None)
+            return self._merged.pop(hotel_id, None) is not None
+
+        records = [record for key in sorted(contributions, key=self._rank.__getitem__)
+                   for record in contributions[key]]
+        # merge_group writes into the first record, so give it a copy
+        merged = self.merger.merge_group([records[0].copy()] + records[1:])
+        if merged == previous:
+            return False
+        self._merged[hotel_id] = merged
+        return True
@@ -0,0 +1,313 @@
+import math
+import random
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from itertools import chain
+from operator import eq
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from config.config import registry
+from .geo_index import EARTH_RADIUS_KM, coordinates, haversine_km
+from .lazy_numpy import UNLOADED, load_numpy
+from ..models.hotel import Hotel
+
+# numpy is optional (signatures are then computed one record at a time). It is loaded when
+# matching starts, since SupplierManager imports this module even when matching is off.
+np = UNLOADED
+
+_PRIME = (1 << 31) - 1  # MinHash permutations are a * x + b modulo this prime
+_BAND_MULTIPLIER = 0x100000001B3  # Folds a band's rows into one 64-bit bucket key
+_MASK = (1 << 64) - 1
+_RECORDS_PER_CHUNK = 4096  # Bounds the (shingles x permutations) matrix NumPy builds at once
+
+
+@dataclass
+class MatchOptions:
+    """
+    Thresholds for linking one hotel's records listed under different ids, read from
+    the "duplicates" block of merge_strategy.json.
+    """
+    similarity: float = 0.7  # Minimum estimated Jaccard similarity of two names' shingles
+    unlocated_similarity: float = 0.9  # The same, when either record has no coordinates to confirm the match
+    shingle_size: int = 3
+    num_perm: int = 64
+    bands: int = 16
+    geohash_precision: int = 6
+    max_distance_km: float = 0.5  # Records further apart never match; unlocated records skip this check
+    stopwords: Tuple[str, ...] = ("the", "hotel", "hotels", "and", "by", "at", "of")
+    seed: int = 1
+
+    def __post_init__(self):
+        self.stopwords = tuple(self.stopwords)
+        if not (0 < self.similarity <= 1 and 0 < self.unlocated_similarity <= 1):
+            raise ValueError("similarity and unlocated_similarity must be in (0, 1]")
+        if self.shingle_size < 1 or self.num_perm < 1 or self.bands < 1 or self.num_perm % self.bands:
+            raise ValueError("shingle_size, num_perm and bands must be positive, and bands must divide num_perm")
+        if not 1 <= self.geohash_precision <= 12:
+            raise ValueError("geohash_precision must be between 1 and 12")
+        # Candidates come from the rows above and below only, so a cell must be at least max_distance_km tall.
+        # Cells narrow towards the poles, so the columns searched depend on the latitude (see _column_reach).
+        cell_km = math.radians(180 / (1 << (5 * self.geohash_precision // 2))) * EARTH_RADIUS_KM
+        if not 0 <= self.max_distance_km <= cell_km:
+            raise ValueError(f"max_distance_km must be between 0 and {cell_km:.3f}, the height of a "
+                             f"geohash cell at precision {self.geohash_precision}")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "MatchOptions":
+        return cls(**(config or {}))
+
+
+class DuplicateMatcher:
+    """
+    Finds records of the same hotel that suppliers list under different ids.
+
+    Candidates are blocked by destination_id, by MinHash/LSH on the character
+    shingles of the normalized name and by geohash cell. A name's signature is cut
+    into bands, and records of a destination sharing a band land in the same bucket.
+    Within a bucket, only records in nearby cells are compared (a record without
+    coordinates may match any cell). Work therefore grows with the number of
+    records rather than the number of pairs. Candidates are linked when their
+    estimated similarity and distance are within the thresholds, with a stricter
+    similarity when either record is unlocated, and when their names do not tell
+    them apart: different numbers ("Tower 1" and "Tower 2"), or distinct words on
+    both sides that are not one respelling ("Pearl" and "Ruby"). Links are
+    transitive: every id in a group is mapped to the id seen first, and no group
+    spans more than max_distance_km from its first located record.
+    """
+
+    def __init__(self, options: Optional[MatchOptions] = None):
+        """
+        Args:
+        - options: Thresholds (default is the "duplicates" block of merge_strategy.json).
+        """
+        self.options = options or MatchOptions.from_config(registry.merge_strategy.get("duplicates"))
+        rng = random.Random(self.options.seed)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(self.options.num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(self.options.num_perm)]
+        self._stopwords = frozenset(self.options.stopwords)
+        bits = 5 * self.options.geohash_precision
+        # Geohash cells at a given precision form a regular grid of this many rows and columns
+        self._lat_cells, self._lng_cells = 1 << (bits // 2), 1 << ((bits + 1) // 2)
+        self._reach: Dict[int, int] = {}
+
+    def match(self, hotels: Sequence[Hotel]) -> Dict[str, str]:
+        """
+        Find the ids that belong to the same hotel as an earlier id.
+
+        Returns:
+        - Each duplicate id mapped to the first id of its hotel, in order of first appearance.
+        """
+        load_numpy(__name__)
+        ids: Dict[str, int] = {}
+        nodes = [ids.setdefault(hotel.id, len(ids)) for hotel in hotels]
+        parent = list(range(len(ids)))
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        signatures, keys = self._signatures([self.shingles(hotel.name) for hotel in hotels])
+        words = [self.normalize(hotel.name).split() for hotel in hotels]
+        points = [coordinates(hotel) for hotel in hotels]
+        cells = [self._cell(point) for point in points]
+        buckets: Dict[tuple, List[int]] = {}
+        for record, (hotel, record_keys) in enumerate(zip(hotels, keys)):
+            if record_keys is not None:
+                destination = str(hotel.destination_id)
+                for band, key in enumerate(record_keys):
+                    buckets.setdefault((destination, band, key), []).append(record)
+
+        # Coordinates of the first located record of each group, so a group never spans more than max_distance_km
+        anchors: List[Optional[Tuple[float, float]]] = [None] * len(ids)
+        for node, point in zip(nodes, points):
+            if anchors[node] is None:
+                anchors[node] = point
+        rejected: Set[Tuple[int, int]] = set()
+        for members in buckets.values():
+            for position in range(1, len(members)):
+                record = members[position]
+                for other in members[:position]:
+                    first, second = find(nodes[other]), find(nodes[record])
+                    if first == second or (other, record) in rejected:
+                        continue
+                    if not self._adjacent(cells[other], cells[record]):
+                        continue
+                    if (self._similar(signatures, points, other, record)
+                            and not self._distinct(words[other], words[record])
+                            and self._near(anchors[first], anchors[second])):
+                        root, merged = min(first, second), max(first, second)
+                        parent[merged] = root
+                        anchors[root] = anchors[root] or anchors[merged]
+                    else:
+                        rejected.add((other, record))
+
+        names = list(ids)
+        return {name: names[find(node)] for name, node in ids.items() if find(node) != node}
+
+    def link(self, hotels: Sequence[Hotel]) -> Dict[str, str]:
+        """
+        Give every duplicate record the id of its hotel's first record, so merging combines them.
+
+        The ids are rewritten in place on the given records, so pass copies of records
+        that are kept elsewhere (SupplierManager links freshly fetched or copied records).
+
+        Returns:
+        - The ids that were rewritten, as returned by match().
+        """
+        canonical = self.match(hotels)
+        if canonical:
+            for hotel in hotels:
+                hotel.id = canonical.get(hotel.id, hotel.id)
+        return canonical
+
+    def normalize(self, name: Optional[str]) -> str:
+        """Lowercase the name, strip accents and punctuation, and drop stopwords such as "hotel"."""
+        if not name:
+            return ""
+        if not name.isascii():
+            name = unicodedata.normalize("NFKD", name)
+            name = "".join(char for char in name if not unicodedata.combining(char))
+        name = name.lower()
+        return " ".join(word for word in re.split(r"[\W_]+", name) if word and word not in self._stopwords)
+
+    def shingles(self, name: Optional[str]) -> Set[int]:
+        """Hashes of the normalized name's character shingles (the whole name if it is shorter than one)."""
+        name = self.normalize(name)
+        size = self.options.shingle_size
+        grams = {name[start:start + size] for start in range(max(len(name) - size + 1, 1))} if name else set()
+        return {zlib.crc32(gram.encode()) % _PRIME for gram in grams}
+
+    # ===============================
+    # Helper Methods
+    # ===============================
+
+    def _cell(self, point: Optional[Tuple[float, float]]) -> Optional[Tuple[int, int]]:
+        """Row and column of the geohash cell holding a point."""
+        if point is None:
+            return None
+        lat, lng = point
+        return (min(int((lat + 90) / 180 * self._lat_cells), self._lat_cells - 1),
+                min(int((lng + 180) / 360 * self._lng_cells), self._lng_cells - 1))
+
+    def _adjacent(self, first: Optional[Tuple[int, int]], second: Optional[Tuple[int, int]]) -> bool:
+        """
+        Whether two cells can hold records within max_distance_km (across the antimeridian
+        too); an unlocated record is adjacent to every cell.
+        """
+        if first is None or second is None:
+            return True
+        if abs(first[0] - second[0]) > 1:
+            return False
+        columns = abs(first[1] - second[1])
+        return min(columns, self._lng_cells - columns) <= self._column_reach(first[0])
+
+    def _column_reach(self, row: int) -> int:
+        """
+        How many columns apart two records within max_distance_km can be, when one is in this row.
+
+        Along a parallel, haversine distance is at least 2R * cos(lat) * sin(dlng / 2), using the
+        latitude nearest a pole among this row and its neighbours. One column at the equator, more
+        towards the poles, where cells are narrower.
+        """
+        reach = self._reach.get(row)
+        if reach is None:
+            cell_height = 180 / self._lat_cells
+            pole_latitude = min(max(abs(-90 + (row - 1) * cell_height), abs(-90 + (row + 2) * cell_height)), 90)
+            cos_lat = math.cos(math.radians(pole_latitude))
+            bound = self.options.max_distance_km / (2 * EARTH_RADIUS_KM * cos_lat) if cos_lat > 0 else 1
+            if bound >= 1:
+                reach = self._lng_cells
+            else:
+                reach = int(math.degrees(2 * math.asin(bound)) / (360 / self._lng_cells)) + 1
+            self._reach[row] = reach
+        return reach
+
+    def _similar(self, signatures, points, first: int, second: int) -> bool:
+        if np is not None:
+            agreement = int(np.count_nonzero(signatures[first] == signatures[second]))
+        else:
+            agreement = sum(map(eq, signatures[first], signatures[second]))
+        located = points[first] is not None and points[second] is not None
+        similarity = self.options.similarity if located else self.options.unlocated_similarity
+        return agreement >= similarity * self.options.num_perm and self._near(points[first], points[second])
+
+    @staticmethod
+    def _distinct(first: List[str], second: List[str]) -> bool:
+        """
+        Whether two normalized names name different hotels: their numbers differ, or both
+        have words the other lacks that are more than one edit apart.
+        """
+        numbers = [{word for word in words if any(char.isdigit() for char in word)} for words in (first, second)]
+        if numbers[0] and numbers[1] and numbers[0] != numbers[1]:
+            return True
+        first_only = " ".join(word for word in first if word not in second)
+        second_only = " ".join(word for word in second if word not in first)
+        return bool(first_only and second_only) and not _within_one_edit(first_only, second_only)
+
+    def _near(self, first: Optional[Tuple[float, float]], second: Optional[Tuple[float, float]]) -> bool:
+        """Whether two points are within max_distance_km; a missing point is near everything."""
+        return first is None or second is None or haversine_km(*first, *second) <= self.options.max_distance_km
+
+    def _signatures(self, shingle_sets: List[Set[int]]):
+        """
+        MinHash signatures of every record and the LSH bucket key of each of their bands.
+
+        Returns:
+        - The signatures (an array with NumPy, a list of tuples without), and per record its
+          band keys, or None for a record without a name.
+        """
+        rows = self.options.num_perm // self.options.bands
+        if np is None:
+            signatures = [tuple(min((a * x + b) % _PRIME for x in shingles) for a, b in zip(self._a, self._b))
+                          if shingles else None for shingles in shingle_sets]
+            keys = []
+            for signature in signatures:
+                if signature is None:
+                    keys.append(None)
+                    continue
+                record_keys = []
+                for start in range(0, len(signature), rows):
+                    key = 0
+                    for value in signature[start:start + rows]:
+                        key = (key * _BAND_MULTIPLIER + value) & _MASK
+                    record_keys.append(key)
+                keys.append(tuple(record_keys))
+            return signatures, keys
+
+        a = np.array(self._a, dtype=np.uint64)
+        b = np.array(self._b, dtype=np.uint64)
+        signatures = np.full((len(shingle_sets), self.options.num_perm), _PRIME, dtype=np.uint64)
+        for start in range(0, len(shingle_sets), _RECORDS_PER_CHUNK):
+            chunk = shingle_sets[start:start + _RECORDS_PER_CHUNK]
+            sizes = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+            hashes = np.fromiter(chain.from_iterable(chunk), dtype=np.uint64, count=int(sizes.sum()))
+            if not hashes.size:
+                continue
+            named = np.flatnonzero(sizes)
+            offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))[named]
+            # a * x + b stays below 2**63 since a, b and x are all below 2**31
+            signatures[start + named] = np.minimum.reduceat((hashes[:, None] * a + b) % _PRIME, offsets, axis=0)
+        band_keys = np.zeros((len(shingle_sets), self.options.bands), dtype=np.uint64)
+        bands = signatures.reshape(len(shingle_sets), self.options.bands, rows)
+        for row in range(rows):
+            band_keys = band_keys * np.uint64(_BAND_MULTIPLIER) + bands[:, :, row]  # Wraps modulo 2**64
+        named = [bool(shingles) for shingles in shingle_sets]
+        keys = [tuple(record_keys) if has_name else None
+                for record_keys, has_name in zip(band_keys.tolist(), named)]
+        return signatures, keys
+
+
+def _within_one_edit(first: str, second: str) -> bool:
+    """Whether one insertion, deletion or substitution turns one string into the other."""
+    if len(first) > len(second):
+        first, second = second, first
+    if len(second) - len(first) > 1:
+        return False
+    for position, (a, b) in enumerate(zip(first, second)):
+        if a != b:
+            skip = 1 if len(first) == len(second) else 0
+            return first[position + skip:] == second[position + 1:]
+    return True
@@ -0,0 +1,162 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+from .lazy_numpy import UNLOADED, load_numpy
+from ..models.hotel import Hotel
+
+# numpy is optional (distances are then computed one by one); it is loaded when an index is built
+np = UNLOADED
+
+EARTH_RADIUS_KM = 6371.0088
+# Half the Earth's circumference: no two points are further apart
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points given in degrees."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def coordinates(hotel: Hotel) -> Optional[Tuple[float, float]]:
+    """Return (lat, lng) of a hotel, or None if either is missing or not a valid coordinate."""
+    location = hotel.location
+    if isinstance(location, dict):
+        return valid_point(location.get("lat"), location.get("lng"))
+    return valid_point(location.lat, location.lng)
+
+
+def valid_point(lat, lng) -> Optional[Tuple[float, float]]:
+    """Return (lat, lng) as floats, or None if either is missing, not a number or out of range."""
+    if lat is None or lng is None:
+        return None
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):  # Also rejects NaN
+        return None
+    return lat, lng
+
+
+class GeoIndex:
+    """
+    Grid index over hotel coordinates for radius and nearest-K queries.
+
+    Located hotels are bucketed into cells of cell_degrees x cell_degrees, so a
+    radius query only measures the hotels in the cells the circle can reach.
+    Hotels with a missing or invalid lat/lng are never returned by a query;
+    their positions are listed in `unlocated` instead.
+    """
+
+    def __init__(self, hotels: Sequence[Hotel], cell_degrees: float = 0.25):
+        """
+        Args:
+        - hotels: The inventory; queries return positions in it.
+        - cell_degrees: Cell size. Around the typical query radius works best.
+        """
+        if cell_degrees <= 0:
+            raise ValueError("cell_degrees must be positive")
+        self.cell_degrees = cell_degrees
+        self._lng_cells = math.ceil(360 / cell_degrees)
+        self.unlocated: List[int] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+        for position, hotel in enumerate(hotels):
+            point = coordinates(hotel)
+            if point is None:
+                self.unlocated.append(position)
+                continue
+            self._points[position] = point
+            self._cells.setdefault(self._cell(*point), []).append(position)
+        if load_numpy(__name__) is not None and self._points:
+            # Radians of every hotel, indexed by inventory position (NaN where unlocated)
+            self._lat_rad = np.full(len(hotels), np.nan)
+            self._lng_rad = np.full(len(hotels), np.nan)
+            located = np.fromiter(self._points, dtype=np.int64, count=len(self._points))
+            points = np.radians(np.array(list(self._points.values()), dtype=np.float64))
+            self._lat_rad[located], self._lng_rad[located] = points[:, 0], points[:, 1]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[int, float]]:
+        """
+        Return the hotels within radius_km of a point.
+
+        Returns:
+        - (position, distance in km) pairs, nearest first (ties in inventory order).
+        """
+        if radius_km < 0:
+            raise ValueError("radius_km must not be negative")
+        if valid_point(lat, lng) is None:
+            raise ValueError(f"Invalid coordinates ({lat}, {lng})")
+        candidates = self._candidates(lat, lng, radius_km)
+        distances = self._distances(candidates, lat, lng)
+        matches = [(position, distance) for position, distance in zip(candidates, distances) if distance <= radius_km]
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def nearest(self, lat: float, lng: float, k: int) -> List[Tuple[int, float]]:
+        """
+        Return the k located hotels nearest to a point, as (position, distance in km) pairs, nearest first.
+
+        The search radius starts at one cell and doubles until it holds k hotels.
+        Every hotel outside the radius is further away than every hotel inside it,
+        so the k nearest inside the radius are the k nearest overall.
+        """
+        if k <= 0:
+            return []
+        radius = self.cell_degrees * math.pi / 180 * EARTH_RADIUS_KM
+        while True:
+            matches = self.within(lat, lng, radius)
+            if len(matches) >= k or radius >= MAX_DISTANCE_KM:
+                return matches[:k]
+            radius = min(radius * 2, MAX_DISTANCE_KM)
+
+    def __len__(self) -> int:
+        """Number of located hotels."""
+        return len(self._points)
+
+    # ===============================
+    # Helper Methods
+    # ===============================
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor((lng + 180) / self.cell_degrees) % self._lng_cells
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> List[int]:
+        """Positions of the hotels in every cell the circle can reach."""
+        angle = radius_km / EARTH_RADIUS_KM  # Radius as an angle at the Earth's centre
+        dlat = math.degrees(angle)
+        lat_range = range(math.floor(max(lat - dlat, -90) / self.cell_degrees),
+                          math.floor(min(lat + dlat, 90) / self.cell_degrees) + 1)
+        if angle >= math.pi / 2 or abs(lat) + dlat >= 90:
+            lng_range = range(self._lng_cells)  # The circle reaches a pole or a whole hemisphere
+        else:
+            # Widest longitude offset of a spherical cap around the point
+            dlng = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+            first = math.floor((lng - dlng + 180) / self.cell_degrees)
+            last = math.floor((lng + dlng + 180) / self.cell_degrees)
+            lng_range = range(self._lng_cells) if last - first + 1 >= self._lng_cells else range(first, last + 1)
+
+        cells = self._cells
+        if len(lat_range) * len(lng_range) > len(cells):
+            # Cheaper to check every occupied cell than every cell in range
+            lat_cells, lng_cells = set(lat_range), {cell % self._lng_cells for cell in lng_range}
+            return [position for (lat_cell, lng_cell), positions in cells.items()
+                    if lat_cell in lat_cells and lng_cell in lng_cells for position in positions]
+        candidates = []
+        for lat_cell in lat_range:
+            for lng_cell in lng_range:
+                candidates.extend(cells.get((lat_cell, lng_cell % self._lng_cells), ()))
+        return candidates
+
+    def _distances(self, positions: List[int], lat: float, lng: float) -> List[float]:
+        if not positions:
+            return []
+        if np is not None:
+            index = np.fromiter(positions, dtype=np.int64, count=len(positions))
+            lat1, lng1 = math.radians(lat), math.radians(lng)
+            lat2, lng2 = self._lat_rad[index], self._lng_rad[index]
+            a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+            return (2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))).tolist()
+        points = self._points
+        return [haversine_km(lat, lng, *points[position]) for position in positions]
@@ -0,0 +1,123 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+from .geo_index import GeoIndex
+from .parser import AmenityIndex
+from ..models.hotel import Hotel
+
+
+def _amenity_names(hotel: Hotel) -> List[str]:
+    amenities = hotel.amenities
+    if isinstance(amenities, dict):
+        return (amenities.get("general") or []) + (amenities.get("room") or [])
+    return (amenities.general or []) + (amenities.room or [])
+
+
+class HotelIndex:
+    """
+    In-memory index over a merged inventory, built once and queried many times.
+
+    Hotel ids and destination ids are hashed to positions in the inventory, so a
+    query costs time proportional to the hotels it matches rather than to the
+    inventory size. Amenity, name-prefix and location indexes are built on first use.
+    Query results keep the inventory's order; nearest() orders by distance.
+    """
+
+    def __init__(self, hotels: List[Hotel]):
+        self.hotels = hotels
+        self._by_id: Dict[str, List[int]] = {}
+        self._by_destination: Dict[str, List[int]] = {}
+        for position, hotel in enumerate(hotels):
+            self._by_id.setdefault(hotel.id, []).append(position)
+            self._by_destination.setdefault(str(hotel.destination_id), []).append(position)
+        self._by_amenity: Optional[Dict[str, List[int]]] = None
+        self._names: Optional[List[tuple]] = None
+        self._geo: Optional[GeoIndex] = None
+
+    def query(self, hotel_ids: Optional[Iterable[str]] = None, destination_ids: Optional[Iterable] = None,
+              amenities: Optional[Iterable[str]] = None, name_prefix: Optional[str] = None,
+              near: Optional[Tuple[float, float, float]] = None) -> List[Hotel]:
+        """
+        Return the hotels matching every given criterion; an empty or None criterion matches all.
+
+        Args:
+        - hotel_ids: Hotel ids, any of which may match.
+        - destination_ids: Destination ids (as str or int), any of which may match.
+        - amenities: Amenities the hotel must all have, matched like AmenityIndex.normalize.
+        - name_prefix: Case-insensitive prefix of the hotel name.
+        - near: (lat, lng, radius in km); hotels without valid coordinates never match.
+
+        Returns:
+        - The matching hotels, in inventory order.
+        """
+        candidates = []
+        if hotel_ids:
+            candidates.append(self._lookup_any(self._by_id, set(hotel_ids)))
+        if destination_ids:
+            candidates.append(self._lookup_any(self._by_destination, {str(d) for d in destination_ids}))
+        if amenities:
+            by_amenity = self._amenity_index()
+            for amenity in set(AmenityIndex.normalize(a) for a in amenities):
+                candidates.append(set(by_amenity.get(amenity, ())))
+        if name_prefix:
+            candidates.append(self._lookup_prefix(name_prefix.lower()))
+        if near:
+            candidates.append({position for position, _ in self.geo().within(*near)})
+
+        if not candidates:
+            return list(self.hotels)
+        # Intersect starting from the most selective criterion
+        candidates.sort(key=len)
+        positions = candidates[0]
+        for other in candidates[1:]:
+            positions = positions & other
+        return [self.hotels[position] for position in sorted(positions)]
+
+    def nearest(self, lat: float, lng: float, k: int) -> List[Tuple[Hotel, float]]:
+        """Return the k hotels nearest to a point with their distance in km, nearest first."""
+        return [(self.hotels[position], distance) for position, distance in self.geo().nearest(lat, lng, k)]
+
+    def unlocated(self) -> List[Hotel]:
+        """Hotels left out of location queries because their lat/lng is missing or invalid."""
+        return [self.hotels[position] for position in self.geo().unlocated]
+
+    def geo(self) -> GeoIndex:
+        if self._geo is None:
+            self._geo = GeoIndex(self.hotels)
+        return self._geo
+
+    def __len__(self) -> int:
+        return len(self.hotels)
+
+    # ===============================
+    # Helper Methods
+    # ===============================
+
+    @staticmethod
+    def _lookup_any(index: Dict[str, List[int]], keys: set) -> set:
+        positions = set()
+        for key in keys:
+            positions.update(index.get(key, ()))
+        return positions
+
+    def _amenity_index(self) -> Dict[str, List[int]]:
+        if self._by_amenity is None:
+            by_amenity = {}
+            for position, hotel in enumerate(self.hotels):
+                for amenity in _amenity_names(hotel):
+                    positions = by_amenity.setdefault(AmenityIndex.normalize(amenity), [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+            self._by_amenity = by_amenity
+        return self._by_amenity
+
+    def _lookup_prefix(self, prefix: str) -> set:
+        if self._names is None:
+            self._names = sorted(((hotel.name or "").lower(), position) for position, hotel in enumerate(self.hotels))
+        names = self._names
+        positions = set()
+        start = bisect_left(names, (prefix, -1))
+        for name, position in names[start:]:
+            if not name.startswith(prefix):
+                break
+            positions.add(position)
+        return positions
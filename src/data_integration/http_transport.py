@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+# requests is imported on the first request rather than at startup, since runs
+# answered from the cache never touch the network and the import is slow
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class HttpOptions:
+    """Per-supplier transport settings, read from the "http" block of suppliers_config.json."""
+    timeout: Optional[float] = 10.0
+    retries: int = 2
+    backoff_factor: float = 0.2
+    backoff_jitter: float = 0.1
+    conditional: bool = True
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "HttpOptions":
+        return cls(**(config or {}))
+
+
+@dataclass
+class Validators:
+    """Cache validators remembered from the last successful response."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, response: "requests.Response") -> "Validators":
+        return cls(response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpTransport:
+    """
+    Shared HTTP layer for all suppliers.
+
+    One keep-alive session is pooled per host, gzip/deflate is negotiated, failed
+    requests are retried with exponential backoff plus jitter, and conditional
+    GETs are sent when the caller has validators from a previous response.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 8):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session(self, url: str) -> "requests.Session":
+        """Return the pooled session for the host of the given URL."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                    session.mount(host + "/", adapter)
+                    self._sessions[host] = session
+        return session
+
+    def get(self, url: str, options: HttpOptions, validators: Optional[Validators] = None,
+            stream: bool = False) -> "requests.Response":
+        """
+        Perform a GET with retries.
+
+        Args:
+        - url: The URL to fetch.
+        - options: Timeout, retry and conditional-request settings.
+        - validators: ETag / Last-Modified from a previous response, sent when options.conditional is set.
+        - stream: Leave the body unread so the caller can consume it incrementally.
+
+        Returns:
+        - The final response. A 304 response means the caller's cached copy is still valid.
+        """
+        import requests
+        headers = validators.headers() if (validators and options.conditional) else {}
+        session = self.session(url)
+        for attempt in range(options.retries + 1):
+            last_attempt = attempt == options.retries
+            try:
+                response = session.get(url, headers=headers, timeout=options.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                response.close()
+            time.sleep(self._backoff(attempt, options))
+
+    @staticmethod
+    def _backoff(attempt: int, options: HttpOptions) -> float:
+        return options.backoff_factor * (2 ** attempt) + random.uniform(0, options.backoff_jitter)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def default_transport() -> HttpTransport:
+    """Return the process-wide transport shared by every supplier."""
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = HttpTransport()
+    return _default_transport
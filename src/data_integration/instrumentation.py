@@ -0,0 +1,178 @@
+import contextlib
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+# The active Metrics, or None when instrumentation is disabled (the default)
+_active: Optional["Metrics"] = None
+
+
+class Metrics:
+    """
+    Counters and timings collected while the pipeline runs.
+
+    Instrumented code asks active() for the current Metrics once per call and
+    skips all bookkeeping when it is None, so a disabled run only pays for that check.
+    """
+
+    def __init__(self):
+        self.suppliers: Dict[str, Dict[str, float]] = {}
+        self.stages: Dict[str, float] = {}
+        self.strategy_calls: Counter = Counter()
+        self.merged_hotels = 0
+        self._lock = threading.Lock()  # Suppliers may be fetched from several threads
+
+    def _supplier(self, supplier_key: str) -> Dict[str, float]:
+        return self.suppliers.setdefault(supplier_key, {"fetch_seconds": 0.0, "bytes": 0, "records": 0,
+                                                         "parse_seconds": 0.0, "reused_records": 0,
+                                                         "parsed_records": 0})
+
+    def record_fetch(self, supplier_key: str, seconds: float, nbytes: int):
+        """Record one HTTP exchange with a supplier: its latency and the size of the body."""
+        with self._lock:
+            entry = self._supplier(supplier_key)
+            entry["fetch_seconds"] += seconds
+            entry["bytes"] += nbytes
+
+    def record_parse(self, supplier_key: str, records: int, seconds: float):
+        with self._lock:
+            entry = self._supplier(supplier_key)
+            entry["records"] += records
+            entry["parse_seconds"] += seconds
+
+    def record_reuse(self, supplier_key: str, hits: int, misses: int):
+        """Record how many of a supplier's records were reused from the RecordStore and how many were parsed."""
+        with self._lock:
+            entry = self._supplier(supplier_key)
+            entry["reused_records"] += hits
+            entry["parsed_records"] += misses
+
+    def record_strategies(self, steps: Iterable, calls_per_step: int, n_ary_calls: int):
+        """
+        Count merge strategy invocations.
+
+        Args:
+        - steps: The merger's MergeSteps.
+        - calls_per_step: Calls made by each pairwise step.
+        - n_ary_calls: Calls made by each step that folds all values at once.
+        """
+        with self._lock:
+            for step in steps:
+                self.strategy_calls[step.strategy] += n_ary_calls if step.merge_all is not None else calls_per_step
+
+    def count_bytes(self, supplier_key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass chunks of a streamed body through, adding their size to the supplier's bytes."""
+        for chunk in chunks:
+            with self._lock:
+                self._supplier(supplier_key)["bytes"] += len(chunk)
+            yield chunk
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self) -> dict:
+        """Return everything collected so far, with derived rates, as a JSON-serializable dict."""
+        suppliers = {}
+        for key, entry in self.suppliers.items():
+            rate = entry["records"] / entry["parse_seconds"] if entry["parse_seconds"] else None
+            suppliers[key] = {**entry, "records_per_second": round(rate) if rate else None}
+        merge_seconds = self.stages.get("merge")
+        per_hotel = merge_seconds / self.merged_hotels * 1e6 if merge_seconds and self.merged_hotels else None
+        return {
+            "suppliers": suppliers,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "merged_hotels": self.merged_hotels,
+            "merge_us_per_hotel": round(per_hotel, 2) if per_hotel else None,
+            "strategy_calls": dict(self.strategy_calls),
+            "peak_memory_bytes": peak_memory(),
+        }
+
+
+def enable() -> Metrics:
+    """Start collecting metrics, returning the fresh Metrics that will receive them."""
+    global _active
+    _active = Metrics()
+    return _active
+
+
+def disable():
+    global _active
+    _active = None
+
+
+def active() -> Optional[Metrics]:
+    return _active
+
+
+def stage(name: str):
+    """Time a block as the given pipeline stage, or do nothing when instrumentation is disabled."""
+    metrics = _active
+    return metrics.stage(name) if metrics is not None else contextlib.nullcontext()
+
+
+def peak_memory() -> Optional[int]:
+    """Peak memory of the process in bytes: traced Python allocations if tracemalloc is on, else the peak RSS."""
+    # tracemalloc is only imported by profile(), so it cannot be tracing unless it was imported
+    tracemalloc = sys.modules.get("tracemalloc")
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1]
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@contextlib.contextmanager
+def profile(mode: Optional[str], path: str, limit: int = 30):
+    """
+    Profile the enclosed block and write the result to path.
+
+    Args:
+    - mode: "cprofile" (a pstats dump, read it with `python -m pstats path`),
+      "tracemalloc" (the top allocation sites as text) or None to do nothing.
+    - path: File the profile is written to.
+    - limit: Number of allocation sites listed by tracemalloc.
+    """
+    if mode is None:
+        yield
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+    if mode == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+        return
+
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with open(path, "w") as f:
+            f.write(f"current={current} peak={peak}\n")
+            for stat in snapshot.statistics("lineno")[:limit]:
+                f.write(f"{stat}\n")
@@ -0,0 +1,32 @@
+import sys
+
+# numpy is optional and slow to import, so the modules that can use it start with
+# np = UNLOADED and call load_numpy(__name__) where they first need it
+UNLOADED = object()
+_numpy = UNLOADED
+
+
+def load_numpy(module_name: str):
+    """
+    Bind numpy to the module's `np` the first time it is needed, and return it.
+
+    An `np` that is already set is left alone: None when numpy is not installed, or
+    whatever a test or benchmark set it to (None takes the pure-Python path).
+
+    Args:
+    - module_name: The calling module's __name__.
+
+    Returns:
+    - The module's np: numpy, or None.
+    """
+    global _numpy
+    namespace = vars(sys.modules[module_name])
+    if namespace["np"] is UNLOADED:
+        if _numpy is UNLOADED:
+            try:
+                import numpy
+            except ImportError:
+                numpy = None
+            _numpy = numpy
+        namespace["np"] = _numpy
+    return namespace["np"]
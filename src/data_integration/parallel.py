@@ -0,0 +1,128 @@
+import json
+import os
+import zlib
+from config.config import registry
+from typing import Iterable, List, Optional, Sequence, Tuple
+from .base_supplier import BaseSupplier, supplier_class
+from .data_merger import DataMerger
+from .parser import Parser
+from ..models.hotel import Hotel
+from ..models.serialization import hotel_to_dict
+
+# Per-process state set up by _init_worker: (suppliers in merge order, merger)
+_worker_state: Optional[Tuple[List[BaseSupplier], DataMerger]] = None
+
+
+def shard_of(hotel_id, shards: int) -> int:
+    """
+    Return the shard a hotel id belongs to.
+
+    The id is hashed as the string the parser will turn it into, so "7" and 7
+    land in the same shard; crc32 keeps the assignment stable across processes.
+    """
+    key = "" if hotel_id is None else str(hotel_id)
+    return zlib.crc32(key.encode()) % shards
+
+
+def _init_worker(supplier_keys: Sequence[str]):
+    global _worker_state
+    # Parsing only depends on the supplier's config, so workers rebuild suppliers from their keys
+    _worker_state = ([supplier_class(key)() for key in supplier_keys], DataMerger())
+
+
+def _parse_and_merge_shard(payload: bytes) -> bytes:
+    """
+    Parse and merge one shard inside a worker process.
+
+    Args:
+    - payload: JSON array of [sequence, supplier position, raw record] triples, in sequence order.
+
+    Returns:
+    - JSON array of [first sequence, merged hotel] pairs, in order of first appearance.
+    """
+    suppliers, merger = _worker_state
+    first_seen = {}
+    hotels = []
+    for sequence, position, dto in json.loads(payload):
+        hotel = suppliers[position].parse(dto)
+        first_seen.setdefault(hotel.id, sequence)
+        hotels.append(hotel)
+    merged = merger.merge_groups(hotels)
+    return json.dumps([[first_seen[hotel.id], hotel_to_dict(hotel)] for hotel in merged],
+                      separators=(",", ":")).encode()
+
+
+class ParallelMerger:
+    """
+    Parses and merges raw supplier records on a process pool, sharded by hotel id.
+
+    Every record of a hotel lands in the same shard, so each shard is merged
+    independently. Shards are stitched back together by the position at which
+    each hotel first appeared, so the result matches the serial path
+    (parse every supplier, then DataMerger.merge_groups) hotel for hotel.
+    """
+
+    def __init__(self, suppliers: List[BaseSupplier], workers: Optional[int] = None, shards: Optional[int] = None):
+        """
+        Args:
+        - suppliers: The suppliers whose records are merged, in merge order.
+        - workers: Number of worker processes (default is the CPU count). With one worker
+          records are parsed and merged in this process, with no pool or sharding at all.
+        - shards: Number of shards (default is one per worker).
+        """
+        self.suppliers = suppliers
+        self.workers = max(workers or os.cpu_count() or 1, 1)
+        self.shards = max(shards or self.workers, 1)
+        self.merger = DataMerger()
+        # Raw id path of each supplier, used to shard records without parsing them
+        self._id_sources = [registry.suppliers[s.supplier_key]["fields"]["id"]["source"] for s in suppliers]
+
+    def shard_records(self, raw_records: Iterable[List[dict]]) -> List[bytes]:
+        """
+        Split every supplier's raw records into shards by hotel id.
+
+        Args:
+        - raw_records: Each supplier's raw records, in supplier order.
+
+        Returns:
+        - One JSON payload per shard, ready to be sent to a worker.
+        """
+        shards = [[] for _ in range(self.shards)]
+        sequence = 0
+        for position, records in enumerate(raw_records):
+            id_source = self._id_sources[position]
+            for dto in records:
+                hotel_id = Parser.get_nested_value(dto, id_source) if id_source else None
+                shards[shard_of(hotel_id, self.shards)].append((sequence, position, dto))
+                sequence += 1
+        return [json.dumps(shard, separators=(",", ":")).encode() for shard in shards if shard]
+
+    def merge(self, raw_records: Iterable[List[dict]]) -> List[Hotel]:
+        """
+        Parse and merge every supplier's raw records.
+
+        Args:
+        - raw_records: Each supplier's raw records, in supplier order.
+
+        Returns:
+        - The merged hotels, in the same order as the serial path.
+        """
+        if self.workers == 1:
+            hotels = [supplier.parse(dto) for supplier, records in zip(self.suppliers, raw_records) for dto in records]
+            return self.merger.merge_groups(hotels)
+
+        from concurrent.futures import ProcessPoolExecutor  # Pulls in multiprocessing, so only when a pool is used
+        payloads = self.shard_records(raw_records)
+        with ProcessPoolExecutor(max_workers=min(self.workers, max(len(payloads), 1)), initializer=_init_worker,
+                                 initargs=([supplier.supplier_key for supplier in self.suppliers],)) as executor:
+            results = list(executor.map(_parse_and_merge_shard, payloads))
+
+        merged = []
+        for result in results:
+            merged.extend(json.loads(result))
+        merged.sort(key=lambda pair: pair[0])
+        return [Hotel.from_dict(hotel) for _, hotel in merged]
+
+    def fetch_and_merge(self, timeout: Optional[float] = None) -> List[Hotel]:
+        """Fetch every supplier's raw payload in turn, then parse and merge them on the pool."""
+        return self.merge([supplier.fetch_records(timeout=timeout) for supplier in self.suppliers])
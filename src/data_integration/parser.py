@@ -1,4 +1,17 @@
 class Parser:
+    @staticmethod
+    def compile(config: dict) -> "ParsePlan":
+        """
+        Compile a supplier's flattened field configuration into a reusable plan.
+
+        Args:
+        - config: The flattened configuration for the supplier.
+
+        Returns:
+        - A ParsePlan that maps a raw record straight to the nested structure.
+        """
+        return ParsePlan(config)
+
     @staticmethod
     def parse(dto: dict, config: dict) -> dict:
         """
@@ -98,41 +111,187 @@ class Parser:
         return value
 
     @staticmethod
-    def parse_amenities(amenities_dict: dict, config: dict) -> dict:
+    def parse_amenities(amenities_dict: dict, config) -> dict:
         """
-        Categorize amenities into 'general' and 'room', using a set for matching.
+        Categorize amenities into 'general' and 'room' using a prebuilt AmenityIndex.
 
         Args:
         - amenities_dict: A dictionary containing 'general' and 'room' amenities.
-        - config: Configuration defining 'general' and 'room' amenities.
+        - config: An AmenityIndex, or the raw amenities configuration to build one from.
 
         Returns:
-        - A dictionary with categorized amenities.
+        - A dictionary with categorized, canonically named and deduplicated amenities.
         """
-        categorized_amenities = {"general": [], "room": []}
+        index = config if isinstance(config, AmenityIndex) else AmenityIndex(config)
+        return index.categorize(amenities_dict.get("general", []) + amenities_dict.get("room", []))
 
-        # Combine all amenities from input
-        amenities = amenities_dict.get("general", []) + amenities_dict.get("room", [])
 
-        # Create sets for normalized general and room amenities
-        general_set = {g.replace(" ", "").lower() for g in config["general"]}
-        room_set = {r.replace(" ", "").lower() for r in config["room"]}
+def _to_integer(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
 
-        for amenity in amenities:
-            # Normalize the amenity (remove spaces, lowercase)
-            normalized = amenity.replace(" ", "").lower()
 
-            if normalized in general_set:
-                # Use the readable version from config
-                readable = next(g for g in config["general"] if g.replace(" ", "").lower() == normalized)
-                categorized_amenities["general"].append(readable)
-            elif normalized in room_set:
-                # Use the readable version from config
-                readable = next(r for r in config["room"] if r.replace(" ", "").lower() == normalized)
-                categorized_amenities["room"].append(readable)
-            else:
-                # Default to general category
-                categorized_amenities["general"].append(amenity)
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
 
-        return categorized_amenities
+def _to_string(value):
+    try:
+        return str(value)
+    except (ValueError, TypeError):
+        return None
 
+
+def _to_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+# Same conversions as Parser._transform_value, resolved once per field instead of per value
+_CONVERTERS = {
+    "integer": _to_integer,
+    "float": _to_float,
+    "string": _to_string,
+    "list": _to_list,
+}
+
+
+class ParsePlan:
+    """
+    A supplier's field configuration compiled into a single parse function.
+
+    Source paths are split, type converters are looked up and the nested output
+    layout (e.g. "location.lat" -> {"location": {"lat": ...}}) is resolved once.
+    The plan is then generated as straight-line Python code, so parsing a record
+    is a single pass with no per-field rule lookups, and produces the same result
+    as Parser.parse followed by nesting its dotted keys.
+    """
+
+    __slots__ = ("source", "_parse")
+
+    def __init__(self, config: dict, sep: str = "."):
+        namespace = {converter.__name__: converter for converter in _CONVERTERS.values()}
+        lines = ["def parse_record(dto):",
+                 "    if not isinstance(dto, dict): dto = {}"]
+        tree = {}
+        for index, (field, rules) in enumerate(config.items()):
+            lines.extend("    " + line for line in ParsePlan._field_code(index, rules, sep, namespace))
+            keys = field.split(sep)
+            node = tree
+            for part in keys[:-1]:
+                node = node.setdefault(part, {})
+            node[keys[-1]] = f"f{index}"
+        lines.append("    return " + ParsePlan._layout_code(tree))
+
+        self.source = "\n".join(lines) + "\n"
+        exec(compile(self.source, "<parse plan>", "exec"), namespace)
+        self._parse = namespace["parse_record"]
+
+    def __call__(self, dto: dict) -> dict:
+        """Parse a single raw record into the nested structure."""
+        return self._parse(dto)
+
+    @staticmethod
+    def _layout_code(tree: dict) -> str:
+        """Return a dict literal building the nested output from the field variables."""
+        items = []
+        for key, node in tree.items():
+            value = ParsePlan._layout_code(node) if isinstance(node, dict) else node
+            items.append(f"{key!r}: {value}")
+        return "{" + ", ".join(items) + "}"
+
+    @staticmethod
+    def _field_code(index: int, rules: dict, sep: str, namespace: dict) -> list:
+        """Return the statements that compute field `index` into the variable f<index>."""
+        var = f"f{index}"
+
+        if not rules["source"]:
+            # Without a source every record gets the same value, so compute it now
+            namespace[f"_constant{index}"] = Parser._parse_field({}, rules)
+            copy = ".copy()" if isinstance(namespace[f"_constant{index}"], (list, dict)) else ""
+            return [f"{var} = _constant{index}{copy}"]
+
+        # Retrieve the source value using dot notation
+        keys = rules["source"].split(sep)
+        lines = [f"{var} = dto.get({keys[0]!r})"]
+        for key in keys[1:]:
+            lines.append(f"{var} = {var}.get({key!r}) if isinstance({var}, dict) else None")
+
+        # Apply default if the value is None, copied so records never share the config's object
+        if rules.get("default") is not None:
+            namespace[f"_default{index}"] = rules["default"]
+            copy = ".copy()" if isinstance(rules["default"], (list, dict)) else ""
+            lines.append(f"if {var} is None: {var} = _default{index}{copy}")
+
+        # Apply type transformations
+        value_type = rules.get("type")
+        if value_type == "list":
+            lines.append(f"if {var} is not None and not isinstance({var}, list): {var} = [{var}]")
+        elif value_type in _CONVERTERS:
+            lines.append(f"if {var} is not None: {var} = {_CONVERTERS[value_type].__name__}({var})")
+
+        # Handle structured fields (e.g., images with subfields)
+        if "fields" in rules:
+            item = ", ".join(f"{sub_field!r}: item.get({sub_source!r}, '')"
+                             for sub_field, sub_source in rules["fields"].items())
+            lines.append(f"if isinstance({var}, list): {var} = [{{{item}}} for item in {var}]")
+        return lines
+
+
+class AmenityIndex:
+    """
+    Lookup table from a normalized amenity name to its (category, canonical name).
+
+    Built once from amenities_config.json. Besides the names listed under each
+    category, the optional "aliases" section maps a canonical name to synonyms
+    (e.g. "bathtub": ["tub"]) that collapse onto the same entry.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, config: dict):
+        self._entries = {}
+        for category in ("general", "room"):
+            for name in config.get(category, []):
+                self._entries.setdefault(AmenityIndex.normalize(name), (category, name))
+        for canonical, aliases in config.get("aliases", {}).items():
+            entry = self._entries.get(AmenityIndex.normalize(canonical))
+            if entry is None:
+                raise ValueError(f"Amenity alias target '{canonical}' is not listed under 'general' or 'room'")
+            for alias in aliases:
+                self._entries.setdefault(AmenityIndex.normalize(alias), entry)
+
+    @staticmethod
+    def normalize(amenity: str) -> str:
+        """Normalize an amenity name (remove spaces, lowercase)."""
+        return amenity.replace(" ", "").lower()
+
+    def lookup(self, amenity: str):
+        """Return (category, canonical name) for a known amenity, or None."""
+        return self._entries.get(amenity.replace(" ", "").lower())
+
+    def categorize(self, amenities) -> dict:
+        """
+        Split amenities into 'general' and 'room', keeping the first occurrence of each.
+
+        Known amenities use their canonical name from the config; unknown ones
+        default to the general category with the supplier's spelling.
+        """
+        categorized = {"general": [], "room": []}
+        seen = set()
+        entries = self._entries
+        for amenity in amenities:
+            normalized = amenity.replace(" ", "").lower()
+            entry = entries.get(normalized)
+            if entry is None:
+                if normalized not in seen:
+                    seen.add(normalized)
+                    categorized["general"].append(amenity)
+            elif entry not in seen:
+                seen.add(entry)
+                categorized[entry[0]].append(entry[1])
+        return categorized
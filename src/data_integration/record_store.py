@@ -0,0 +1,74 @@
+import hashlib
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Tuple
+from ..models.hotel import Hotel
+
+
+def record_digest(text: str) -> bytes:
+    """Hash of a raw record's source text, as it appeared in the supplier's payload."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+class RecordStore:
+    """
+    Parsed hotels of each supplier, keyed by a digest of the raw record they were parsed from.
+
+    On a refresh, records whose text is unchanged reuse the hotel parsed last time
+    (handed out as a Hotel.copy(), so merging cannot alter the stored one) and only
+    new or changed records are parsed. Records that left the feed are forgotten,
+    and a change to the supplier's config discards everything stored for it.
+    """
+
+    def __init__(self):
+        self._fragments: Dict[str, Tuple[str, Dict[bytes, Hotel]]] = {}
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._lock = threading.Lock()  # Suppliers may be fetched from several threads
+
+    def parse_all(self, supplier_key: str, fingerprint: str, items: Iterable[Tuple[dict, str]],
+                  parse: Callable[[dict], Hotel]) -> Tuple[List[Hotel], int, int]:
+        """
+        Turn a supplier's raw records into hotels, parsing only the ones not seen before.
+
+        Args:
+        - supplier_key: The supplier the records came from.
+        - fingerprint: The supplier's config fingerprint; stored hotels from another config are not reused.
+        - items: (decoded record, source text) pairs, in payload order.
+        - parse: Parses one decoded record.
+
+        Returns:
+        - The hotels in payload order, and the number of reused and parsed records.
+        """
+        stored_fingerprint, previous = self._fragments.get(supplier_key, (None, {}))
+        if stored_fingerprint != fingerprint:
+            previous = {}
+        current = {}
+        hotels = []
+        hits = misses = 0
+        for dto, text in items:
+            digest = record_digest(text)
+            hotel = current.get(digest) or previous.get(digest)
+            if hotel is None:
+                hotel = parse(dto)
+                misses += 1
+            else:
+                hits += 1
+            current[digest] = hotel
+            hotels.append(hotel.copy())
+
+        with self._lock:
+            self._fragments[supplier_key] = (fingerprint, current)
+            self.hits[supplier_key] += hits
+            self.misses[supplier_key] += misses
+        return hotels, hits, misses
+
+    def stats(self) -> dict:
+        """Records reused and parsed so far, and records currently stored, per supplier."""
+        with self._lock:
+            return {key: {"hits": self.hits[key], "misses": self.misses[key], "stored": len(fragments)}
+                    for key, (_, fragments) in self._fragments.items()}
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
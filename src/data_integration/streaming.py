@@ -0,0 +1,126 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Union
+
+Chunk = Union[bytes, str]
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+def _decoded(chunks: Iterable[Chunk]) -> Iterator[str]:
+    """Decode a stream of byte chunks as UTF-8 without splitting multi-byte characters."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_json_array(chunks: Iterable[Chunk], compact_at: int = 1 << 16, with_text: bool = False) -> Iterator[Any]:
+    """
+    Yield the items of a top-level JSON array one at a time as the chunks arrive.
+
+    Only the item being decoded (plus at most one chunk) is held in memory, so
+    the payload size does not bound memory use.
+
+    Args:
+    - chunks: The response body as an iterable of bytes or str chunks.
+    - compact_at: Drop already-consumed text from the buffer once it grows past this many characters.
+    - with_text: Yield (item, source text of the item) pairs instead of bare items.
+
+    Returns:
+    - An iterator over the decoded array items.
+    """
+    decoder = json.JSONDecoder()
+    text_chunks = _decoded(chunks)
+    buffer, pos = "", 0
+    started = exhausted = False
+
+    def more() -> bool:
+        nonlocal buffer, pos, exhausted
+        for text in text_chunks:
+            if pos >= compact_at:
+                buffer, pos = buffer[pos:], 0
+            buffer += text
+            return True
+        exhausted = True
+        return False
+
+    def skip_whitespace() -> bool:
+        """Advance past whitespace; return False if the stream ended first."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not more():
+                return False
+
+    if not skip_whitespace() or buffer[pos] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+
+    while True:
+        if not skip_whitespace():
+            raise ValueError("Unterminated JSON array")
+        char = buffer[pos]
+        if char == "]":
+            pos += 1
+            break
+        if started:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {pos}")
+            pos += 1
+            if not skip_whitespace():
+                raise ValueError("Unterminated JSON array")
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if more():
+                    continue
+                raise
+            # A number is only complete once a character that cannot continue it has arrived
+            if (isinstance(item, (int, float)) and not exhausted
+                    and (end == len(buffer) or buffer[end] in _NUMBER_CHARS) and more()):
+                continue
+            break
+        text = buffer[pos:end] if with_text else None
+        pos, started = end, True
+        yield (item, text) if with_text else item
+
+    if skip_whitespace():
+        raise ValueError(f"Unexpected data after JSON array at offset {pos}")
+
+
+def iter_ndjson(chunks: Iterable[Chunk], with_text: bool = False) -> Iterator[Any]:
+    """
+    Yield one decoded value per non-empty line of a newline-delimited JSON stream.
+
+    Args:
+    - chunks: The response body as an iterable of bytes or str chunks.
+    - with_text: Yield (value, line) pairs instead of bare values.
+
+    Returns:
+    - An iterator over the decoded lines.
+    """
+    pending = ""
+    for text in _decoded(chunks):
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield (json.loads(line), line) if with_text else json.loads(line)
+    if pending.strip():
+        yield (json.loads(pending), pending) if with_text else json.loads(pending)
+
+
+STREAM_FORMATS = {
+    "json": iter_json_array,
+    "ndjson": iter_ndjson,
+}
@@ -1,24 +1,294 @@
-from typing import List, Optional
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+from . import instrumentation
 from .base_supplier import BaseSupplier
-from .data_merger import DataMerger
+from .data_merger import DataMerger, IncrementalMerger
+from .duplicates import DuplicateMatcher
+from .hotel_index import HotelIndex
+from .parallel import ParallelMerger
+from .record_store import RecordStore
 from ..models.hotel import Hotel
 
+if TYPE_CHECKING:
+    from .cache import HotelCache  # Imports sqlite3, which only --cache runs need
+
 
 class SupplierManager:
-    def __init__(self, suppliers: List[BaseSupplier]):
+    FETCH_MODES = ("sequential", "thread", "async")
+
+    def __init__(self, suppliers: List[BaseSupplier], mode: str = "sequential",
+                 max_workers: Optional[int] = None, timeout: Optional[float] = None, stream: bool = False,
+                 cache: Optional["HotelCache"] = None, parse_workers: Optional[int] = None,
+                 reuse_records: bool = False, columnar: bool = False, match_duplicates: bool = False):
+        """
+        Args:
+        - suppliers: The suppliers to fetch from, in merge order.
+        - mode: "sequential" (default), "thread" for a thread pool or "async" for asyncio.
+        - max_workers: Upper bound on concurrent fetches (default is one per supplier).
+        - timeout: Seconds each supplier is given before its results are dropped.
+        - stream: Stream each supplier's payload into the merger instead of loading it whole.
+        - cache: Persistent cache of parsed and merged hotels (not used when streaming).
+        - parse_workers: Parse and merge on a pool of this many processes, sharded by hotel id.
+        - reuse_records: Keep each supplier's parsed records and only parse new or changed ones on the next fetch.
+        - columnar: Merge first_non_null and choose_best fields a column at a time across all hotels.
+        - match_duplicates: Link records of the same hotel listed under different ids before merging.
+        """
+        if mode not in self.FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode '{mode}', expected one of {self.FETCH_MODES}")
+        if stream and mode != "sequential":
+            raise ValueError("Streaming ingestion only supports the sequential fetch mode")
+        if parse_workers and (stream or cache is not None):
+            raise ValueError("Process-pool parsing cannot be combined with streaming or the cache")
+        if match_duplicates and (stream or parse_workers):
+            raise ValueError("Duplicate matching needs every record at once, so it cannot be combined with "
+                             "streaming or process-pool parsing")
         self.suppliers = suppliers
+        self.mode = mode
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.stream = stream
+        self.cache = cache
+        self.parse_workers = parse_workers
+        self.record_store: Optional[RecordStore] = None
+        if reuse_records:
+            self.record_store = RecordStore()
+            for supplier in suppliers:
+                supplier.record_store = self.record_store
+        self.columnar = columnar
+        self.matcher: Optional[DuplicateMatcher] = DuplicateMatcher() if match_duplicates else None
+        self.duplicates: Dict[str, str] = {}  # Duplicate id -> id it was merged into, from the last merge
         self.merger = DataMerger()
+        self.errors: Dict[str, BaseException] = {}
+        self.index: Optional[HotelIndex] = None
+        self.incremental: Optional[IncrementalMerger] = None
+        self._fetched: Dict[str, List[Hotel]] = {}  # Each supplier's hotels from its last refresh_supplier fetch
 
     def fetch_and_merge_data(self) -> List[Hotel]:
+        """Fetch and merge every supplier's hotels, then index the merged inventory for queries."""
+        merged = self._fetch_and_merge()
+        with instrumentation.stage("index"):
+            self.index = HotelIndex(merged)
+        metrics = instrumentation.active()
+        if metrics is not None:
+            metrics.merged_hotels += len(merged)
+        return merged
+
+    def _fetch_and_merge(self) -> List[Hotel]:
+        self.errors = {}
+        if self.stream:
+            # Peak memory is bounded by the merged hotels, not by the suppliers' payloads
+            with instrumentation.stage("stream"):
+                return self.merger.merge_hotels(self.iter_hotels())
+        if self.parse_workers:
+            return ParallelMerger(self.suppliers, self.parse_workers).fetch_and_merge(timeout=self.timeout)
+        with instrumentation.stage("fetch"):
+            if self.cache is None:
+                results = self._fetch(self.suppliers)
+            else:
+                merged = self._cached_merge()
+                if merged is not None:
+                    return merged
+                results = self._fetch_with_cache()
+
+        # Results are always concatenated in supplier order so the merge is deterministic
         all_hotels = []
+        for hotels in results:
+            all_hotels.extend(hotels)
+        if self.matcher is not None:
+            with instrumentation.stage("match"):
+                self.duplicates = self.matcher.link(all_hotels)
+        with instrumentation.stage("merge"):
+            merged = self.merger.merge_columns(all_hotels) if self.columnar else self.merger.merge_groups(all_hotels)
+
+        if self.cache is not None and not self.errors:
+            self.cache.put_merged(self._merged_fingerprint(), merged)
+        return merged
+
+    def refresh_supplier(self, supplier: BaseSupplier) -> Set[str]:
+        """
+        Refetch one supplier and re-merge only the hotels whose contribution changed.
+
+        The first call loads every supplier's contribution (and reports every hotel);
+        later calls only fetch the given supplier. Suppliers are fetched with the
+        configured mode, as fetch_and_merge_data does: in the thread and async modes a
+        supplier that fails or times out is recorded in `errors` and keeps its previous
+        contribution. With duplicate matching, every supplier's records are linked
+        again, since a changed record can link or unlink another supplier's hotels.
+        Hotels are re-merged one at a time, which gives the same hotels as the
+        columnar merge. The index is rebuilt when any merged hotel changed.
+
+        Returns:
+        - The ids of merged hotels that were added, changed or removed.
+        """
+        self.errors = {}
+        if self.incremental is None:
+            self.incremental = IncrementalMerger(self.merger, [s.supplier_key for s in self.suppliers])
+            refreshed = self.suppliers
+        else:
+            refreshed = [supplier]
+        fetched = {each.supplier_key: hotels for each, hotels in zip(refreshed, self._fetch(refreshed))
+                   if each.supplier_key not in self.errors}
+        self._fetched.update(fetched)
+        if self.matcher is not None:
+            fetched = self._link_fetched()
+        changed = set()
+        for key, hotels in fetched.items():
+            changed |= self.incremental.replace_supplier(key, hotels)
+        if changed or self.index is None:
+            self.index = HotelIndex(self.incremental.merged_hotels())
+        return changed
+
+    def _link_fetched(self) -> Dict[str, List[Hotel]]:
+        """Every supplier's fetched hotels with duplicate ids linked; copies, since linking rewrites ids."""
+        linked = {s.supplier_key: [hotel.copy() for hotel in self._fetched[s.supplier_key]]
+                  for s in self.suppliers if s.supplier_key in self._fetched}
+        with instrumentation.stage("match"):
+            self.duplicates = self.matcher.link([hotel for hotels in linked.values() for hotel in hotels])
+        return linked
+
+    def _fetch(self, suppliers: List[BaseSupplier]) -> List[List[Hotel]]:
+        """Fetch the given suppliers using the configured mode, returning their hotels in order."""
+        if self.mode == "thread":
+            return self._fetch_threaded(suppliers)
+        if self.mode == "async":
+            import asyncio  # Only needed by this mode, and slow to import
+            return asyncio.run(self._fetch_async(suppliers))
+        return [supplier.fetch(timeout=self.timeout) for supplier in suppliers]
+
+    # ===============================
+    # Cache
+    # ===============================
+
+    def _merged_fingerprint(self) -> Optional[str]:
+        """Fingerprint of the merged result, or None if any supplier has no valid cache entry."""
+        entries = []
         for supplier in self.suppliers:
-            all_hotels.extend(supplier.fetch())
-        return self.merger.merge_hotels(all_hotels)
+            entry = self.cache.supplier_entry(supplier.supplier_key, supplier.fingerprint())
+            if entry is None:
+                return None
+            entries.append((supplier.supplier_key, *entry))
+        strategy = self.merger.merge_strategy
+        if self.matcher is not None:
+            # Linking duplicates changes the merged hotels, so those results are cached apart
+            strategy = {"fields": strategy, "duplicates": asdict(self.matcher.options)}
+        return self.cache.merged_fingerprint(strategy, entries)
+
+    def _cached_merge(self) -> Optional[List[Hotel]]:
+        fingerprint = self._merged_fingerprint()
+        return self.cache.get_merged(fingerprint) if fingerprint else None
+
+    def _fetch_with_cache(self) -> List[List[Hotel]]:
+        """Use cached hotels for suppliers that have them and fetch only the rest."""
+        results = [self.cache.get_supplier(s.supplier_key, s.fingerprint()) for s in self.suppliers]
+        missing = [supplier for supplier, hotels in zip(self.suppliers, results) if hotels is None]
+        fetched = iter(self._fetch(missing))
+        for position, supplier in enumerate(self.suppliers):
+            if results[position] is None:
+                results[position] = next(fetched)
+                if supplier.supplier_key not in self.errors:
+                    # Stored before merging, since merging writes into the records
+                    self.cache.put_supplier(supplier.supplier_key, supplier.fingerprint(), results[position])
+        return results
+
+    def iter_hotels(self) -> Iterator[Hotel]:
+        """Yield every supplier's hotels in supplier order, streaming each payload."""
+        for supplier in self.suppliers:
+            yield from supplier.iter_hotels(timeout=self.timeout)
+
+    # ===============================
+    # Concurrent fetching
+    # ===============================
+
+    def _fetch_threaded(self, suppliers: List[BaseSupplier]) -> List[List[Hotel]]:
+        """
+        Fetch suppliers on a thread pool, dropping any that fail or time out.
+
+        Each supplier's timeout counts from when a worker starts its fetch, not from
+        when it was queued, so suppliers waiting for a free worker are not penalized.
+        """
+        workers = self.max_workers or max(len(suppliers), 1)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="supplier-fetch")
+        started: Dict[int, float] = {}
+
+        def fetch_one(position: int, supplier: BaseSupplier) -> List[Hotel]:
+            started[position] = time.monotonic()
+            return supplier.fetch(self.timeout)
+
+        try:
+            futures = [executor.submit(fetch_one, position, supplier) for position, supplier in enumerate(suppliers)]
+            pending = set(range(len(futures)))
+            while pending:
+                pending = {position for position in pending if not futures[position].done()}
+                if self.timeout is not None:
+                    now = time.monotonic()
+                    pending -= {position for position in pending
+                                if position in started and now - started[position] >= self.timeout}
+                    deadlines = [started[position] + self.timeout for position in pending if position in started]
+                    remaining = min(deadlines) - now if deadlines else None
+                else:
+                    remaining = None
+                if pending:
+                    wait([futures[position] for position in pending], timeout=remaining,
+                         return_when=FIRST_COMPLETED)
+            results = []
+            for supplier, future in zip(suppliers, futures):
+                if not future.done():
+                    future.cancel()
+                    self.errors[supplier.supplier_key] = TimeoutError(
+                        f"{supplier.supplier_key} did not respond within {self.timeout}s")
+                    results.append([])
+                elif future.exception() is not None:
+                    self.errors[supplier.supplier_key] = future.exception()
+                    results.append([])
+                else:
+                    results.append(future.result())
+            return results
+        finally:
+            # Do not block on stragglers; their results are already discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _fetch_async(self, suppliers: List[BaseSupplier]) -> List[List[Hotel]]:
+        """Fetch suppliers concurrently on the event loop, dropping any that fail or time out."""
+        import asyncio
+        workers = self.max_workers or max(len(suppliers), 1)
+        semaphore = asyncio.Semaphore(workers)
+        # A private executor, so timed-out fetches are not waited for when the loop closes
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="supplier-fetch")
+
+        async def fetch_one(supplier: BaseSupplier) -> List[Hotel]:
+            async with semaphore:
+                return await supplier.fetch_async(timeout=self.timeout, executor=executor)
+
+        try:
+            outcomes = await asyncio.gather(*(fetch_one(s) for s in suppliers), return_exceptions=True)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        results = []
+        for supplier, outcome in zip(suppliers, outcomes):
+            if isinstance(outcome, BaseException):
+                self.errors[supplier.supplier_key] = outcome
+                results.append([])
+            else:
+                results.append(outcome)
+        return results
+
+    # ===============================
+    # Queries
+    # ===============================
 
-    def filter_hotels(self, hotels: List[Hotel], hotel_ids: Optional[List[str]], destination_ids: Optional[List[str]]) -> List[Hotel]:
-        return [
-            hotel for hotel in hotels
-            if (not hotel_ids or hotel.id in hotel_ids) and
-               (not destination_ids or str(hotel.destination_id) in destination_ids)
-        ]
+    def filter_hotels(self, hotels: List[Hotel], hotel_ids: Optional[List[str]], destination_ids: Optional[List[str]],
+                      amenities: Optional[List[str]] = None, name_prefix: Optional[str] = None,
+                      near: Optional[Tuple[float, float, float]] = None) -> List[Hotel]:
+        """
+        Return the hotels matching every given criterion, using the index built after merging.
 
+        Any hotel id and any destination id may match; all amenities must be present.
+        near is (lat, lng, radius in km), and hotels without coordinates never match it.
+        A list that is not the merged inventory gets a throwaway index of its own.
+        """
+        index = self.index
+        if index is None or index.hotels is not hotels:
+            index = HotelIndex(hotels)
+        return index.query(hotel_ids, destination_ids, amenities, name_prefix, near)
@@ -1,8 +1,10 @@
 # models/hotel.py
+import sys
+from array import array
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     address: Optional[str] = None
     city: Optional[str] = None
@@ -11,23 +13,23 @@ class Location:
     lng: Optional[float] = None
     postal_code: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Amenities:
     general: List[str] = field(default_factory=list)
     room: List[str] = field(default_factory=list)
     
-@dataclass
+@dataclass(slots=True)
 class Image:
     link: str
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class ImageCategory:
     rooms: List[Image] = field(default_factory=list)
     site: List[Image] = field(default_factory=list)
     amenities: List[Image] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class Hotel:
     id: str
     destination_id: int
@@ -37,3 +39,99 @@ class Hotel:
     amenities: Amenities
     images: ImageCategory
     booking_conditions: Optional[List[str]] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Hotel":
+        """
+        Build a fully typed Hotel from parsed supplier data.
+
+        Nested dicts become Location, Amenities, ImageCategory and Image objects,
+        and amenity names are interned so every hotel shares one copy of each.
+        """
+        location = data.get("location") or {}
+        amenities = data.get("amenities") or {}
+        images = data.get("images") or {}
+        return cls(
+            id=data.get("id"),
+            destination_id=data.get("destination_id"),
+            name=data.get("name"),
+            description=data.get("description"),
+            location=Location(**location),
+            amenities=Amenities(
+                general=[sys.intern(a) for a in amenities.get("general") or []],
+                room=[sys.intern(a) for a in amenities.get("room") or []],
+            ),
+            images=ImageCategory(**{
+                category: [Image(**image) for image in category_images or []]
+                for category, category_images in images.items()
+            }),
+            booking_conditions=data.get("booking_conditions", []),
+        )
+
+    def copy(self) -> "Hotel":
+        """
+        Copy the hotel and its nested objects, sharing their lists, strings and Image objects.
+
+        Merging assigns new values and new lists rather than changing them in place (and
+        copies an Image before merging into it), so this keeps the original untouched at
+        a fraction of the cost of a deep copy.
+        """
+        location, amenities, images = self.location, self.amenities, self.images
+        return Hotel(
+            self.id, self.destination_id, self.name, self.description,
+            Location(location.address, location.city, location.country, location.lat, location.lng,
+                     location.postal_code),
+            Amenities(amenities.general, amenities.room),
+            ImageCategory(images.rooms, images.site, images.amenities),
+            self.booking_conditions,
+        )
+
+
+class HotelColumns:
+    """
+    Columnar store for bulk inventories: parallel arrays of id, destination_id, lat and lng.
+
+    Numbers live in typed arrays (8 bytes per value) instead of one Python object
+    per value. A missing destination_id is stored as MISSING_ID and a missing
+    coordinate as NaN; both read back as None.
+    """
+
+    MISSING_ID = -(2 ** 63)
+
+    __slots__ = ("ids", "destination_ids", "lats", "lngs")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.destination_ids = array("q")
+        self.lats = array("d")
+        self.lngs = array("d")
+
+    @classmethod
+    def from_hotels(cls, hotels) -> "HotelColumns":
+        columns = cls()
+        for hotel in hotels:
+            columns.append(hotel)
+        return columns
+
+    def append(self, hotel: Hotel):
+        location = hotel.location
+        lat = location.get("lat") if isinstance(location, dict) else location.lat
+        lng = location.get("lng") if isinstance(location, dict) else location.lng
+        self.ids.append(hotel.id)
+        self.destination_ids.append(self.MISSING_ID if hotel.destination_id is None else hotel.destination_id)
+        self.lats.append(float("nan") if lat is None else lat)
+        self.lngs.append(float("nan") if lng is None else lng)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, index: int) -> tuple:
+        """Return (id, destination_id, lat, lng) for one hotel, with None for missing values."""
+        destination_id = self.destination_ids[index]
+        lat, lng = self.lats[index], self.lngs[index]
+        return (
+            self.ids[index],
+            None if destination_id == self.MISSING_ID else destination_id,
+            None if lat != lat else lat,
+            None if lng != lng else lng,
+        )
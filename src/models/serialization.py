@@ -0,0 +1,105 @@
+import json
+from typing import Any, Iterable, List, TextIO
+from .hotel import Hotel
+
+OUTPUT_FORMATS = ("pretty", "compact", "ndjson")
+JSON_BACKENDS = ("json", "orjson")
+
+
+def _plain(value: Any) -> Any:
+    """Convert a nested model object (or dict) into plain dicts without copying its lists of strings."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value] if value and not isinstance(value[0], str) else value
+    return {name: _plain(getattr(value, name)) for name in value.__slots__}
+
+
+def hotel_to_dict(hotel: Hotel) -> dict:
+    """
+    Return the same structure as dataclasses.asdict(hotel), without its recursive deep copy.
+
+    The result shares the hotel's lists and strings, so it is meant for serializing, not for mutating.
+    """
+    return {
+        "id": hotel.id,
+        "destination_id": hotel.destination_id,
+        "name": hotel.name,
+        "description": hotel.description,
+        "location": _plain(hotel.location),
+        "amenities": _plain(hotel.amenities),
+        "images": _plain(hotel.images),
+        "booking_conditions": hotel.booking_conditions,
+    }
+
+
+class JsonEncoder:
+    """
+    Encodes with the json module, or with orjson when asked for.
+
+    orjson is faster but writes non-ASCII characters as they are, where json.dumps escapes
+    them, so it is opt-in. It is optional and only imported when selected.
+    """
+
+    def __init__(self, backend: str = "json"):
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend '{backend}', expected one of {JSON_BACKENDS}")
+        self.backend = backend
+        self._orjson = None
+        if backend == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                raise ValueError("The orjson backend is not installed")
+            self._orjson = orjson
+
+    def dumps(self, value: Any, indent: bool = False) -> str:
+        if self._orjson is not None:
+            return self._orjson.dumps(value, option=self._orjson.OPT_INDENT_2 if indent else 0).decode()
+        if indent:
+            return json.dumps(value, indent=2)
+        return json.dumps(value, separators=(",", ":"))
+
+
+def write_hotels(hotels: Iterable[Hotel], sinks: List[TextIO], output_format: str = "pretty",
+                 backend: str = "json") -> int:
+    """
+    Serialize hotels incrementally, writing each one to every sink as soon as it is encoded.
+
+    Args:
+    - hotels: The hotels to write; may be a generator.
+    - sinks: Text streams that all receive the same output (e.g. a file and stdout).
+    - output_format: "pretty" (laid out like json.dumps(..., indent=2) of the list; identical text
+      with the json backend), "compact" (a JSON array without whitespace) or "ndjson" (one compact
+      hotel per line).
+    - backend: JSON encoder to use: "json" or "orjson" (see JsonEncoder).
+
+    Returns:
+    - The number of hotels written.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+    encoder = JsonEncoder(backend)
+
+    def emit(text: str):
+        for sink in sinks:
+            sink.write(text)
+
+    count = 0
+    for hotel in hotels:
+        data = hotel_to_dict(hotel)
+        if output_format == "ndjson":
+            emit(encoder.dumps(data) + "\n")
+        elif output_format == "compact":
+            emit(("," if count else "[") + encoder.dumps(data))
+        else:
+            emit((",\n  " if count else "[\n  ") + encoder.dumps(data, indent=True).replace("\n", "\n  "))
+        count += 1
+
+    if output_format == "compact":
+        emit("]" if count else "[]")
+    elif output_format == "pretty":
+        emit("\n]" if count else "[]")
+    return count
@@ -0,0 +1,338 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+from .hotel import Amenities, Hotel, Image, ImageCategory, Location
+from .serialization import hotel_to_dict
+
+SNAPSHOT_MAGIC = b"HSNP"
+SNAPSHOT_VERSION = 1
+STRING_TABLES = ("amenities", "cities", "countries")  # Values stored once per snapshot and referenced by index
+IMAGE_CATEGORIES = ("rooms", "site", "amenities")
+
+# magic, version, reserved, hotel count, offset of the string tables, offset of the index
+_HEADER = struct.Struct("<4sHHQQQ")
+_U64 = struct.Struct("<Q")
+_PAIR = struct.Struct("<2Q")
+_DOUBLE = struct.Struct("<d")
+
+
+def write_snapshot(hotels: Iterable[Hotel], path: str) -> int:
+    """
+    Write hotels to a binary snapshot that Snapshot can open without reading it in full.
+
+    The file holds a header, every hotel's record in the order given, the string
+    tables, and an index: the offset of each record, the positions sorted by hotel
+    id, and the ids themselves. It is written next to `path` and moved into place,
+    so a process that has the previous snapshot mapped keeps a consistent view.
+
+    Args:
+    - hotels: The hotels to write; may be a generator. Every hotel needs a string id.
+    - path: File the snapshot is written to.
+
+    Returns:
+    - The number of hotels written.
+    """
+    tables: Dict[str, Dict[str, int]] = {name: {} for name in STRING_TABLES}
+    offsets = array("Q")
+    ids: List[bytes] = []
+    temporary = f"{path}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            position = _HEADER.size
+            for hotel in hotels:
+                data = hotel_to_dict(hotel)
+                if not isinstance(data["id"], str):
+                    raise ValueError(f"Snapshots need a string id for every hotel, got {data['id']!r}")
+                record = _encode(data, tables)
+                offsets.append(position)
+                ids.append(data["id"].encode())
+                f.write(record)
+                position += len(record)
+            offsets.append(position)
+
+            tables_offset = position
+            for name in STRING_TABLES:
+                position += _write_strings(f, list(tables[name]))
+            index_offset = position
+            order = array("Q", sorted(range(len(ids)), key=ids.__getitem__))
+            for values in (offsets, order):
+                _write_u64s(f, values)
+            _write_strings(f, ids, counted=False)
+
+            f.seek(0)
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(ids), tables_offset, index_offset))
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return len(ids)
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot written by write_snapshot, backed by mmap.
+
+    Opening reads only the header and the table offsets, so it takes the same time for any number of
+    hotels. A hotel is decoded when it is asked for: get() finds its id by binary
+    search over the sorted index, and iterating decodes the hotels in the order
+    they were written. Strings from the interned tables are decoded once.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            try:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # An empty file cannot be mapped
+                raise ValueError(f"{path} is not a hotel snapshot")
+        buffer = self._buffer
+        if len(buffer) < _HEADER.size or buffer[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a hotel snapshot")
+        _, version, _, count, tables_offset, index_offset = _HEADER.unpack_from(buffer, 0)
+        if version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})")
+        self._count = count
+        self._offsets = index_offset
+        self._order = self._offsets + _U64.size * (count + 1)
+        self._tables = {}
+        try:
+            self._ids = _Strings(buffer, self._order + _U64.size * count, count)
+            position = tables_offset
+            for name in STRING_TABLES:
+                table_count = _U64.unpack_from(buffer, position)[0]
+                self._tables[name] = _Strings(buffer, position + _U64.size, table_count, intern=True)
+                position = self._tables[name].end
+        except struct.error:
+            self._ids = None
+        if self._ids is None or self._ids.end > len(buffer):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, hotel_id: str) -> bool:
+        return self.find(hotel_id) is not None
+
+    def __getitem__(self, position: int) -> Hotel:
+        """Decode the hotel written at this position."""
+        if not 0 <= position < self._count:
+            raise IndexError("snapshot position out of range")
+        start, end = _PAIR.unpack_from(self._buffer, self._offsets + _U64.size * position)
+        return _decode(self._ids.get(position), self._buffer[start:end], self._tables)
+
+    def __iter__(self) -> Iterator[Hotel]:
+        for position in range(self._count):
+            yield self[position]
+
+    def find(self, hotel_id: str) -> Optional[int]:
+        """Position of the first hotel written with this id, or None."""
+        key = hotel_id.encode()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._ids.raw(self._sorted(middle)) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._ids.raw(self._sorted(low)) == key:
+            return self._sorted(low)
+        return None
+
+    def get(self, hotel_id: str) -> Optional[Hotel]:
+        position = self.find(hotel_id)
+        return None if position is None else self[position]
+
+    def select(self, hotel_ids: Optional[List[str]] = None) -> List[Hotel]:
+        """Decode the hotels with any of these ids (every hotel when none are given), in the order they were written."""
+        if not hotel_ids:
+            return list(self)
+        positions = sorted({position for position in map(self.find, hotel_ids) if position is not None})
+        return [self[position] for position in positions]
+
+    def close(self):
+        self._buffer.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _sorted(self, rank: int) -> int:
+        """Position of the hotel whose id is rank-th in sorted order."""
+        return _U64.unpack_from(self._buffer, self._order + _U64.size * rank)[0]
+
+
+class _Strings:
+    """A table of count+1 offsets followed by the UTF-8 strings they delimit, decoded on demand."""
+
+    def __init__(self, buffer, start: int, count: int, intern: bool = False):
+        self._buffer = buffer
+        self._offsets = start
+        self._data = start + _U64.size * (count + 1)
+        self._intern = intern
+        self._decoded: Dict[int, str] = {}
+        self.count = count
+        self.end = self._data + _U64.unpack_from(buffer, start + _U64.size * count)[0]
+
+    def raw(self, index: int) -> bytes:
+        start, end = _PAIR.unpack_from(self._buffer, self._offsets + _U64.size * index)
+        return self._buffer[self._data + start:self._data + end]
+
+    def get(self, index: int) -> str:
+        if not self._intern:
+            return self.raw(index).decode()
+        value = self._decoded.get(index)
+        if value is None:
+            value = self._decoded[index] = sys.intern(self.raw(index).decode())
+        return value
+
+
+# ===============================
+# Helper Methods
+# ===============================
+
+def _write_u64s(f, values: array):
+    if sys.byteorder != "little":
+        values = array("Q", values)
+        values.byteswap()
+    f.write(values.tobytes())
+
+
+def _write_strings(f, values: List, counted: bool = True) -> int:
+    """Write a string table (prefixed by its length unless `counted` is False); returns the bytes written."""
+    encoded = [value.encode() if isinstance(value, str) else value for value in values]
+    offsets = array("Q", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    size = 0
+    if counted:
+        size += f.write(_U64.pack(len(encoded)))
+    _write_u64s(f, offsets)
+    size += len(offsets) * _U64.size
+    for value in encoded:
+        size += f.write(value)
+    return size
+
+
+def _put_uint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _put_str(out: bytearray, value: Optional[str]):
+    """None is stored as 0 and a string as its UTF-8 length plus one, then its bytes."""
+    if value is None:
+        out.append(0)
+        return
+    encoded = value.encode()
+    _put_uint(out, len(encoded) + 1)
+    out += encoded
+
+
+def _put_interned(out: bytearray, value: Optional[str], table: Dict[str, int]):
+    _put_uint(out, 0 if value is None else table.setdefault(value, len(table)) + 1)
+
+
+def _encode(data: dict, tables: Dict[str, Dict[str, int]]) -> bytes:
+    """One hotel's record, without its id (the index holds it)."""
+    out = bytearray()
+    destination_id = data["destination_id"]
+    if destination_id is not None and type(destination_id) is not int:
+        raise ValueError(f"Snapshots need an integer destination_id, got {destination_id!r}")
+    # Zigzag so negative ids stay short, plus one so 0 means None
+    _put_uint(out, 0 if destination_id is None else (destination_id * 2 if destination_id >= 0
+                                                     else -destination_id * 2 - 1) + 1)
+    _put_str(out, data["name"])
+    _put_str(out, data["description"])
+
+    location = data["location"]
+    _put_str(out, location.get("address"))
+    _put_interned(out, location.get("city"), tables["cities"])
+    _put_interned(out, location.get("country"), tables["countries"])
+    lat, lng = location.get("lat"), location.get("lng")
+    out.append((lat is not None) | (lng is not None) << 1)
+    for value in (lat, lng):
+        if value is not None:
+            out += _DOUBLE.pack(value)
+    _put_str(out, location.get("postal_code"))
+
+    amenities = data["amenities"]
+    for kind in ("general", "room"):
+        values = amenities.get(kind)
+        _put_uint(out, 0 if values is None else len(values) + 1)
+        for value in values or ():
+            _put_interned(out, value, tables["amenities"])
+
+    images = data["images"]
+    for category in IMAGE_CATEGORIES:
+        values = images.get(category)
+        _put_uint(out, 0 if values is None else len(values) + 1)
+        for image in values or ():
+            _put_str(out, image["link"])
+            _put_str(out, image["description"])
+
+    conditions = data["booking_conditions"]
+    _put_uint(out, 0 if conditions is None else len(conditions) + 1)
+    for condition in conditions or ():
+        _put_str(out, condition)
+    return bytes(out)
+
+
+def _decode(hotel_id: str, record: bytes, tables: Dict[str, "_Strings"]) -> Hotel:
+    position = 0
+
+    def uint() -> int:
+        nonlocal position
+        result = shift = 0
+        while True:
+            byte = record[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def string() -> Optional[str]:
+        nonlocal position
+        length = uint()
+        if not length:
+            return None
+        start = position
+        position += length - 1
+        return record[start:position].decode()
+
+    def interned(table: str) -> Optional[str]:
+        index = uint()
+        return tables[table].get(index - 1) if index else None
+
+    def counted(read) -> Optional[list]:
+        count = uint()
+        return None if not count else [read() for _ in range(count - 1)]
+
+    def double() -> float:
+        nonlocal position
+        position += _DOUBLE.size
+        return _DOUBLE.unpack_from(record, position - _DOUBLE.size)[0]
+
+    zigzag = uint() - 1
+    destination_id = None if zigzag < 0 else -((zigzag + 1) >> 1) if zigzag & 1 else zigzag >> 1
+    name, description = string(), string()
+    address, city, country = string(), interned("cities"), interned("countries")
+    present = record[position]
+    position += 1
+    lat = double() if present & 1 else None
+    lng = double() if present & 2 else None
+    location = Location(address, city, country, lat, lng, string())
+    amenities = Amenities(counted(lambda: interned("amenities")), counted(lambda: interned("amenities")))
+    images = ImageCategory(*(counted(lambda: Image(string(), string())) for _ in IMAGE_CATEGORIES))
+    return Hotel(hotel_id, destination_id, name, description, location, amenities, images, counted(string))
@@ -0,0 +1,252 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from ..data_integration.hotel_index import HotelIndex
+from ..data_integration.supplier_manager import SupplierManager
+from ..models.serialization import hotel_to_dict
+
+
+class LatencyTracker:
+    """Keeps the most recent request latencies and reports percentiles over them."""
+
+    def __init__(self, window: int = 10000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentiles(self) -> dict:
+        """Return the sample count and p50/p99 latency in milliseconds (nearest-rank)."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "p50_ms": None, "p99_ms": None}
+
+        def rank(p: float) -> float:
+            return round(samples[max(0, math.ceil(p * len(samples)) - 1)] * 1000, 3)
+
+        return {"count": len(samples), "p50_ms": rank(0.50), "p99_ms": rank(0.99)}
+
+
+class InventoryService:
+    """
+    Keeps the merged inventory and its index in memory and refreshes them in the background.
+
+    A refresh builds a new inventory and index off to the side and then swaps
+    them in at once, so queries never see a half-built inventory. If a refresh
+    fails, the previous inventory keeps being served and the error is reported.
+    A refresh that dropped some suppliers (thread and async fetch modes)
+    swaps in what the others returned and reports the dropped ones.
+    """
+
+    def __init__(self, manager: SupplierManager, refresh_interval: Optional[float] = 300):
+        """
+        Args:
+        - manager: Fetches and merges the suppliers.
+        - refresh_interval: Seconds between background refreshes (None disables them).
+        """
+        self.manager = manager
+        self.refresh_interval = refresh_interval
+        self.index = HotelIndex([])
+        self.last_refresh: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.supplier_errors: Dict[str, str] = {}
+        self.latency = LatencyTracker()
+        self._refresh_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self):
+        """Fetch and merge all suppliers, then swap in the new inventory."""
+        with self._refresh_lock:
+            try:
+                merged = self.manager.fetch_and_merge_data()
+            except Exception as error:
+                self.last_error = _describe(error)
+                return
+            self.index = self.manager.index if self.manager.index is not None else HotelIndex(merged)
+            self.last_refresh = time.time()
+            self.supplier_errors = {key: _describe(error) for key, error in self.manager.errors.items()}
+            self.last_error = None
+            if self.supplier_errors:
+                self.last_error = f"Refreshed without suppliers: {', '.join(self.supplier_errors)}"
+
+    def start(self):
+        """Load the inventory once, then keep refreshing it on a daemon thread."""
+        self.refresh()
+        if self.refresh_interval:
+            self._thread = threading.Thread(target=self._refresh_loop, name="inventory-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _refresh_loop(self):
+        while not self._stopped.wait(self.refresh_interval):
+            self.refresh()
+
+    def query(self, hotel_ids: List[str], destination_ids: List[str], amenities: List[str],
+              name_prefix: Optional[str], page: int, page_size: int,
+              near: Optional[Tuple[float, float, float]] = None) -> dict:
+        """Return one page of matching hotels together with the total number of matches."""
+        index = self.index  # A refresh may swap the index; use one snapshot for the whole query
+        hotels = index.query(hotel_ids, destination_ids, amenities, name_prefix, near)
+        start = (page - 1) * page_size
+        return {
+            "total": len(hotels),
+            "page": page,
+            "page_size": page_size,
+            "hotels": [hotel_to_dict(hotel) for hotel in hotels[start:start + page_size]],
+        }
+
+    def nearest(self, lat: float, lng: float, k: int) -> dict:
+        """Return the k hotels nearest to a point, nearest first, each with its distance in km."""
+        return {"hotels": [{**hotel_to_dict(hotel), "distance_km": round(distance, 3)}
+                           for hotel, distance in self.index.nearest(lat, lng, k)]}
+
+    def stats(self) -> dict:
+        stats = {
+            "hotels": len(self.index),
+            "last_refresh": self.last_refresh,
+            "last_error": self.last_error,
+            "supplier_errors": self.supplier_errors,
+            "latency": self.latency.percentiles(),
+        }
+        record_store = getattr(self.manager, "record_store", None)
+        if record_store is not None:
+            stats["records"] = record_store.stats()
+        return stats
+
+
+class HotelRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /hotels?hotel_ids=a,b&destination_ids=1&amenities=wifi&name_prefix=beach&page=1&page_size=50
+    GET /hotels?lat=1.28&lng=103.85&radius_km=5  (combinable with the filters above)
+    GET /hotels/nearest?lat=1.28&lng=103.85&k=10
+    GET /stats
+    """
+
+    service: InventoryService = None  # Set by make_server
+    max_page_size = 500
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            try:
+                status, body = self._route(url.path, params)
+            except ValueError as error:
+                status, body = 400, {"error": str(error)}
+            except Exception as error:
+                # Answer with the error rather than dropping the connection without a response
+                status, body = 500, {"error": _describe(error)}
+            self._send_json(status, body)
+        finally:
+            # Failed and aborted queries count towards the latency too
+            if url.path.startswith("/hotels"):
+                self.service.latency.record(time.perf_counter() - start)
+
+    def _route(self, path: str, params: dict) -> Tuple[int, dict]:
+        """Answer a GET request; invalid parameters raise ValueError."""
+        if path == "/hotels":
+            return 200, self.service.query(
+                self._list_param(params, "hotel_ids"),
+                self._list_param(params, "destination_ids"),
+                self._list_param(params, "amenities"),
+                params.get("name_prefix") or None,
+                self._int_param(params, "page", 1, 1, None),
+                self._int_param(params, "page_size", 50, 1, self.max_page_size),
+                self._near_param(params),
+            )
+        if path == "/hotels/nearest":
+            return 200, self.service.nearest(
+                self._float_param(params, "lat", -90, 90),
+                self._float_param(params, "lng", -180, 180),
+                self._int_param(params, "k", 10, 1, self.max_page_size),
+            )
+        if path == "/stats":
+            return 200, self.service.stats()
+        return 404, {"error": f"Unknown path {path}"}
+
+    @staticmethod
+    def _list_param(params: dict, name: str) -> List[str]:
+        value = params.get(name, "")
+        return [item for item in value.split(",") if item] if value and value != "none" else []
+
+    @staticmethod
+    def _int_param(params: dict, name: str, default: int, minimum: int, maximum: Optional[int]) -> int:
+        try:
+            value = int(params.get(name, default))
+        except ValueError:
+            raise ValueError(f"{name} must be an integer")
+        if value < minimum or (maximum is not None and value > maximum):
+            raise ValueError(f"{name} must be between {minimum} and {maximum or 'unbounded'}")
+        return value
+
+    @staticmethod
+    def _float_param(params: dict, name: str, minimum: float, maximum: float) -> float:
+        try:
+            value = float(params[name])
+        except KeyError:
+            raise ValueError(f"{name} is required")
+        except ValueError:
+            raise ValueError(f"{name} must be a number")
+        if not minimum <= value <= maximum:
+            raise ValueError(f"{name} must be between {minimum} and {maximum}")
+        return value
+
+    @classmethod
+    def _near_param(cls, params: dict) -> Optional[Tuple[float, float, float]]:
+        """(lat, lng, radius_km) when any of them is given, else None."""
+        if not any(name in params for name in ("lat", "lng", "radius_km")):
+            return None
+        return (cls._float_param(params, "lat", -90, 90), cls._float_param(params, "lng", -180, 180),
+                cls._float_param(params, "radius_km", 0, math.inf))
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _describe(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def make_server(service: InventoryService, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """Create (but do not start) an HTTP server answering queries from the service's inventory."""
+    handler = type("BoundHotelRequestHandler", (HotelRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(manager: SupplierManager, host: str = "127.0.0.1", port: int = 8000, refresh_interval: float = 300):
+    """Load the inventory, then serve queries until interrupted."""
+    service = InventoryService(manager, refresh_interval)
+    service.start()
+    server = make_server(service, host, port)
+    print(f"Serving {len(service.index)} hotels on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
@@ -0,0 +1,210 @@
+"""Hotels, raw supplier records, reference implementations and a stub HTTP server shared by the tests and benchmarks."""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from config.config import AMENITIES_CONFIG, SUPPLIER_CONFIG
+from src.data_integration.base_supplier import BaseSupplier
+from src.models.hotel import Hotel
+
+CITIES = ["Singapore", "Tokyo", "Kyoto", "Paris", "Lisbon", "Bangkok"]
+COUNTRIES = ["SG", "JP", "JP", "FR", "PT", "TH"]
+EXTRA_AMENITIES = ["Aircon", "BusinessCenter", "DryCleaning", "WiFi", "Bar", "Sauna", "Gym"]
+
+# A route answers a request with (status, body, headers)
+Route = Callable[[BaseHTTPRequestHandler], Tuple[int, bytes, Dict[str, str]]]
+
+
+def make_hotel(hotel_id: str = "h1", destination_id: Optional[int] = 1, name: Optional[str] = None,
+               description: Optional[str] = "", general=(), room=(), rooms=(), booking_conditions=(),
+               **location) -> Hotel:
+    """
+    A hotel built through Hotel.from_dict.
+
+    Args:
+    - rooms: (link, description) pairs of the room images.
+    - booking_conditions: The conditions, or None.
+    - location: Location fields, e.g. lat=1.3, city="Singapore".
+    """
+    return Hotel.from_dict({
+        "id": hotel_id, "destination_id": destination_id, "name": name, "description": description,
+        "location": location, "amenities": {"general": list(general), "room": list(room)},
+        "images": {"rooms": [{"link": link, "description": text} for link, text in rooms]},
+        "booking_conditions": None if booking_conditions is None else list(booking_conditions),
+    })
+
+
+def supplier_records(supplier_key: str, count: int, seed: int = 0, start: int = 0, step: int = 1) -> List[dict]:
+    """
+    Generate raw records shaped like the given supplier's payload.
+
+    Args:
+    - supplier_key: Supplier whose "fields" mapping in suppliers_config.json shapes the records.
+    - count: Number of records to generate.
+    - seed: Random seed, so runs are reproducible.
+    - start: Index of the first hotel; records with the same index share a hotel id across suppliers.
+    - step: Distance between the indexes of consecutive records.
+
+    Returns:
+    - A list of raw records, as the supplier's endpoint would return them.
+    """
+    rng = random.Random(f"{supplier_key}:{seed}:{start}")
+    fields = SUPPLIER_CONFIG[supplier_key]["fields"]
+    return [_record(fields, index, rng) for index in range(start, start + count * step, step)]
+
+
+def _set_path(record: dict, path: str, value):
+    keys = path.split(".")
+    for key in keys[:-1]:
+        record = record.setdefault(key, {})
+    record[keys[-1]] = value
+
+
+def _field_value(field: str, rules: dict, index: int, rng: random.Random):
+    """Produce a plausible raw value for one target field of hotel number `index`."""
+    city = index % len(CITIES)
+    if field == "id":
+        return f"h{index:07d}"
+    if field == "destination_id":
+        # Some suppliers send numbers as strings, which exercises type conversion
+        destination = 1000 + index % 500
+        return str(destination) if rng.random() < 0.3 else destination
+    if field == "name":
+        return f"Hotel {index} {CITIES[city]}"
+    if field == "description":
+        return f"A pleasant stay in {CITIES[city]}, hotel number {index}. " * rng.randint(1, 3)
+    if field in ("location.lat", "location.lng"):
+        return None if rng.random() < 0.05 else round(rng.uniform(-90, 90), 6)
+    if field == "location.address":
+        return f"{index} Main Street"
+    if field == "location.city":
+        return CITIES[city]
+    if field == "location.country":
+        return COUNTRIES[city]
+    if field.startswith("amenities."):
+        pool = AMENITIES_CONFIG["general"] + AMENITIES_CONFIG["room"] + EXTRA_AMENITIES
+        return [rng.choice([name, name.title(), " " + name + " "]) for name in rng.sample(pool, rng.randint(2, 8))]
+    if field.startswith("images.") and "fields" in rules:
+        link_key, description_key = rules["fields"]["link"], rules["fields"]["description"]
+        return [{link_key: f"https://img.example.com/{index}/{field}/{n}.jpg", description_key: f"View {n}"}
+                for n in range(rng.randint(0, 4))]
+    if field == "booking_conditions":
+        return [f"Condition {n}" for n in range(rng.randint(0, 3))]
+    return None
+
+
+def _record(fields: dict, index: int, rng: random.Random) -> dict:
+    """Build the raw record of hotel number `index` for a supplier with the given field mapping."""
+    record = {}
+    for field, rules in fields.items():
+        if rules["source"]:
+            value = _field_value(field, rules, index, rng)
+            if value is not None:
+                _set_path(record, rules["source"], value)
+    return record
+
+
+def group_nested_fields(flat_data: dict, sep: str = ".") -> dict:
+    """
+    Convert flattened keys into nested dictionaries, as parsing did before ParsePlan.
+
+    Args:
+    - flat_data: A dictionary with flattened keys (e.g., "location.lat").
+    - sep: The separator used in flattened keys (default is ".").
+
+    Returns:
+    - A nested dictionary.
+    """
+    nested_data = {}
+    for key, value in flat_data.items():
+        keys = key.split(sep)
+        d = nested_data
+        for part in keys[:-1]:
+            d = d.setdefault(part, {})
+        d[keys[-1]] = value
+    return nested_data
+
+
+def json_route(payload, status: int = 200, delay: float = 0.0) -> Route:
+    """A route answering with a JSON payload after `delay` seconds."""
+    body = json.dumps(payload).encode()
+
+    def route(handler):
+        time.sleep(delay)
+        return status, body, {"Content-Type": "application/json"}
+
+    return route
+
+
+class StubServer:
+    """
+    Serves routes on 127.0.0.1 with keep-alive, standing in for supplier endpoints.
+
+    Every request is recorded in `requests` as (path, headers, client port).
+    """
+
+    def __init__(self, routes: Dict[str, Route]):
+        self.routes = routes
+        self.requests: List[Tuple[str, dict, int]] = []
+        self._server = None
+
+    def start(self) -> "StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, as real suppliers do
+
+            def do_GET(self):
+                stub.requests.append((self.path, dict(self.headers), self.client_address[1]))
+                route = stub.routes.get(self.path)
+                status, body, headers = route(self) if route else (404, b"", {})
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client gave up, e.g. after its timeout
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}{path}"
+
+    def supplier(self, supplier_key: str, path: str, payload_format: Optional[str] = None,
+                 base: Type[BaseSupplier] = BaseSupplier, **kwargs) -> BaseSupplier:
+        """
+        A supplier with this key (and so its field mapping) whose endpoint is the given path.
+
+        Args:
+        - payload_format: Overrides the format of `base` ("json" for BaseSupplier) when given.
+        - base: Supplier class to derive from, e.g. AcmeSupplier.
+        - kwargs: Passed to the supplier's constructor.
+        """
+        url = self.url(path)
+        attributes = {"supplier_key": supplier_key, "endpoint": lambda self: url}
+        if payload_format is not None:
+            attributes["payload_format"] = lambda self: payload_format
+        return type(f"Stub{base.__name__}", (base,), attributes)(**kwargs)
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -1,3 +1,6 @@
+import io
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from main import main
@@ -21,12 +24,12 @@ class TestMainApplication(unittest.TestCase):
         # Mock fetch_and_merge_data to return specific test data
         mock_fetch_and_merge_data.return_value = [self.hotel1, self.hotel2]
 
-        with patch('builtins.print') as mocked_print:
+        with patch('sys.stdout', new_callable=io.StringIO) as mocked_stdout:
             main()
             # Prepare expected output
             expected_hotels = [self.hotel1]
             expected_output = json.dumps([asdict(hotel) for hotel in expected_hotels], indent=2)
-            mocked_print.assert_called_once_with(expected_output)
+            self.assertEqual(mocked_stdout.getvalue(), expected_output + "\n")
 
     @patch('src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data')
     @patch('sys.argv', ['main', 'none', '5432'])
@@ -34,12 +37,12 @@ class TestMainApplication(unittest.TestCase):
         # Mock fetch_and_merge_data to return specific test data
         mock_fetch_and_merge_data.return_value = [self.hotel1, self.hotel2]
 
-        with patch('builtins.print') as mocked_print:
+        with patch('sys.stdout', new_callable=io.StringIO) as mocked_stdout:
             main()
             # Prepare expected output
             expected_hotels = [self.hotel1, self.hotel2]
             expected_output = json.dumps([asdict(hotel) for hotel in expected_hotels], indent=2)
-            mocked_print.assert_called_once_with(expected_output)
+            self.assertEqual(mocked_stdout.getvalue(), expected_output + "\n")
 
     @patch('src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data')
     @patch('sys.argv', ['main', 'none', 'none'])
@@ -47,12 +50,91 @@ class TestMainApplication(unittest.TestCase):
         # Mock fetch_and_merge_data to return specific test data
         mock_fetch_and_merge_data.return_value = [self.hotel1, self.hotel2]
 
-        with patch('builtins.print') as mocked_print:
+        with patch('sys.stdout', new_callable=io.StringIO) as mocked_stdout:
             main()
             # Prepare expected output
             expected_hotels = [self.hotel1, self.hotel2]
             expected_output = json.dumps([asdict(hotel) for hotel in expected_hotels], indent=2)
-            mocked_print.assert_called_once_with(expected_output)
+            self.assertEqual(mocked_stdout.getvalue(), expected_output + "\n")
+
+    @patch('src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data')
+    def test_output_formats(self, mock_fetch_and_merge_data):
+        mock_fetch_and_merge_data.return_value = [self.hotel1, self.hotel2]
+        expected_hotels = [asdict(self.hotel1), asdict(self.hotel2)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = os.path.join(directory, "output.json")
+            for output_format in ("pretty", "compact", "ndjson"):
+                with self.subTest(output_format=output_format), \
+                        patch('sys.argv', ['main', 'none', 'none', '--format', output_format, '--output', output_path]), \
+                        patch('sys.stdout', new_callable=io.StringIO) as mocked_stdout:
+                    main()
+                    with open(output_path) as f:
+                        written = f.read()
+                    self.assertEqual(mocked_stdout.getvalue().rstrip("\n"), written.rstrip("\n"))
+                    if output_format == "ndjson":
+                        self.assertEqual([json.loads(line) for line in written.splitlines()], expected_hotels)
+                    else:
+                        self.assertEqual(json.loads(written), expected_hotels)
+
+    @patch('src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data')
+    @patch('sys.argv', ['main', 'none', 'none', '--reuse-records'])
+    def test_reuse_records_requires_serve(self, mock_fetch_and_merge_data):
+        with patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr, self.assertRaises(SystemExit):
+            main()
+        self.assertIn("--reuse-records only applies with --serve", mocked_stderr.getvalue())
+        mock_fetch_and_merge_data.assert_not_called()
+
+    @patch('src.service.hotel_server.serve')
+    def test_serve_rejects_one_shot_options(self, mock_serve):
+        for options in (("--stream",), ("--parse-workers", "2"), ("--snapshot", "hotels.snap"),
+                        ("--from-snapshot", "hotels.snap")):
+            with self.subTest(options=options), patch('sys.argv', ['main', '--serve', *options]), \
+                    patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr, self.assertRaises(SystemExit):
+                main()
+            self.assertIn(f"{options[0]} cannot be combined with --serve", mocked_stderr.getvalue())
+        mock_serve.assert_not_called()
+
+    @patch('src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data')
+    @patch('sys.argv', ['main', 'none', 'none', '--stream', '--fetch-mode', 'thread'])
+    def test_stream_requires_sequential_fetch_mode(self, mock_fetch_and_merge_data):
+        with patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr, self.assertRaises(SystemExit):
+            main()
+        self.assertIn("--stream only supports --fetch-mode sequential", mocked_stderr.getvalue())
+        mock_fetch_and_merge_data.assert_not_called()
+
+    @patch('src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data')
+    def test_parse_workers_rejects_incompatible_options(self, mock_fetch_and_merge_data):
+        parse_workers = "--parse-workers cannot be combined with --stream or --cache"
+        match_duplicates = "--match-duplicates cannot be combined with --stream or --parse-workers"
+        cases = {
+            ("--parse-workers", "2", "--stream"): parse_workers,
+            ("--parse-workers", "2", "--cache", "hotels.db"): parse_workers,
+            ("--match-duplicates", "--stream"): match_duplicates,
+            ("--match-duplicates", "--parse-workers", "2"): match_duplicates,
+        }
+        for options, message in cases.items():
+            with self.subTest(options=options), patch('sys.argv', ['main', 'none', 'none', *options]), \
+                    patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr, self.assertRaises(SystemExit):
+                main()
+            self.assertIn(message, mocked_stderr.getvalue())
+        mock_fetch_and_merge_data.assert_not_called()
+
+    @patch('src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data')
+    def test_near_rejects_out_of_range_values(self, mock_fetch_and_merge_data):
+        cases = {
+            "1.3,103.8": "expected LAT,LNG,KM",
+            "91,103.8,5": "LAT must be between -90 and 90",
+            "1.3,-180.5,5": "LNG must be between -180 and 180",
+            "1.3,103.8,-1": "KM must not be negative",
+            "nan,103.8,5": "LAT must be between -90 and 90",
+        }
+        for near, message in cases.items():
+            with self.subTest(near=near), patch('sys.argv', ['main', 'none', 'none', f'--near={near}']), \
+                    patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr, self.assertRaises(SystemExit):
+                main()
+            self.assertIn(message, mocked_stderr.getvalue())
+        mock_fetch_and_merge_data.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+from src.data_integration.base_supplier import BaseSupplier
+from src.data_integration.cache import HotelCache
+from src.data_integration.supplier_manager import SupplierManager
+from src.models.hotel import Hotel
+
+RECORDS = {
+    "acme": [{"Id": "h1", "DestinationId": 1, "Name": "Alpha", "Facilities": ["Pool"]}],
+    "patagonia": [{"id": "h1", "destination": 1, "name": "Alpha Hotel", "amenities": ["tv"],
+                   "images": {"rooms": [{"url": "a.jpg", "description": "Room"}]}},
+                  {"id": "h2", "destination": 2, "name": "Beta"}],
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_supplier(key):
+    class StubSupplier(BaseSupplier):
+        supplier_key = key
+        fetches = 0
+
+        def endpoint(self):
+            return f"http://stub/{key}"
+
+        def fetch(self, timeout=None):
+            type(self).fetches += 1
+            return [self.parse(dto) for dto in RECORDS[key]]
+
+    return StubSupplier()
+
+
+class TestHotelCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = HotelCache(":memory:", ttl=60, clock=self.clock)
+        self.suppliers = [make_supplier("acme"), make_supplier("patagonia")]
+
+    def tearDown(self):
+        self.cache.close()
+
+    def manager(self):
+        return SupplierManager(self.suppliers, cache=self.cache)
+
+    def fetch_counts(self):
+        return [type(supplier).fetches for supplier in self.suppliers]
+
+    def test_supplier_round_trip(self):
+        hotels = self.suppliers[1].fetch()
+        self.cache.put_supplier("patagonia", "fp", hotels)
+        self.assertEqual(self.cache.get_supplier("patagonia", "fp"), hotels)
+        self.assertIsNone(self.cache.get_supplier("patagonia", "other"))
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get_supplier("patagonia", "fp"))
+
+    def test_repeat_run_is_served_from_cache(self):
+        first = self.manager().fetch_and_merge_data()
+        with patch.object(SupplierManager, "_fetch", side_effect=AssertionError("fetched")), \
+                patch.object(SupplierManager, "_fetch_with_cache", side_effect=AssertionError("re-merged")):
+            second = self.manager().fetch_and_merge_data()
+        self.assertEqual(first, second)
+        self.assertEqual(self.fetch_counts(), [1, 1])
+        self.assertIsInstance(second[0], Hotel)
+
+    def test_config_change_invalidates_only_that_supplier(self):
+        expected = self.manager().fetch_and_merge_data()
+        original = BaseSupplier.fingerprint
+
+        def fingerprint(supplier):
+            return "changed" if supplier.supplier_key == "acme" else original(supplier)
+
+        with patch.object(BaseSupplier, "fingerprint", fingerprint):
+            merged = self.manager().fetch_and_merge_data()
+        self.assertEqual(merged, expected)
+        self.assertEqual(self.fetch_counts(), [2, 1])
+
+    def test_ttl_expiry_refetches(self):
+        self.manager().fetch_and_merge_data()
+        self.clock.now += 61
+        self.manager().fetch_and_merge_data()
+        self.assertEqual(self.fetch_counts(), [2, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
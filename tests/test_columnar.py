@@ -0,0 +1,118 @@
+import contextlib
+import copy
+import random
+import unittest
+from dataclasses import asdict
+from unittest.mock import patch
+from src.data_integration import columnar
+from src.data_integration.columnar import convert_column, resolve
+from src.data_integration.data_merger import DataMerger
+from src.data_integration.lazy_numpy import load_numpy
+from src.data_integration.parser import Parser
+from tests.helpers import make_hotel
+
+
+class Name(str):
+    pass
+
+
+RAW_VALUES = [None, 7, True, 3.9, -3.9, 1e20, float("nan"), 2 ** 70, "12", " 8 ", "1_000", "4.5", "x", "", [1], {}]
+MERGE_VALUES = [None, None, "", "a", "bb", "cc", Name("ddd"), 0, 3, 3.0, 7.5, True, float("nan"), ["x"], ("y",)]
+
+
+def numpy_and_python():
+    """Contexts running the code under test with NumPy (when installed) and with the pure-Python path."""
+    paths = [contextlib.nullcontext()] if load_numpy(columnar.__name__) is not None else []
+    return paths + [patch.object(columnar, "np", None)]
+
+
+class TestConvertColumn(unittest.TestCase):
+    def test_matches_transform_value(self):
+        for value_type in ("integer", "float", "string"):
+            expected = [None if v is None else Parser._transform_value(v, value_type) for v in RAW_VALUES]
+            for path in numpy_and_python():
+                with path:
+                    converted, invalid = convert_column(RAW_VALUES, value_type)
+                self.assertEqual(list(map(repr, converted)), list(map(repr, expected)), value_type)
+                self.assertEqual([type(v) for v in converted], [type(v) for v in expected], value_type)
+                self.assertEqual(invalid, [v is not None and c is None for v, c in zip(RAW_VALUES, converted)])
+
+    def test_masks_values_the_per_record_path_raises_on(self):
+        values = [1.5, float("inf"), float("-inf"), 10 ** 400, None]
+        for path in numpy_and_python():
+            with path:
+                self.assertEqual(convert_column(values, "integer"), ([1, None, None, 10 ** 400, None],
+                                                                     [False, True, True, False, False]))
+                self.assertEqual(convert_column(values[3:], "float"), ([None, None], [True, False]))
+
+    def test_returns_values_already_of_the_type(self):
+        values = [1.5, None, 2.0]
+        converted, invalid = convert_column(values, "float")
+        self.assertIs(converted, values)
+        self.assertEqual(invalid, [False] * 3)
+
+
+class TestResolve(unittest.TestCase):
+    def fold(self, strategy, values):
+        merge = getattr(DataMerger(), strategy)
+        merged = values[0]
+        for value in values[1:]:
+            merged = merge(merged, value)
+        return merged
+
+    def test_matches_pairwise_fold(self):
+        rng = random.Random(7)
+        sizes = [rng.randint(1, 5) for _ in range(400)]
+        values = [rng.choice(MERGE_VALUES) for _ in range(sum(sizes))]
+        for strategy in ("first_non_null", "choose_best"):
+            for path in numpy_and_python():
+                with path:
+                    changes = dict(resolve(strategy, values, sizes))
+                start = 0
+                for group, size in enumerate(sizes):
+                    chosen = values[changes.get(group, start)]
+                    # Same object, so NaN and 3 vs 3.0 are told apart
+                    self.assertIs(chosen, self.fold(strategy, values[start:start + size]), (strategy, group))
+                    self.assertNotEqual(changes.get(group), start)
+                    start += size
+
+    def test_rejects_other_strategies(self):
+        self.assertEqual(resolve("choose_best", [], []), [])
+        with self.assertRaises(ValueError):
+            resolve("merge_list", ["a"], [1])
+
+
+class TestMergeColumns(unittest.TestCase):
+    def records(self):
+        rng = random.Random(3)
+        hotels = []
+        for n in range(300):
+            name = rng.choice([None, "Inn", "Grand Inn", "The Inn"])
+            lat = rng.choice([None, 1.5, 2.25])
+            city = rng.choice([None, "Paris", "Rome"])
+            hotels.append(make_hotel(f"h{rng.randint(0, 80)}", n % 5, name, general=[name or "wifi"], lat=lat, city=city))
+        return hotels
+
+    def test_matches_merge_groups(self):
+        merger = DataMerger()
+        records = self.records()
+        expected = [asdict(h) for h in merger.merge_groups(copy.deepcopy(records))]
+        for path in numpy_and_python():
+            with path:
+                merged = merger.merge_columns(copy.deepcopy(records))
+            self.assertEqual([asdict(h) for h in merged], expected)
+        self.assertEqual(merger.merge_columns([]), [])
+
+    def test_overridden_strategy_is_folded(self):
+        class ShortestName(DataMerger):
+            def choose_best(self, val1, val2, *args, **kwargs):
+                return val2 if val1 is None or (val2 is not None and len(val2) < len(val1)) else val1
+
+        merger = ShortestName()
+        self.assertIsNone(merger._column_strategy(merger.steps[2]))
+        merged = merger.merge_columns([make_hotel(name="Grand Inn"), make_hotel(name="Inn"), make_hotel(name=None)])
+        self.assertEqual(merged[0].name, "Inn")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import config.config as config_module
+from config.config import ConfigError, ConfigRegistry, registry
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.base_supplier import BaseSupplier, configured_suppliers, supplier_class
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestConfigRegistry(unittest.TestCase):
+    def write(self, directory, name, data):
+        with open(os.path.join(directory, name), "w") as f:
+            json.dump(data, f)
+
+    def test_loads_lazily_and_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.write(directory, "merge_strategy.json", {"fields": {"name": {"strategy": "choose_best"}}})
+            fresh = ConfigRegistry(directory)
+            self.assertEqual(fresh._loaded, {})
+            self.assertIs(fresh.merge_strategy, fresh.merge_strategy)
+            self.assertEqual(list(fresh._loaded), ["merge_strategy"])
+
+    def test_rejects_invalid_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.write(directory, "suppliers_config.json", {"acme": {"endpoint": "http://x", "fields": {}}})
+            self.write(directory, "amenities_config.json", {"general": []})
+            with self.assertRaisesRegex(ConfigError, "suppliers_config.json: supplier 'acme' needs fields with an id"):
+                ConfigRegistry(directory).suppliers
+            with self.assertRaisesRegex(ConfigError, "'room' must be a list"):
+                ConfigRegistry(directory).amenities
+
+    def test_module_names_and_working_directory(self):
+        self.assertIs(config_module.SUPPLIER_CONFIG, registry.suppliers)
+        self.assertEqual(config_module.ROOM_AMENITIES, registry.amenities["room"])
+        self.assertEqual(registry.directory, os.path.join(ROOT, "config"))
+
+    def test_supplier_discovery(self):
+        self.assertIs(supplier_class("acme"), AcmeSupplier)
+        self.assertEqual([s.supplier_key for s in configured_suppliers()], list(registry.suppliers))
+        # A supplier with no "class" entry is described by its config alone
+        registry.suppliers["ad_hoc"] = {"endpoint": "http://x", "fields": registry.suppliers["acme"]["fields"]}
+        try:
+            cls = supplier_class("ad_hoc")
+            self.assertTrue(issubclass(cls, BaseSupplier))
+            self.assertEqual(cls().parse({"Id": 5, "Name": "Inn"}).id, "5")
+        finally:
+            del registry.suppliers["ad_hoc"]
+
+    def test_import_skips_heavy_modules(self):
+        # A fresh interpreter started outside the repo, so the working directory cannot help
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); import main; "
+                "print([m for m in ('requests', 'asyncio', 'sqlite3', 'numpy') if m in sys.modules])")
+        output = subprocess.run([sys.executable, "-c", code, ROOT], cwd=tempfile.gettempdir(),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import contextlib
+import random
+import unittest
+from unittest.mock import patch
+from src.data_integration import duplicates
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.duplicates import DuplicateMatcher, MatchOptions
+from src.data_integration.lazy_numpy import load_numpy
+from src.data_integration.supplier_manager import SupplierManager
+from tests.helpers import make_hotel
+
+
+class TestDuplicateMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = DuplicateMatcher(MatchOptions())
+
+    def test_normalize(self):
+        self.assertEqual(self.matcher.normalize("The Hôtel  Café-Bar & Inn"), "cafe bar inn")
+        self.assertEqual(self.matcher.normalize("東京ホテル"), "東京ホテル")
+        self.assertEqual(self.matcher.shingles(None), set())
+        self.assertEqual(len(self.matcher.shingles("Hotel Ab")), 1)  # Shorter than a shingle
+
+    def test_links_respelled_names_nearby(self):
+        hotels = [make_hotel("a", name="Grand Hyatt Singapore", lat=1.3, lng=103.8),
+                  make_hotel("b", name="The GRAND HYATT, Singapore", lat=1.3004, lng=103.8003),
+                  make_hotel("c", name="Grand Hyatt Singapore"),  # No coordinates
+                  make_hotel("d", 2, name="Grand Hyatt Singapore", lat=1.3, lng=103.8),
+                  make_hotel("e", name="Ibis Budget", lat=1.3, lng=103.8),
+                  make_hotel("f", name="Grand Hyatt Singapore", lat=1.36, lng=103.8),  # ~6.7 km away
+                  make_hotel("a", name="Grand Hyatt", lat=1.3, lng=103.8)]
+        self.assertEqual(self.matcher.match(hotels), {"b": "a", "c": "a"})
+
+    def test_unlocated_records_do_not_chain_distant_hotels(self):
+        hotels = [make_hotel("far", name="Marina Bay Sands", lat=1.4, lng=103.8),
+                  make_hotel("x", name="Marina Bay Sands"),
+                  make_hotel("near", name="Marina Bay Sands", lat=1.28, lng=103.86)]
+        self.assertEqual(self.matcher.match(hotels), {"x": "far"})
+
+    def test_sibling_hotels_are_not_linked(self):
+        for first, second in (("Ibis Budget Singapore Pearl", "Ibis Budget Singapore Ruby"),
+                              ("Grand Hyatt Tower 1", "Grand Hyatt Tower 2")):
+            for points in (({}, {}), ({"lat": 1.3, "lng": 103.8}, {}),
+                           ({"lat": 1.3, "lng": 103.8}, {"lat": 1.30013, "lng": 103.8})):  # 15 m apart
+                with self.subTest(first=first, points=points):
+                    hotels = [make_hotel("a", name=first, **points[0]), make_hotel("b", name=second, **points[1])]
+                    self.assertEqual(self.matcher.match(hotels), {})
+
+    def test_respellings_are_linked(self):
+        for first, second in (("Kalomira Vensol Resort", "Kalomira Vensel Resort"),
+                              ("Grand Hyatt Tower 1", "The GRAND HYATT Tower 1 (Downtown)")):
+            with self.subTest(first=first):
+                hotels = [make_hotel("a", name=first, lat=1.3, lng=103.8),
+                          make_hotel("b", name=second, lat=1.3001, lng=103.8)]
+                self.assertEqual(self.matcher.match(hotels), {"b": "a"})
+
+    def test_unlocated_records_need_closer_names(self):
+        hotels = [make_hotel("a", name="Kalomira Vensol Resort", lat=1.3, lng=103.8),
+                  make_hotel("b", name="Kalomira Vensel Resort")]
+        self.assertEqual(self.matcher.match(hotels), {})
+        self.assertEqual(DuplicateMatcher(MatchOptions(unlocated_similarity=0.5)).match(hotels), {"b": "a"})
+
+    def test_high_latitude_neighbours(self):
+        # 0.48 km apart along the 80th parallel, where cells are narrow: several columns apart
+        hotels = [make_hotel("w", name="Polar Star Lodge", lat=80.0, lng=15.6),
+                  make_hotel("e", name="Polar Star Lodge", lat=80.0, lng=15.625)]
+        self.assertGreater(abs(self.matcher._cell((80.0, 15.6))[1] - self.matcher._cell((80.0, 15.625))[1]), 1)
+        self.assertEqual(self.matcher.match(hotels), {"e": "w"})
+        moved = make_hotel("e", name="Polar Star Lodge", lat=80.0, lng=15.7)
+        self.assertEqual(self.matcher.match([hotels[0], moved]), {})
+
+    def test_antimeridian_neighbours(self):
+        hotels = [make_hotel("w", name="Fiji Beach Resort", lat=-16.5, lng=179.9999),
+                  make_hotel("e", name="Fiji Beach Resort", lat=-16.5, lng=-179.9999)]
+        self.assertEqual(self.matcher.match(hotels), {"e": "w"})
+
+    def test_numpy_and_python_agree(self):
+        rng = random.Random(5)
+        words = ["Royal", "Palm", "Bay", "Sun", "River", "Park", "Garden", "Plaza", "Lotus", "Harbour"]
+        hotels = []
+        for n in range(400):
+            name = " ".join(rng.sample(words, 3))
+            point = {"lat": 1.3 + rng.random() / 100, "lng": 103.8 + rng.random() / 100} if rng.random() < 0.8 else {}
+            hotels.append(make_hotel(f"h{n}", n % 3, name, **point))
+        paths = [contextlib.nullcontext()] if load_numpy(duplicates.__name__) is not None else []
+        results = []
+        for path in paths + [patch.object(duplicates, "np", None)]:
+            with path:
+                results.append(self.matcher.match(hotels))
+        self.assertTrue(results[0])
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_options(self):
+        self.assertEqual(MatchOptions.from_config({"similarity": 0.8}).similarity, 0.8)
+        with self.assertRaises(ValueError):
+            MatchOptions(num_perm=64, bands=10)
+        with self.assertRaises(ValueError):
+            MatchOptions(unlocated_similarity=0)
+        with self.assertRaisesRegex(ValueError, "geohash cell"):
+            MatchOptions(geohash_precision=7, max_distance_km=0.5)
+        self.assertEqual(DuplicateMatcher().options, MatchOptions())  # Defaults match merge_strategy.json
+
+
+class TestSupplierManagerDuplicates(unittest.TestCase):
+    def test_merges_linked_records(self):
+        class First(AcmeSupplier):
+            def fetch(self, timeout=None):
+                return [make_hotel("a1", name="Beach Villas", lat=1.3, lng=103.8),
+                        make_hotel("a2", name="Hill Lodge", lat=1.5, lng=103.9)]
+
+        class Second(AcmeSupplier):
+            def fetch(self, timeout=None):
+                return [make_hotel("p9", name="The Beach Villas", lat=1.3001, lng=103.8001)]
+
+        manager = SupplierManager([First(), Second()], match_duplicates=True)
+        self.assertEqual([h.id for h in manager.fetch_and_merge_data()], ["a1", "a2"])
+        self.assertEqual(manager.duplicates, {"p9": "a1"})
+        self.assertEqual(len(SupplierManager([First(), Second()]).fetch_and_merge_data()), 3)
+        with self.assertRaises(ValueError):
+            SupplierManager([First()], stream=True, match_duplicates=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+from unittest.mock import patch
+from src.data_integration import geo_index
+from src.data_integration.geo_index import GeoIndex, haversine_km
+from src.data_integration.hotel_index import HotelIndex
+from src.data_integration.lazy_numpy import load_numpy
+from tests.helpers import make_hotel
+
+
+def random_hotels(count, seed=0):
+    rng = random.Random(seed)
+    hotels = []
+    for n in range(count):
+        if n % 10 == 0:
+            lat, lng = None, rng.uniform(-180, 180)  # Missing coordinate
+        elif n % 3 == 0:
+            lat, lng = rng.uniform(1.2, 1.5), rng.uniform(103.6, 104.0)  # Dense cluster
+        else:
+            lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        hotels.append(make_hotel(f"h{n}", n % 4, lat=lat, lng=lng))
+    return hotels
+
+
+class TestGeoIndex(unittest.TestCase):
+    def setUp(self):
+        self.hotels = random_hotels(600)
+        self.hotels += [make_hotel("pole", lat=89.99, lng=10), make_hotel("east", lat=10, lng=179.95),
+                        make_hotel("west", lat=10, lng=-179.95), make_hotel("bad", lat=95, lng=10),
+                        make_hotel("nan", lat=float("nan"), lng=1)]
+        self.index = GeoIndex(self.hotels, cell_degrees=0.5)
+
+    def brute_force(self, lat, lng, radius_km):
+        matches = []
+        for position, h in enumerate(self.hotels):
+            point = geo_index.coordinates(h)
+            if point is not None:
+                distance = haversine_km(lat, lng, *point)
+                if distance <= radius_km:
+                    matches.append((position, distance))
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+
+    def assertMatches(self, actual, expected):
+        self.assertEqual([p for p, _ in actual], [p for p, _ in expected])
+        for (_, a), (_, b) in zip(actual, expected):
+            self.assertAlmostEqual(a, b, places=6)
+
+    def test_radius_matches_brute_force(self):
+        queries = [(1.3, 103.8, 5), (1.3, 103.8, 40), (10, 180, 30), (10, -179.99, 30), (89.9, 0, 100),
+                   (-45, 60, 2500), (0, 0, 20000), (1.3, 103.8, 0)]
+        for lat, lng, radius in queries:
+            with self.subTest(lat=lat, lng=lng, radius=radius):
+                self.assertMatches(self.index.within(lat, lng, radius), self.brute_force(lat, lng, radius))
+
+    def test_nearest_matches_brute_force(self):
+        for lat, lng, k in [(1.3, 103.8, 5), (-60, -120, 3), (10, 179.99, 2), (0, 0, 10000)]:
+            with self.subTest(lat=lat, lng=lng, k=k):
+                self.assertMatches(self.index.nearest(lat, lng, k), self.brute_force(lat, lng, 1e9)[:k])
+
+    def test_unlocated_hotels(self):
+        unlocated = {self.hotels[p].id for p in self.index.unlocated}
+        self.assertEqual(len(unlocated), 62)
+        self.assertTrue({"bad", "nan", "h0", "h10"} <= unlocated)
+        self.assertEqual(len(self.index) + len(self.index.unlocated), len(self.hotels))
+        with self.assertRaises(ValueError):
+            self.index.within(None, 10, 5)
+
+    def test_pure_python_and_numpy_agree(self):
+        if load_numpy(geo_index.__name__) is None:
+            self.skipTest("numpy is not installed")
+        expected = self.index.within(1.3, 103.8, 40)
+        with patch.object(geo_index, "np", None):
+            self.assertMatches(GeoIndex(self.hotels, cell_degrees=0.5).within(1.3, 103.8, 40), expected)
+
+    def test_hotel_index_near_filter(self):
+        index = HotelIndex(self.hotels)
+        near = index.query(destination_ids=[3], near=(1.3, 103.8, 40))
+        expected = {self.hotels[p].id for p, _ in self.brute_force(1.3, 103.8, 40) if self.hotels[p].destination_id == 3}
+        self.assertEqual({h.id for h in near}, expected)
+        self.assertEqual([h.id for h in near], [h.id for h in self.hotels if h.id in expected])  # Inventory order
+        self.assertEqual(index.nearest(10, 179.99, 1)[0][0].id, "east")
+        self.assertIn("bad", {h.id for h in index.unlocated()})
+
+
+if __name__ == "__main__":
+    unittest.main()
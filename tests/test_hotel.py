@@ -0,0 +1,40 @@
+import unittest
+from dataclasses import asdict
+from src.models.hotel import Amenities, Hotel, HotelColumns, Image, ImageCategory, Location
+
+
+class TestHotelModel(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "id": "iJhz", "destination_id": 5432, "name": "Beach Villas", "description": "Sea view",
+            "location": {"lat": 1.26, "lng": None, "address": "8 Sentosa", "city": "Singapore", "country": "SG"},
+            "amenities": {"general": ["pool", "Sauna"], "room": ["tv"]},
+            "images": {"rooms": [{"link": "a.jpg", "description": "Room"}]},
+            "booking_conditions": ["No pets"],
+        }
+
+    def test_from_dict_builds_typed_objects(self):
+        hotel = Hotel.from_dict(self.data)
+        self.assertIsInstance(hotel.location, Location)
+        self.assertIsInstance(hotel.amenities, Amenities)
+        self.assertIsInstance(hotel.images, ImageCategory)
+        self.assertEqual(hotel.images.rooms, [Image(link="a.jpg", description="Room")])
+        self.assertEqual(hotel.images.site, [])
+        self.assertEqual(asdict(hotel)["location"]["address"], "8 Sentosa")
+
+    def test_slots_and_interning(self):
+        first, second = Hotel.from_dict(self.data), Hotel.from_dict(self.data | {"amenities": {"general": ["".join(["Sau", "na"])]}})
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertFalse(hasattr(first.location, "__dict__"))
+        self.assertIs(first.amenities.general[1], second.amenities.general[0])
+
+    def test_columns(self):
+        hotels = [Hotel.from_dict(self.data), Hotel.from_dict(self.data | {"id": "x", "destination_id": None})]
+        columns = HotelColumns.from_hotels(hotels)
+        self.assertEqual(len(columns), 2)
+        self.assertEqual(columns.row(0), ("iJhz", 5432, 1.26, None))
+        self.assertEqual(columns.row(1), ("x", None, 1.26, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
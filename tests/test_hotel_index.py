@@ -0,0 +1,44 @@
+import unittest
+from src.data_integration.hotel_index import HotelIndex
+from src.data_integration.supplier_manager import SupplierManager
+from tests.helpers import make_hotel
+
+
+class TestHotelIndex(unittest.TestCase):
+    def setUp(self):
+        self.hotels = [
+            make_hotel("iJhz", 5432, "Beach Villas Singapore", general=["pool", "wifi"], room=["tv"]),
+            make_hotel("SjyX", 5432, "InterContinental Singapore", general=["wifi"], room=["bathtub"]),
+            make_hotel("f8c9", 1122, "Hilton Shinjuku", general=["business center"], room=["tv"]),
+            make_hotel("zz00", None, "Beachfront Hostel"),
+        ]
+        self.index = HotelIndex(self.hotels)
+
+    def ids(self, **criteria):
+        return [h.id for h in self.index.query(**criteria)]
+
+    def test_ids_and_destinations(self):
+        self.assertEqual(self.ids(hotel_ids=["f8c9", "iJhz", "nope"]), ["iJhz", "f8c9"])
+        self.assertEqual(self.ids(destination_ids=["5432"]), ["iJhz", "SjyX"])
+        self.assertEqual(self.ids(destination_ids=[1122]), ["f8c9"])
+        self.assertEqual(self.ids(hotel_ids=["iJhz", "f8c9"], destination_ids=["5432"]), ["iJhz"])
+        self.assertEqual(self.ids(), ["iJhz", "SjyX", "f8c9", "zz00"])
+
+    def test_amenities_and_name_prefix(self):
+        self.assertEqual(self.ids(amenities=["WiFi", "tv"]), ["iJhz"])
+        self.assertEqual(self.ids(amenities=["Business Center"]), ["f8c9"])
+        self.assertEqual(self.ids(name_prefix="beach"), ["iJhz", "zz00"])
+        self.assertEqual(self.ids(name_prefix="beach", destination_ids=["5432"]), ["iJhz"])
+        self.assertEqual(self.ids(name_prefix="Ritz"), [])
+
+    def test_manager_matches_linear_filter(self):
+        manager = SupplierManager([])
+        for hotel_ids, destination_ids in ([], []), (["iJhz", "zz00"], []), ([], ["5432", "None"]), (["SjyX"], ["5432"]):
+            expected = [h for h in self.hotels
+                        if (not hotel_ids or h.id in hotel_ids)
+                        and (not destination_ids or str(h.destination_id) in destination_ids)]
+            self.assertEqual(manager.filter_hotels(self.hotels, hotel_ids, destination_ids), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
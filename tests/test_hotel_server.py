@@ -0,0 +1,115 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import urlopen
+from src.data_integration.base_supplier import BaseSupplier
+from src.data_integration.supplier_manager import SupplierManager
+from src.service.hotel_server import InventoryService, LatencyTracker, make_server
+
+
+class StubSupplier(BaseSupplier):
+    supplier_key = "acme"
+    hotel_count = 25
+    fail = False
+
+    def fetch(self, timeout=None):
+        if StubSupplier.fail:
+            raise ConnectionError("supplier down")
+        return [self.parse({"Id": f"h{i:02d}", "DestinationId": i % 2, "Name": f"Hotel {i}",
+                            "Latitude": 1 + i / 100 if i % 5 else None, "Longitude": 103.8})
+                for i in range(StubSupplier.hotel_count)]
+
+
+class TestHotelServer(unittest.TestCase):
+    def setUp(self):
+        StubSupplier.hotel_count, StubSupplier.fail = 25, False
+        self.service = InventoryService(SupplierManager([StubSupplier()]), refresh_interval=None)
+        self.service.start()
+        self.server = make_server(self.service, port=0)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.stop()
+
+    def get(self, path):
+        with urlopen(self.base_url + path) as response:
+            return json.loads(response.read())
+
+    def test_pagination(self):
+        page = self.get("/hotels?destination_ids=0&page=2&page_size=5")
+        self.assertEqual(page["total"], 13)
+        self.assertEqual([h["id"] for h in page["hotels"]], ["h10", "h12", "h14", "h16", "h18"])
+        self.assertEqual(self.get("/hotels?hotel_ids=h03,h04")["total"], 2)
+
+    def test_refresh_swaps_inventory_and_keeps_it_on_failure(self):
+        StubSupplier.hotel_count = 30
+        self.service.refresh()
+        self.assertEqual(self.get("/hotels")["total"], 30)
+        StubSupplier.fail = True
+        self.service.refresh()
+        stats = self.get("/stats")
+        self.assertEqual(stats["hotels"], 30)
+        self.assertIn("supplier down", stats["last_error"])
+
+    def test_partial_refresh_reports_dropped_suppliers(self):
+        class DownSupplier(StubSupplier):
+            supplier_key = "patagonia"
+
+            def fetch(self, timeout=None):
+                raise ConnectionError("supplier down")
+
+        self.service.manager = SupplierManager([StubSupplier(), DownSupplier()], mode="thread")
+        self.service.refresh()
+        stats = self.get("/stats")
+        self.assertEqual(stats["hotels"], 25)
+        self.assertEqual(stats["last_error"], "Refreshed without suppliers: patagonia")
+        self.assertEqual(stats["supplier_errors"], {"patagonia": "ConnectionError: supplier down"})
+        self.service.manager = SupplierManager([StubSupplier()], mode="thread")
+        self.service.refresh()
+        stats = self.get("/stats")
+        self.assertEqual((stats["last_error"], stats["supplier_errors"]), (None, {}))
+
+    def test_latency_stats_and_bad_requests(self):
+        for _ in range(3):
+            self.get("/hotels?hotel_ids=h01")
+        latency = self.get("/stats")["latency"]
+        self.assertEqual(latency["count"], 3)
+        self.assertLessEqual(latency["p50_ms"], latency["p99_ms"])
+        with self.assertRaises(HTTPError) as error:
+            self.get("/hotels?page=0")
+        self.assertEqual(error.exception.code, 400)
+
+    def test_unexpected_errors_answer_500(self):
+        with patch.object(self.service, "query", side_effect=RuntimeError("index corrupted")), \
+                self.assertRaises(HTTPError) as error:
+            self.get("/hotels")
+        self.assertEqual(error.exception.code, 500)
+        self.assertEqual(json.loads(error.exception.read()), {"error": "RuntimeError: index corrupted"})
+        self.assertEqual(self.get("/stats")["latency"]["count"], 1)
+
+    def test_location_queries(self):
+        # Hotels are 1.1 km apart along a meridian; every fifth one has no latitude
+        self.assertEqual(self.get("/hotels?lat=1.0&lng=103.8&radius_km=5")["total"], 4)
+        self.assertEqual(self.get("/hotels?lat=1.0&lng=103.8&radius_km=5&destination_ids=1")["total"], 2)
+        nearest = self.get("/hotels/nearest?lat=1.0&lng=103.8&k=2")["hotels"]
+        self.assertEqual([h["id"] for h in nearest], ["h01", "h02"])
+        self.assertAlmostEqual(nearest[0]["distance_km"], 1.112, places=3)
+        for path in ("/hotels/nearest?lng=103.8", "/hotels?lat=91&lng=0&radius_km=1", "/hotels?lat=1&lng=2"):
+            with self.subTest(path=path), self.assertRaises(HTTPError) as error:
+                self.get(path)
+            self.assertEqual(error.exception.code, 400)
+
+    def test_percentiles(self):
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record(ms / 1000)
+        self.assertEqual(tracker.percentiles(), {"count": 100, "p50_ms": 50.0, "p99_ms": 99.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch
+from src.data_integration.http_transport import HttpOptions, HttpTransport
+from tests.helpers import StubServer
+
+PAYLOAD = json.dumps([{"Id": "a1", "DestinationId": 1, "Name": "Acme One"}]).encode()
+ETAG = '"v1"'
+
+
+def acme(handler):
+    """The payload with an ETag, 304 when the client already has it, gzipped when accepted."""
+    if handler.headers.get("If-None-Match") == ETAG:
+        return 304, b"", {}
+    if "gzip" in handler.headers.get("Accept-Encoding", ""):
+        return 200, gzip.compress(PAYLOAD), {"ETag": ETAG, "Content-Encoding": "gzip"}
+    return 200, PAYLOAD, {"ETag": ETAG}
+
+
+def flaky(handler):
+    """503 for the first `flaky.failures` requests."""
+    if flaky.failures > 0:
+        flaky.failures -= 1
+        return 503, b"", {}
+    return acme(handler)
+
+
+class TestHttpTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer({"/acme": acme, "/flaky": flaky}).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.requests.clear()
+        flaky.failures = 0
+        self.transport = HttpTransport()
+        self.supplier = self.server.supplier("acme", "/acme", transport=self.transport)
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_not_modified_skips_parsing(self):
+        first = self.supplier.fetch()
+        expected = first[0].copy()
+        # Merging assigns into the hotels it is given, which must not reach the ones kept for a 304
+        first[0].name, first[0].location.city = "Merged", "Singapore"
+        with patch.object(self.supplier, "parse", side_effect=AssertionError("re-parsed")):
+            second = self.supplier.fetch()
+        self.assertEqual(second, [expected])
+        self.assertIsNot(self.supplier.fetch()[0], second[0])
+        self.assertEqual(self.server.requests[1][1].get("If-None-Match"), ETAG)
+
+    def test_gzip_and_keep_alive(self):
+        self.supplier.fetch()
+        self.supplier._cached_hotels = None
+        self.supplier.fetch()
+        self.assertIn("gzip", self.server.requests[0][1]["Accept-Encoding"])
+        # Both requests reuse the same pooled connection (same client port)
+        self.assertEqual(self.server.requests[0][2], self.server.requests[1][2])
+
+    def test_retries_with_backoff(self):
+        flaky.failures = 2
+        options = HttpOptions(retries=2, backoff_factor=0.01, backoff_jitter=0.01)
+        response = self.transport.get(self.server.url("/flaky"), options)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_gives_up_after_retries(self):
+        flaky.failures = 5
+        options = HttpOptions(retries=1, backoff_factor=0.01, backoff_jitter=0.01)
+        response = self.transport.get(self.server.url("/flaky"), options)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import copy
+import random
+import unittest
+from dataclasses import asdict
+from src.data_integration.base_supplier import BaseSupplier
+from src.data_integration.data_merger import DataMerger, IncrementalMerger
+from src.data_integration.supplier_manager import SupplierManager
+from tests.helpers import make_hotel
+
+
+class TestIncrementalMerger(unittest.TestCase):
+    def setUp(self):
+        self.merger = DataMerger()
+        self.acme = [make_hotel("h1", name="Alpha", description="Sea view", lat=1.5, general=["pool"],
+                                rooms=[("a.jpg", "Room")]),
+                     make_hotel("h2", name="Beta")]
+        self.patagonia = [make_hotel("h1", name="Alpha Resort", description="Near beach", lat=None,
+                                     general=["wifi"], rooms=[("a.jpg", "Bed")]),
+                          make_hotel("h3", name="Gamma")]
+        self.incremental = IncrementalMerger(self.merger, ["acme", "patagonia"])
+        self.incremental.replace_supplier("acme", self.acme)
+        self.incremental.replace_supplier("patagonia", self.patagonia)
+
+    def full_merge(self, *listings):
+        records = copy.deepcopy([h for listing in listings for h in listing])
+        return {h.id: h for h in self.merger.merge_groups(records)}
+
+    def merged(self):
+        return {h.id: h for h in self.incremental.merged_hotels()}
+
+    def test_matches_full_merge(self):
+        self.assertEqual(self.merged(), self.full_merge(self.acme, self.patagonia))
+        # Stored contributions are left untouched by merging
+        self.assertEqual(self.acme[0].name, "Alpha")
+        self.assertEqual(self.acme[0].images.rooms[0].description, "Room")
+
+    def test_delta_reports_changed_hotels_only(self):
+        changed_h3 = make_hotel("h3", name="Gamma Inn")
+        self.assertEqual(self.incremental.apply_delta("patagonia", [changed_h3, self.patagonia[0]]), {"h3"})
+        self.assertEqual(self.incremental.apply_delta("patagonia", [], ["h1"]), {"h1"})
+        self.assertEqual(self.incremental.apply_delta("acme", [make_hotel("h4", name="Delta")]), {"h4"})
+        self.assertEqual(self.incremental.apply_delta("acme", [], ["h2"]), {"h2"})
+        self.assertEqual(self.merged(), self.full_merge([self.acme[0], make_hotel("h4", name="Delta")], [changed_h3]))
+
+    def test_replace_supplier_removes_missing_hotels(self):
+        changed = self.incremental.replace_supplier("patagonia", [self.patagonia[0]])
+        self.assertEqual(changed, {"h3"})
+        self.assertNotIn("h3", self.merged())
+
+    def test_random_deltas_match_full_rebuild(self):
+        rng = random.Random(13)
+        keys = ["acme", "patagonia", "paperflies"]
+        incremental = IncrementalMerger(self.merger, keys)
+        listings = {key: {} for key in keys}  # What each supplier lists, in the order a full fetch returns it
+
+        def random_hotel(hotel_id):
+            return make_hotel(hotel_id, name=rng.choice([None, "Inn", "Grand Inn"]), lat=rng.choice([None, 1.5]),
+                              general=rng.sample(["wifi", "pool", "bar"], 2),
+                              rooms=[("a.jpg", rng.choice(["Room", "Bed"]))])
+
+        for step in range(300):
+            key = rng.choice(keys)
+            listing = listings[key]
+            if rng.random() < 0.2:
+                ids = rng.sample([f"h{n}" for n in range(12)], rng.randint(0, 8))
+                listings[key] = {hotel_id: random_hotel(hotel_id) for hotel_id in ids}
+                incremental.replace_supplier(key, list(listings[key].values()))
+            else:
+                upserts = [random_hotel(f"h{n}") for n in rng.sample(range(12), rng.randint(0, 3))]
+                kept = sorted(set(listing) - {hotel.id for hotel in upserts})
+                removed = rng.sample(kept, min(len(kept), rng.randint(0, 2)))
+                for hotel_id in removed:
+                    del listing[hotel_id]
+                for hotel in upserts:
+                    listing[hotel.id] = hotel  # Changed hotels keep their place; new ones are appended
+                incremental.apply_delta(key, upserts, removed)
+            rebuilt = self.merger.merge_groups(copy.deepcopy([h for key in keys for h in listings[key].values()]))
+            with self.subTest(step=step):
+                self.assertEqual([asdict(h) for h in incremental.merged_hotels()], [asdict(h) for h in rebuilt])
+
+    def test_unknown_supplier(self):
+        with self.assertRaises(ValueError):
+            self.incremental.apply_delta("nope", [])
+
+
+class StubSupplier(BaseSupplier):
+    def __init__(self, key, records):
+        super().__init__()
+        self.supplier_key = key
+        self.records = records
+
+    def fetch(self, timeout=None):
+        if self.records is None:
+            raise ConnectionError(f"{self.supplier_key} down")
+        return copy.deepcopy(self.records)
+
+
+class TestRefreshSupplier(unittest.TestCase):
+    def test_refresh_updates_index(self):
+        acme = StubSupplier("acme", [make_hotel("h1", name="Alpha"), make_hotel("h2", name="Beta")])
+        patagonia = StubSupplier("patagonia", [make_hotel("h1", name="Alpha Resort")])
+        manager = SupplierManager([acme, patagonia])
+        self.assertEqual(manager.refresh_supplier(acme), {"h1", "h2"})
+        acme.records = [make_hotel("h1", name="Alpha"), make_hotel("h2", name="Beta Lodge")]
+        self.assertEqual(manager.refresh_supplier(acme), {"h2"})
+        self.assertEqual(manager.refresh_supplier(acme), set())
+        self.assertEqual([h.name for h in manager.filter_hotels(manager.index.hotels, ["h2"], [])], ["Beta Lodge"])
+
+    def test_failed_supplier_keeps_its_contribution(self):
+        acme = StubSupplier("acme", [make_hotel("h1", name="Alpha")])
+        patagonia = StubSupplier("patagonia", [make_hotel("h2", name="Beta")])
+        manager = SupplierManager([acme, patagonia], mode="thread")
+        manager.refresh_supplier(acme)
+        acme.records = None
+        self.assertEqual(manager.refresh_supplier(acme), set())
+        self.assertIsInstance(manager.errors["acme"], ConnectionError)
+        self.assertEqual(sorted(h.id for h in manager.index.hotels), ["h1", "h2"])
+
+    def test_links_duplicates_like_a_full_merge(self):
+        acme = StubSupplier("acme", [make_hotel("a1", name="Beach Villas", lat=1.3, lng=103.8),
+                                     make_hotel("a2", name="Hill Lodge", lat=1.5, lng=103.9)])
+        patagonia = StubSupplier("patagonia", [make_hotel("p9", name="Lake House", lat=1.4, lng=103.7)])
+        manager = SupplierManager([acme, patagonia], match_duplicates=True, columnar=True)
+        manager.refresh_supplier(acme)
+        # The renamed record now matches one of acme's hotels, so the merged inventory shrinks
+        patagonia.records = [make_hotel("p9", name="The Beach Villas", lat=1.3001, lng=103.8001)]
+        self.assertEqual(manager.refresh_supplier(patagonia), {"a1", "p9"})
+        expected = SupplierManager([acme, patagonia], match_duplicates=True, columnar=True).fetch_and_merge_data()
+        self.assertEqual(manager.index.hotels, expected)
+        self.assertEqual(manager.duplicates, {"p9": "a1"})
+        self.assertEqual(patagonia.records[0].id, "p9")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from src.data_integration import instrumentation
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.data_merger import DataMerger
+from tests.helpers import make_hotel
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, payload: bytes):
+        self.content = payload
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeTransport:
+    def __init__(self, payload: bytes):
+        self.payload = payload
+
+    def get(self, url, options, validators=None, stream=False):
+        return FakeResponse(self.payload)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(instrumentation.active())
+        with instrumentation.stage("merge"):
+            pass
+        DataMerger().merge_groups([make_hotel("h1", name="A"), make_hotel("h1", name="B")])
+
+    def test_counts_strategy_calls(self):
+        metrics = instrumentation.enable()
+        merger = DataMerger()
+        merger.merge_groups([make_hotel("h1", name="A"), make_hotel("h1", name="Bb"), make_hotel("h1", name="C"),
+                             make_hotel("h2", name="D")])
+        # One hotel with three records: two pairwise calls per field, one call per list field
+        self.assertEqual(metrics.strategy_calls["choose_best"], 2 * 3)
+        self.assertEqual(metrics.strategy_calls["merge_list"], 6)
+        merger.merge_hotels([make_hotel("h3", name="A"), make_hotel("h3", name="B")])
+        self.assertEqual(metrics.strategy_calls["merge_list"], 6 + 6)
+
+    def test_records_fetch_and_parse(self):
+        metrics = instrumentation.enable()
+        payload = b'[{"Id": "a1", "DestinationId": 1, "Name": "One"}, {"Id": "a2", "DestinationId": 2}]'
+        hotels = AcmeSupplier(transport=FakeTransport(payload)).fetch()
+        self.assertEqual(len(hotels), 2)
+        with metrics.stage("merge"):
+            metrics.merged_hotels = 2
+        report = metrics.report()
+        self.assertEqual(report["suppliers"]["acme"]["bytes"], len(payload))
+        self.assertEqual(report["suppliers"]["acme"]["records"], 2)
+        self.assertIn("merge", report["stages"])
+        self.assertIsNotNone(report["merge_us_per_hotel"])
+
+    def test_profile_writes_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.prof")
+            with instrumentation.profile("cprofile", path):
+                sorted(range(1000))
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+            path = os.path.join(directory, "run.txt")
+            with instrumentation.profile("tracemalloc", path):
+                data = [str(n) for n in range(1000)]
+            with open(path) as f:
+                self.assertTrue(f.readline().startswith("current="))
+
+
+if __name__ == "__main__":
+    unittest.main()
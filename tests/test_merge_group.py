@@ -0,0 +1,55 @@
+import copy
+import random
+import unittest
+from dataclasses import asdict
+from functools import reduce
+from src.data_integration.data_merger import DataMerger
+from tests.helpers import make_hotel
+
+
+class TestMergeGroup(unittest.TestCase):
+    def setUp(self):
+        self.merger = DataMerger()
+
+    def assertMatchesPairwise(self, records):
+        pairwise = reduce(self.merger._merge_two_hotels, copy.deepcopy(records))
+        merged = self.merger.merge_group(copy.deepcopy(records))
+        self.assertEqual(asdict(merged), asdict(pairwise))
+        return merged
+
+    def test_keyed_images_concatenate_descriptions(self):
+        merged = self.assertMatchesPairwise([
+            make_hotel(rooms=[("a.jpg", "Room"), ("b.jpg", "Lobby")]),
+            make_hotel(rooms=[("c.jpg", "Pool"), ("a.jpg", "Sea view")]),
+            make_hotel(rooms=[("a.jpg", "Room"), ("c.jpg", "Pool at night")]),
+        ])
+        self.assertEqual([(image.link, image.description) for image in merged.images.rooms],
+                         [("a.jpg", "Room Sea view"), ("b.jpg", "Lobby"), ("c.jpg", "Pool at night")])
+
+    def test_merge_list_keeps_first_appearance_order(self):
+        merged = self.assertMatchesPairwise([make_hotel(general=["wifi", "pool"], booking_conditions=["No pets"]),
+                                             make_hotel(general=["bar", "wifi"]),
+                                             make_hotel(general=["pool", "gym", "bar"], booking_conditions=["No pets", "Late"])])
+        self.assertEqual(merged.amenities.general, ["wifi", "pool", "bar", "gym"])
+        self.assertEqual(merged.booking_conditions, ["No pets", "Late"])
+
+    def test_choose_best_ties_keep_the_earlier_value(self):
+        records = [make_hotel(name="Inn A", city=None), make_hotel(name="Inn B", city="Rome"), make_hotel(name="Inn", city="Pisa")]
+        merged = self.assertMatchesPairwise(records)
+        self.assertEqual((merged.name, merged.location.city), ("Inn A", "Rome"))
+
+    def test_random_groups_match_pairwise_fold(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            records = [make_hotel(name=rng.choice([None, "", "Inn", "Grand Inn", "The Inn"]),
+                                  lat=rng.choice([None, 1.5, 2.0]), city=rng.choice([None, "Paris", "Rome"]),
+                                  general=rng.sample(["wifi", "pool", "tv", "bar"], 2),
+                                  rooms=[(f"{rng.randrange(3)}.jpg", rng.choice(["Room", "Bed", "", None]))],
+                                  booking_conditions=rng.sample(["No pets", "Late", "Early"], rng.randrange(3)),
+                                  description=rng.choice([None, "", "Quiet", "Quiet street", "Near the beach"]))
+                       for _ in range(rng.randint(1, 5))]
+            self.assertMatchesPairwise(records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from functools import reduce
+from src.data_integration.data_merger import DataMerger
+from src.models.hotel import Image
+
+
+class TestMergeList(unittest.TestCase):
+    def setUp(self):
+        self.merger = DataMerger()
+
+    def test_unkeyed_merge_keeps_first_appearance_order(self):
+        merged = self.merger.merge_list(["wifi", "pool", "tv"], ["tv", "bar", "wifi", "gym"])
+        self.assertEqual(merged, ["wifi", "pool", "tv", "bar", "gym"])
+
+    def test_keyed_merge_does_not_alias_inputs(self):
+        list1 = [{"link": "a.jpg", "description": "Room"}]
+        list2 = [{"link": "a.jpg", "description": "Sea view"}, {"link": "b.jpg", "description": "Lobby"}]
+        merged = self.merger.merge_list(list1, list2, "link", {"description": "concatenate"})
+        self.assertEqual(merged, [{"link": "a.jpg", "description": "Room Sea view"},
+                                  {"link": "b.jpg", "description": "Lobby"}])
+        self.assertEqual(list1, [{"link": "a.jpg", "description": "Room"}])
+        self.assertIsNot(merged[0], list1[0])
+        self.assertIs(merged[1], list2[1])
+
+    def test_keyed_merge_of_images(self):
+        first = Image(link="a.jpg", description="Room")
+        merged = self.merger.merge_list([first], [Image(link="a.jpg", description="Bed")], "link",
+                                        {"description": "concatenate"})
+        self.assertEqual(merged, [Image(link="a.jpg", description="Room Bed")])
+        self.assertEqual(first.description, "Room")
+
+    def test_many_lists_match_pairwise_fold(self):
+        lists = [[{"link": f"{i % 7}.jpg", "description": f"d{i}"} for i in range(start, start + 5)]
+                 for start in range(0, 40, 4)]
+        subfields = {"description": "concatenate"}
+        pairwise = reduce(lambda acc, items: self.merger.merge_list(acc, items, "link", subfields), lists)
+        self.assertEqual(self.merger.merge_lists(lists, "link", subfields), pairwise)
+
+    def test_empty_and_missing_lists(self):
+        self.assertEqual(self.merger.merge_list(None, None), [])
+        self.assertEqual(self.merger.merge_list([], ["a", "a"]), ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
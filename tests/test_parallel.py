@@ -0,0 +1,36 @@
+import unittest
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.data_merger import DataMerger
+from src.data_integration.paperflies_supplier import PaperfliesSupplier
+from src.data_integration.parallel import ParallelMerger, shard_of
+from src.data_integration.patagonia_supplier import PatagoniaSupplier
+from tests.helpers import supplier_records
+
+
+class TestParallelMerger(unittest.TestCase):
+    def setUp(self):
+        self.suppliers = [AcmeSupplier(), PatagoniaSupplier(), PaperfliesSupplier()]
+        # Overlapping id ranges, so most hotels get records from several suppliers
+        self.raw = [supplier_records("acme", 60, start=0), supplier_records("patagonia", 60, start=30),
+                    supplier_records("paperflies", 60, start=15)]
+
+    def serial(self):
+        hotels = [s.parse(dto) for s, records in zip(self.suppliers, self.raw) for dto in records]
+        return DataMerger().merge_groups(hotels)
+
+    def test_matches_serial_merge(self):
+        expected = self.serial()
+        for workers, shards in ((1, None), (2, None), (3, 7)):
+            with self.subTest(workers=workers, shards=shards):
+                merged = ParallelMerger(self.suppliers, workers=workers, shards=shards).merge(self.raw)
+                self.assertEqual([h.id for h in merged], [h.id for h in expected])
+                self.assertEqual(merged, expected)
+
+    def test_records_of_a_hotel_share_a_shard(self):
+        self.assertEqual(shard_of(7, 5), shard_of("7", 5))
+        merger = ParallelMerger(self.suppliers, workers=2, shards=4)
+        self.assertLessEqual(len(merger.shard_records(self.raw)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from config.config import SUPPLIER_CONFIG
+from src.data_integration.parser import AmenityIndex, Parser
+from tests.helpers import group_nested_fields
+
+
+class TestParsePlan(unittest.TestCase):
+    def setUp(self):
+        self.records = {
+            "acme": [
+                {"Id": "iJhz", "DestinationId": 5432, "Name": "Beach Villas", "Latitude": 1.26, "Longitude": "103.8",
+                 "Address": "8 Sentosa", "City": "Singapore", "Country": "SG", "Facilities": ["Pool", "WiFi "]},
+                {"Id": 7, "DestinationId": "not-a-number", "Latitude": "", "Facilities": "Aircon"},
+            ],
+            "patagonia": [
+                {"id": "iJhz", "destination": "5432", "name": "Beach Villas", "lat": 1.26, "lng": 103.8,
+                 "info": None, "amenities": ["tv"],
+                 "images": {"rooms": [{"url": "a.jpg", "description": "Room"}, {"url": "b.jpg"}]}},
+                {"id": "x", "images": "not-a-dict"},
+            ],
+            "paperflies": [
+                {"hotel_id": "iJhz", "destination_id": 5432, "hotel_name": "Beach Villas",
+                 "location": {"address": "8 Sentosa", "country": "Singapore"},
+                 "amenities": {"general": ["outdoor pool"], "room": ["tv"]},
+                 "images": {"site": [{"link": "c.jpg", "caption": "Front"}]},
+                 "booking_conditions": ["No pets"]},
+                {"hotel_id": "y", "location": ["unexpected"], "amenities": None},
+            ],
+        }
+
+    def test_plan_matches_interpreted_parse(self):
+        for supplier_key, records in self.records.items():
+            config = SUPPLIER_CONFIG[supplier_key]["fields"]
+            plan = Parser.compile(config)
+            for dto in records:
+                with self.subTest(supplier=supplier_key, dto=dto):
+                    expected = group_nested_fields(Parser.parse(dto, config))
+                    self.assertEqual(plan(dto), expected)
+                    self.assertEqual(list(plan(dto)), list(expected))
+
+    def test_defaults_are_not_shared(self):
+        config = SUPPLIER_CONFIG["acme"]["fields"]
+        plan = Parser.compile(config)
+        first, second = plan({}), plan({})
+        first["booking_conditions"].append("mutated")
+        first["amenities"]["general"].append("mutated")
+        self.assertEqual(second["booking_conditions"], [])
+        self.assertEqual(second["amenities"]["general"], [])
+        self.assertEqual(config["booking_conditions"]["default"], [])
+        self.assertEqual(config["amenities.general"]["default"], [])
+
+
+class TestAmenityIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = AmenityIndex({
+            "general": ["pool", "business center", "wifi"],
+            "room": ["tv", "bathtub"],
+            "aliases": {"bathtub": ["tub"], "wifi": ["wi-fi"]},
+        })
+
+    def test_canonical_names_and_aliases(self):
+        self.assertEqual(self.index.lookup("BusinessCenter"), ("general", "business center"))
+        self.assertEqual(self.index.lookup("WiFi"), ("general", "wifi"))
+        self.assertEqual(self.index.lookup("Wi-Fi"), ("general", "wifi"))
+        self.assertEqual(self.index.lookup("tub"), ("room", "bathtub"))
+        self.assertIsNone(self.index.lookup("sauna"))
+
+    def test_categorize_dedupes_per_hotel(self):
+        amenities = {"general": ["Pool", "WiFi", "Sauna", " pool", "wifi"], "room": ["tub", "BathTub", "sauna", "TV"]}
+        self.assertEqual(Parser.parse_amenities(amenities, self.index),
+                         {"general": ["pool", "wifi", "Sauna"], "room": ["bathtub", "tv"]})
+
+    def test_raw_config_is_still_accepted(self):
+        config = {"general": ["wifi"], "room": ["tv"]}
+        self.assertEqual(Parser.parse_amenities({"general": ["WiFi"], "room": ["tv"]}, config),
+                         {"general": ["wifi"], "room": ["tv"]})
+
+    def test_alias_to_unknown_amenity(self):
+        with self.assertRaises(ValueError):
+            AmenityIndex({"general": [], "room": [], "aliases": {"sauna": ["steam room"]}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import unittest
+from dataclasses import asdict
+from src.data_integration.acme_supplier import AcmeSupplier
+from src.data_integration.data_merger import DataMerger
+from src.data_integration.record_store import RecordStore
+
+RECORDS = [{"Id": "h1", "DestinationId": 1, "Name": "Alpha", "Facilities": ["Pool"]},
+           {"Id": "h2", "DestinationId": 2, "Name": "Beta", "Facilities": ["WiFi"]},
+           {"Id": "h3", "DestinationId": 3, "Name": "Gamma"}]
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, records):
+        self.content = json.dumps(records).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeTransport:
+    def __init__(self):
+        self.records = RECORDS
+
+    def get(self, url, options, validators=None, stream=False):
+        return FakeResponse(self.records)
+
+
+class TestRecordStore(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport()
+        self.store = RecordStore()
+        self.supplier = AcmeSupplier(transport=self.transport, record_store=self.store)
+        self.parses = 0
+        parse = self.supplier.parse
+
+        def counting_parse(dto):
+            self.parses += 1
+            return parse(dto)
+
+        self.supplier.parse = counting_parse
+
+    def test_reuses_unchanged_records(self):
+        first = self.supplier.fetch()
+        self.transport.records = [RECORDS[0], dict(RECORDS[1], Name="Beta Inn")]
+        second = self.supplier.fetch()
+        self.assertEqual(self.parses, 4)
+        self.assertEqual(self.store.stats(), {"acme": {"hits": 1, "misses": 4, "stored": 2}})
+        self.assertEqual([h.name for h in second], ["Alpha", "Beta Inn"])
+        plain = AcmeSupplier(transport=self.transport).fetch()
+        self.assertEqual([asdict(h) for h in second], [asdict(h) for h in plain])
+        self.assertEqual(first[0], second[0])
+
+    def test_merging_does_not_alter_stored_hotels(self):
+        self.transport.records = [RECORDS[0], dict(RECORDS[0], Name="Alpha Resort", Facilities=["WiFi"])]
+        merged = DataMerger().merge_groups(self.supplier.fetch())
+        self.assertEqual(merged[0].name, "Alpha Resort")
+        self.assertEqual(merged[0].amenities.general, ["pool", "wifi"])
+        again = self.supplier.fetch()
+        self.assertEqual([h.name for h in again], ["Alpha", "Alpha Resort"])
+        self.assertEqual(again[0].amenities.general, ["pool"])
+        self.assertEqual(self.parses, 2)
+
+    def test_config_change_discards_stored_hotels(self):
+        self.supplier.fetch()
+        self.supplier.fingerprint = lambda: "another config"
+        self.supplier.fetch()
+        self.assertEqual(self.parses, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
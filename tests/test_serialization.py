@@ -0,0 +1,70 @@
+import importlib.util
+import io
+import json
+import subprocess
+import sys
+import unittest
+from dataclasses import asdict
+from src.models.hotel import Hotel
+from src.models.serialization import hotel_to_dict, write_hotels
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.hotels = [Hotel.from_dict({
+            "id": f"h{i}", "destination_id": i, "name": "Café “Beach”", "description": "Line\nbreak",
+            "location": {"lat": 1.5, "lng": None, "city": "Singapore"},
+            "amenities": {"general": ["pool"], "room": []},
+            "images": {"rooms": [{"link": "a.jpg", "description": "Room"}]},
+            "booking_conditions": [],
+        }) for i in range(3)]
+
+    def write(self, hotels, output_format, backend):
+        first, second = io.StringIO(), io.StringIO()
+        count = write_hotels(iter(hotels), [first, second], output_format, backend)
+        self.assertEqual(first.getvalue(), second.getvalue())
+        self.assertEqual(count, len(hotels))
+        return first.getvalue()
+
+    def test_hotel_to_dict_matches_asdict(self):
+        self.assertEqual(hotel_to_dict(self.hotels[0]), asdict(self.hotels[0]))
+
+    def test_pretty_json_backend_matches_json_dumps(self):
+        for hotels in (self.hotels, []):
+            expected = json.dumps([asdict(hotel) for hotel in hotels], indent=2)
+            self.assertEqual(self.write(hotels, "pretty", "json"), expected)
+
+    def test_default_backend_escapes_non_ascii_like_json_dumps(self):
+        output = io.StringIO()
+        write_hotels(self.hotels, [output], "compact")
+        self.assertEqual(output.getvalue(), json.dumps([asdict(hotel) for hotel in self.hotels], separators=(",", ":")))
+        self.assertTrue(output.getvalue().isascii())
+
+    def test_orjson_is_only_imported_when_selected(self):
+        code = "import sys, src.models.serialization; print('orjson' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_all_formats_and_backends_round_trip(self):
+        expected = [asdict(hotel) for hotel in self.hotels]
+        for backend in ("json", "orjson") if HAS_ORJSON else ("json",):
+            with self.subTest(backend=backend):
+                self.assertEqual(json.loads(self.write(self.hotels, "pretty", backend)), expected)
+                self.assertEqual(json.loads(self.write(self.hotels, "compact", backend)), expected)
+                self.assertEqual(json.loads(self.write([], "compact", backend)), [])
+                lines = self.write(self.hotels, "ndjson", backend).splitlines()
+                self.assertEqual([json.loads(line) for line in lines], expected)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_hotels([], [io.StringIO()], "xml")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            write_hotels([], [io.StringIO()], "compact", "auto")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+from main import main
+from src.models.serialization import write_hotels
+from src.models.snapshot import SNAPSHOT_VERSION, Snapshot, write_snapshot
+from tests.helpers import make_hotel
+
+
+def hotel(hotel_id, destination_id=5432, city="Singapore", lat=1.264751, conditions=()):
+    """A hotel using every field the snapshot encodes, with non-ASCII text."""
+    return make_hotel(hotel_id, destination_id, f"Café {hotel_id} “Beach”", "Line\nbreak" if lat else None,
+                      general=["pool", "wifi"], room=["tv"], rooms=[("a.jpg", "Double room")],
+                      booking_conditions=conditions, address="8 Sentosa Gateway", city=city, country="SG",
+                      lat=lat, lng=103.824006)
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "hotels.snapshot")
+        self.hotels = [hotel("iJhz"), hotel("SjyX", None, None, None, None), hotel("f8c9", -7, "東京", 0.0, ["x"]),
+                       hotel("", 2 ** 40), hotel("iJhz", 1)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def as_json(self, hotels):
+        output = io.StringIO()
+        write_hotels(hotels, [output])
+        return output.getvalue()
+
+    def test_round_trips_the_json_output(self):
+        self.assertEqual(write_snapshot(iter(self.hotels), self.path), 5)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 5)
+            self.assertEqual(self.as_json(snapshot), self.as_json(self.hotels))
+            self.assertEqual(self.as_json([snapshot[2]]), self.as_json([self.hotels[2]]))
+
+    def test_lookup_by_id(self):
+        write_snapshot(self.hotels, self.path)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.get("f8c9").destination_id, -7)
+            self.assertEqual(snapshot.find("iJhz"), 0)  # The first of a repeated id
+            self.assertIsNone(snapshot.get("missing"))
+            self.assertIn("", snapshot)
+            self.assertEqual([h.id for h in snapshot.select(["f8c9", "missing", "SjyX", "f8c9"])], ["SjyX", "f8c9"])
+            self.assertEqual(len(snapshot.select([])), 5)
+            with self.assertRaises(IndexError):
+                snapshot[5]
+
+    def test_strings_are_interned(self):
+        write_snapshot(self.hotels, self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data.count(b"Singapore"), 1)
+        self.assertEqual(data.count(b"wifi"), 1)
+        with Snapshot(self.path) as snapshot:
+            self.assertIs(snapshot[0].location.city, snapshot[3].location.city)
+            self.assertIs(snapshot[0].amenities.general[1], snapshot[4].amenities.general[1])
+
+    def test_empty_snapshot(self):
+        write_snapshot([], self.path)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot), [])
+            self.assertIsNone(snapshot.find("iJhz"))
+
+    def test_rejects_invalid_files(self):
+        write_snapshot(self.hotels, self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        cases = {"not a hotel snapshot": b"", "truncated": data[:-40],
+                 "Unsupported snapshot version": data[:4] + struct.pack("<H", SNAPSHOT_VERSION + 1) + data[6:]}
+        for message, content in cases.items():
+            with open(self.path, "wb") as f:
+                f.write(content)
+            with self.assertRaisesRegex(ValueError, message):
+                Snapshot(self.path)
+
+    def test_invalid_hotel_leaves_no_file(self):
+        with self.assertRaises(ValueError):
+            write_snapshot([self.hotels[0], hotel(None)], self.path)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    @patch("src.data_integration.supplier_manager.SupplierManager.fetch_and_merge_data")
+    def test_main_writes_and_queries_snapshots(self, mock_fetch_and_merge_data):
+        mock_fetch_and_merge_data.return_value = self.hotels[:4]
+        output = os.path.join(self.directory.name, "output.json")
+        outputs = []
+        for argv in (["main", "none", "5432,-7", "--snapshot", self.path],
+                     ["main", "none", "none", "--from-snapshot", self.path],
+                     ["main", "f8c9,iJhz", "none", "--from-snapshot", self.path, "--amenities", "wifi"]):
+            with patch("sys.argv", argv + ["--output", output]), patch("sys.stdout", new_callable=io.StringIO) as out:
+                main()
+            outputs.append(out.getvalue())
+        self.assertEqual(mock_fetch_and_merge_data.call_count, 1)
+        expected = self.as_json([self.hotels[0], self.hotels[2]]) + "\n"
+        self.assertEqual(outputs, [expected, self.as_json(self.hotels[:4]) + "\n", expected])
+        argv = ["main", "none", "none", "--from-snapshot", self.path, "--snapshot", self.path]
+        with patch("sys.argv", argv), patch("sys.stderr", new_callable=io.StringIO), self.assertRaises(SystemExit):
+            main()
+
+
+if __name__ == "__main__":
+    unittest.main()
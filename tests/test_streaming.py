@@ -0,0 +1,84 @@
+import json
+import unittest
+from unittest.mock import patch
+from src.data_integration.base_supplier import BaseSupplier
+from src.data_integration.streaming import iter_json_array, iter_ndjson
+from src.data_integration.supplier_manager import SupplierManager
+from tests.helpers import StubServer, json_route
+
+RECORDS = [{"Id": f"h{i}", "DestinationId": i % 3, "Name": f"Hotel {i} é", "Latitude": i / 7,
+            "Facilities": ["Pool", "WiFi"]} for i in range(200)]
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestStreamingDecoders(unittest.TestCase):
+    def test_json_array_any_chunking(self):
+        items = [{"a": "é漢", "n": [1, 2.5e3, None, True]}, 123, "x", [], {}, -0.5, 100000, 1.5e-7]
+        raw = json.dumps(items, ensure_ascii=False).encode()
+        for size in (1, 2, 3, 5, 8, 64):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(chunked(raw, size), compact_at=4)), items)
+
+    def test_source_text(self):
+        raw = b'[ {"a": 1},\n  {"b": [2, 3]} ]'
+        for size in (1, 4, 64):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(chunked(raw, size), with_text=True)),
+                                 [({"a": 1}, '{"a": 1}'), ({"b": [2, 3]}, '{"b": [2, 3]}')])
+        self.assertEqual(list(iter_ndjson([b'{"a": 1}\n\n{"b": 2}'], with_text=True)),
+                         [({"a": 1}, '{"a": 1}'), ({"b": 2}, '{"b": 2}')])
+
+    def test_json_array_is_lazy(self):
+        chunks = iter([b'[{"a": 1},', b' {"a": 2}', b"]"])
+        items = iter_json_array(chunks)
+        self.assertEqual(next(items), {"a": 1})
+        self.assertEqual(next(chunks), b' {"a": 2}')  # nothing was read ahead of the first item
+
+    def test_json_array_rejects_malformed_input(self):
+        for raw in (b"", b"{}", b"[1, 2", b"[1 2]", b"[1,]", b"[1] x"):
+            with self.subTest(raw=raw), self.assertRaises(ValueError):
+                list(iter_json_array(chunked(raw, 2)))
+
+    def test_ndjson(self):
+        raw = "\n".join(json.dumps(record) for record in RECORDS[:5]).encode() + b"\n\n"
+        self.assertEqual(list(iter_ndjson(chunked(raw, 7))), RECORDS[:5])
+
+
+class TestStreamingSuppliers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        ndjson = "\n".join(json.dumps(record) for record in RECORDS).encode()
+        cls.server = StubServer({"/json": json_route(RECORDS), "/ndjson": lambda handler: (200, ndjson, {})}).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def supplier(self, path, payload_format="json"):
+        return self.server.supplier("acme", path, payload_format)
+
+    def test_iter_hotels_matches_fetch(self):
+        supplier = self.supplier("/json")
+        self.assertEqual(list(supplier.iter_hotels(chunk_size=100)), supplier.fetch())
+
+    def test_ndjson_supplier(self):
+        hotels = list(self.supplier("/ndjson", "ndjson").iter_hotels(chunk_size=100))
+        self.assertEqual([hotel.id for hotel in hotels], [record["Id"] for record in RECORDS])
+
+    def test_streaming_manager_matches_batch(self):
+        suppliers = [self.supplier("/json"), self.supplier("/ndjson", "ndjson")]
+        expected = SupplierManager(suppliers).fetch_and_merge_data()
+        with patch.object(BaseSupplier, "fetch", side_effect=AssertionError("loaded whole payload")):
+            streamed = SupplierManager(suppliers, stream=True).fetch_and_merge_data()
+        self.assertEqual(streamed, expected)
+
+    def test_streaming_requires_sequential_mode(self):
+        with self.assertRaises(ValueError):
+            SupplierManager([], mode="thread", stream=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import time
+import unittest
+from src.data_integration.supplier_manager import SupplierManager
+from tests.helpers import StubServer, json_route
+
+ROUTES = {
+    "/acme": json_route([{"Id": "a1", "DestinationId": 1, "Name": "Acme One", "Facilities": ["Pool"]}], delay=0.3),
+    "/patagonia": json_route([{"id": "a1", "destination": 1, "name": "Acme One Hotel", "amenities": ["wifi"]},
+                              {"id": "p2", "destination": 2, "name": "Pata Two", "amenities": []}], delay=0.3),
+    "/paperflies": json_route([{"hotel_id": "f3", "destination_id": 3, "hotel_name": "Paper Three"}], delay=0.3),
+    "/slow": json_route([], delay=2.0),
+    "/broken": json_route({"error": "boom"}, status=500),
+}
+
+
+class TestSupplierManagerConcurrency(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer(ROUTES).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def suppliers(self, *extra):
+        routes = [("acme", "/acme"), ("patagonia", "/patagonia"), ("paperflies", "/paperflies")]
+        return [self.server.supplier(key, path) for key, path in routes + list(extra)]
+
+    def test_concurrent_modes_match_sequential(self):
+        expected = SupplierManager(self.suppliers()).fetch_and_merge_data()
+        for mode in ("thread", "async"):
+            with self.subTest(mode=mode):
+                start = time.monotonic()
+                merged = SupplierManager(self.suppliers(), mode=mode).fetch_and_merge_data()
+                elapsed = time.monotonic() - start
+                self.assertEqual(merged, expected)
+                self.assertEqual([h.id for h in merged], ["a1", "p2", "f3"])
+                # Three 0.3s suppliers fetched together should take well under their 0.9s sum
+                self.assertLess(elapsed, 0.8)
+
+    def test_slow_and_failing_suppliers_are_dropped(self):
+        for mode in ("thread", "async"):
+            with self.subTest(mode=mode):
+                manager = SupplierManager(self.suppliers(("paperflies", "/slow"), ("acme", "/broken")),
+                                          mode=mode, timeout=1.0)
+                start = time.monotonic()
+                merged = manager.fetch_and_merge_data()
+                self.assertLess(time.monotonic() - start, 1.8)
+                self.assertEqual([h.id for h in merged], ["a1", "p2", "f3"])
+                self.assertEqual(len(manager.errors), 2)
+
+    def test_worker_limit(self):
+        manager = SupplierManager(self.suppliers(), mode="thread", max_workers=1)
+        start = time.monotonic()
+        manager.fetch_and_merge_data()
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+
+    def test_timeout_counts_from_when_each_fetch_starts(self):
+        # Together the three 0.3s suppliers take longer than the timeout, but each one is within it
+        for mode in ("thread", "async"):
+            with self.subTest(mode=mode):
+                manager = SupplierManager(self.suppliers(), mode=mode, max_workers=1, timeout=0.6)
+                self.assertEqual([h.id for h in manager.fetch_and_merge_data()], ["a1", "p2", "f3"])
+                self.assertEqual(manager.errors, {})
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            SupplierManager([], mode="fork")
+
+
+if __name__ == '__main__':
+    unittest.main()